@@ -0,0 +1,144 @@
+"""Game clock - shared monotonic/virtual time, fixed-timestep accumulator and timer scheduler."""
+
+import heapq
+import time
+
+class GameClock:
+    """Single time source for game logic (singleton)
+    
+    Real time is monotonic, so wall clock adjustments never skip phases. Tests and simulations
+    switch to virtual time, which only moves when advanced explicitly.
+    """
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(GameClock, cls).__new__(cls)
+            cls._instance.virtual_time = None
+        return cls._instance
+    
+    def now(self):
+        """Get current game time in seconds"""
+        if self.virtual_time is None:
+            return time.monotonic()
+        return self.virtual_time
+    
+    def use_virtual_time(self, start_time=0.0):
+        """Switch to virtual time starting at start_time"""
+        self.virtual_time = float(start_time)
+    
+    def use_real_time(self):
+        """Switch back to monotonic real time"""
+        self.virtual_time = None
+    
+    def is_virtual(self):
+        """Check whether virtual time is active"""
+        return self.virtual_time is not None
+    
+    def advance(self, seconds):
+        """Move virtual time forward"""
+        if self.virtual_time is None:
+            raise RuntimeError("GameClock.advance() needs virtual time")
+        self.virtual_time += seconds
+        return self.virtual_time
+    
+    def advance_to(self, target_time):
+        """Move virtual time forward to target_time (never backwards)"""
+        if self.virtual_time is None:
+            raise RuntimeError("GameClock.advance_to() needs virtual time")
+        self.virtual_time = max(self.virtual_time, float(target_time))
+        return self.virtual_time
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation steps
+    
+    Game logic advances in steps of exactly `step` seconds however fast frames are rendered.
+    After a stall, at most `max_steps` are run per frame and the rest of the backlog is dropped.
+    """
+    
+    def __init__(self, step, max_steps):
+        self.step = step
+        self.max_steps = max_steps
+        self.sim_time = None
+        self.steps_dropped = 0
+    
+    def reset(self, current_time):
+        """Restart stepping from current_time (nothing is owed)"""
+        self.sim_time = current_time
+    
+    def advance(self, current_time):
+        """Get the step times due up to current_time"""
+        if self.sim_time is None:
+            self.reset(current_time)
+            return []
+        
+        due = int((current_time - self.sim_time) / self.step)
+        if due > self.max_steps:
+            self.steps_dropped += due - self.max_steps
+            self.sim_time += (due - self.max_steps) * self.step
+            due = self.max_steps
+        
+        steps = [self.sim_time + (i + 1) * self.step for i in range(due)]
+        if due:
+            self.sim_time = steps[-1]
+        return steps
+
+class TimerScheduler:
+    """Named one-shot timers kept in a min-heap and fired in due-time order
+    
+    Callbacks receive their scheduled due time rather than the time they were noticed, so
+    follow-up timers do not drift with the step or frame rate.
+    """
+    
+    def __init__(self):
+        self.heap = []
+        self.timers = {}  # Name -> pending heap entry
+        self.sequence = 0  # Tie-breaker, equal due times fire in scheduling order
+    
+    def schedule(self, name, due_time, callback):
+        """Schedule callback(due_time), replacing a pending timer with the same name"""
+        self.cancel(name)
+        entry = [due_time, self.sequence, name, callback]
+        self.sequence += 1
+        heapq.heappush(self.heap, entry)
+        self.timers[name] = entry
+    
+    def cancel(self, name):
+        """Cancel a pending timer (removed lazily from the heap)"""
+        entry = self.timers.pop(name, None)
+        if entry is not None:
+            entry[3] = None
+    
+    def clear(self):
+        """Cancel all timers"""
+        self.heap = []
+        self.timers = {}
+    
+    def is_pending(self, name):
+        """Check whether a timer is pending"""
+        return name in self.timers
+    
+    def remaining(self, name, current_time):
+        """Get seconds until a timer fires (0 if it is not pending)"""
+        entry = self.timers.get(name)
+        if entry is None:
+            return 0
+        return max(0, entry[0] - current_time)
+    
+    def next_due_time(self):
+        """Get the due time of the earliest pending timer (None if there is none)"""
+        while self.heap and self.heap[0][3] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+    
+    def run_due(self, current_time):
+        """Fire every timer due at or before current_time; returns the number fired"""
+        fired = 0
+        while self.heap and self.heap[0][0] <= current_time:
+            due_time, _, name, callback = heapq.heappop(self.heap)
+            if callback is None:
+                continue
+            del self.timers[name]
+            callback(due_time)
+            fired += 1
+        return fired
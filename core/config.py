@@ -19,27 +19,98 @@ class Config:
     WINDOW_HEIGHT = 720
     FPS = 30
     FULLSCREEN = True
+    SIMULATION_RATE = 120  # Fixed game logic steps per second, independent of the render rate
+    SIMULATION_MAX_STEPS = 12  # Most steps run per frame; a longer stall is skipped instead of replayed
+    
+    # === Render Backend ===
+    RENDER_BACKEND = "surface"  # "surface" (display surface + flip) or "texture" (SDL2 renderer)
+    RENDER_ACCELERATED = -1  # Texture backend: -1 = any renderer, 0 = SDL software renderer, 1 = GPU
+    SKELETON_MODE = "display"  # Hand skeleton: "frame" (drawn into camera frame), "display" (drawn on screen) or "off"
+    
+    # === Render Scale ===
+    RENDER_SCALE = 1.0  # Internal resolution relative to the window (0.75 -> 960x540), scaled once to the window
+    VSYNC = True  # Request vsync for the final scale when the driver supports it
+    
+    # === Headless / Benchmark ===
+    HEADLESS = False  # Render offscreen with SDL's dummy drivers and run the main loop uncapped
+    HEADLESS_MAX_FRAMES = 0  # Stop after this many frames (0 = run until quit)
+    CAPTURE_EVERY_N_FRAMES = 0  # Dump every Nth composited frame (0 = off)
+    CAPTURE_FORMAT = "png"  # "png" or "npy" (raw RGB array)
+    CAPTURE_DIR = os.path.join(BASE_DIR, "captures")
+    RENDER_STATS_INTERVAL = 300  # Print render cost summary every N frames
+    
+    # === Recording ===
+    RECORDING_ENABLED = False  # Record each match (ROUND_SPLASH to GAME_OVER) to a video file
+    RECORDING_DIR = os.path.join(BASE_DIR, "recordings")
+    RECORDING_FPS = 30  # Frames sampled per second of gameplay
+    RECORDING_QUEUE_SIZE = 8  # Preallocated frame buffers between the game loop and the writer thread
+    RECORDING_DROP_POLICY = "drop_newest"  # When the writer falls behind: "drop_newest" or "drop_oldest"
+    RECORDING_CODEC = "mp4v"  # FourCC passed to cv2.VideoWriter
+    
+    # === KO Replay ===
+    REPLAY_ENABLED = True  # Keep a pre-roll of the match and replay it in slow motion on KO
+    REPLAY_SECONDS = 4  # Length of the pre-roll ring
+    REPLAY_FPS = 15  # Frames sampled per second into the ring
+    REPLAY_WIDTH = 480  # Width of stored frames (height follows the render aspect ratio)
+    REPLAY_JPEG_QUALITY = 70
+    REPLAY_MAX_FRAME_BYTES = 64 * 1024  # Fixed slot size per frame; larger frames are dropped
+    REPLAY_SPEED = 0.4  # Playback speed (1.0 = real time)
+    REPLAY_INSET_WIDTH = 320  # Replay inset width on screen
+    REPLAY_SAVE_CLIPS = False  # Also write each KO pre-roll to RECORDING_DIR
+    
+    # === Spectator Stream ===
+    SPECTATOR_ENABLED = False  # Serve the composited frame as MJPEG at http://SPECTATOR_HOST:SPECTATOR_PORT/
+    SPECTATOR_HOST = "127.0.0.1"  # "0.0.0.0" to serve the LAN
+    SPECTATOR_PORT = 8090
+    SPECTATOR_FPS = 20
+    SPECTATOR_WIDTH = 960  # Stream width (height follows the render aspect ratio)
+    SPECTATOR_JPEG_QUALITY = 75
     
     # === Camera Settings ===
     CAMERA_INDEX = 0
     CAMERA_WIDTH = 1280
     CAMERA_HEIGHT = 720
+    FRAME_SOURCE = None  # None = camera, path to a video file (looped) or "synthetic" (generated test frames)
+    VISION_THREADED = True  # Capture + inference on a background thread, rendering runs at display rate
     
     # === Round Settings ===
     NUM_ROUNDS = 3
     ROUND_DURATION = 20  # seconds per round
     REST_DURATION = 5   # seconds between rounds
-    SPLASH_DURATION = 3  # seconds for round splash screen
+    SPLASH_DURATION = 2.5  # seconds for round splash screen (round image + FIGHT)
+    INPUT_LATENCY_GRACE = 0.3  # A timed-out phase waits up to this long (s) for vision samples captured before its deadline
     
     # === Hitbox Settings ===
     MIN_HITBOXES = 2
     MAX_HITBOXES = 4
     HITBOX_SIZE = 120
     HITBOX_MARGIN = 150
+    HITBOX_GRID_CELL = 10  # Placement grid resolution in camera pixels
+    HITBOX_ZONE_MOVE_THRESHOLD = 40  # Rebuild the placement grid when face/body zones move more than this (px)
+    SWEPT_COLLISION = True  # Test the path each fist landmark travelled since the previous vision sample
+    SWEPT_MAX_GAP = 0.25  # Seconds; older previous samples are not swept (hand was lost or tracking jumped)
+    
+    # === Combo Settings ===
+    COMBO_MODE = "sequence"  # "sequence" (one random combo per attack phase, targets in order) or "free" (any combo from the punch stream)
+    COMBO_WINDOW = 0.8  # Free play: most seconds between two punches of one combo
+    COMBO_BONUS_RATIO = 0.2  # Free play: share of a recognized combo's table damage dealt as bonus damage
+    
+    # === VFX Settings ===
+    PARTICLE_CAPACITY = 512  # Fixed particle pool size
+    PARTICLES_PER_BURST = 16
+    PARTICLE_SPEED = 9.0  # Pixels per frame at burst start
+    PARTICLE_MAX_SIZE = 10
+    PARTICLE_GRAVITY = 0.4  # Pixels per frame^2
+    ANIMATION_BAKE_FPS = 30  # Frames per second baked for KO/splash/FIGHT animations
     
     # === Difficulty ===
     DEFAULT_DIFFICULTY = "MEDIUM"
     DIFFICULTY_SETTINGS = constants.DIFFICULTY_SETTINGS
+    DYNAMIC_DIFFICULTY = True  # Stretch the profile's timing windows by measured vision latency and player reactions
+    DIFFICULTY_MAX_STRETCH = 1.5  # Runtime windows stay between the profile value and this multiple of it
+    DIFFICULTY_LATENCY_SMOOTHING = 0.1  # Weight of each new latency measurement in the running average
+    DIFFICULTY_REACTION_HISTORY = 8  # Guard reactions remembered
+    DIFFICULTY_REACTION_GIVE = 0.5  # Share of a too-slow typical reaction added back to the enemy warning
     
     # === MediaPipe Settings ===
     HAND_MAX_NUM = 2
@@ -53,9 +124,34 @@ class Config:
     # === Punch/Defense Settings ===
     FIST_ANGLE_THRESHOLD = 175
     FIST_DISTANCE_THRESHOLD = 0.31
-    VELOCITY_THRESHOLD = 800
+    VELOCITY_THRESHOLD = 800  # Hand speed (camera px/s) that starts a punch
+    PUNCH_END_RATIO = 0.5  # Punch ends when speed drops below VELOCITY_THRESHOLD * ratio
+    PUNCH_MAX_DURATION = 0.6  # Seconds
+    PUNCH_HIT_WINDOW = 0.2  # Seconds after a punch ends in which it can still land
+    PUNCH_LEAD_HAND = "Left"  # Straight punches of the lead hand are jabs, of the rear hand crosses
+    HOOK_DIRECTION_RATIO = 1.5  # Horizontal/vertical travel above which a punch is a hook
+    REQUIRE_PUNCH_MOTION = True  # Only count hits while a punch is in progress (resting a fist on a target does nothing)
+    KINEMATICS_HISTORY = 16  # Samples kept per hand
+    KINEMATICS_WINDOW = 4  # Newest samples used for smoothed velocity/acceleration
+    KINEMATICS_REST_SMOOTHING = 0.2  # How fast the rest (guard) position follows a slow hand, per sample
     PUNCH_COOLDOWN = 0.3
     DEFENSE_FACE_COVERAGE_THRESHOLD = 0.6
+    DEFENSE_RADIUS = 150  # Fingertips within this distance (camera px) of the eye centroid count as guarding
+    FACE_PREDICTION = True  # Judge dodges against the face extrapolated to impact time, not the last (late) face box
+    FACE_HISTORY = 8  # Face boxes kept for prediction
+    FACE_PREDICTION_WINDOW = 0.2  # Seconds of face history used for the velocity fit
+    FACE_PREDICTION_MAX_LEAD = 0.15  # Longest extrapolation (s); older face boxes are not projected further
+    FACE_PREDICTION_LOG = False  # Print pipeline latency and prediction error of each judged impact (summary per round always)
+    
+    @classmethod
+    def get_render_size(cls):
+        """Get internal render resolution (window size times RENDER_SCALE)"""
+        return (int(cls.WINDOW_WIDTH * cls.RENDER_SCALE), int(cls.WINDOW_HEIGHT * cls.RENDER_SCALE))
+    
+    @classmethod
+    def px(cls, value):
+        """Convert a layout value designed for the window size into internal render pixels"""
+        return int(round(value * cls.RENDER_SCALE))
     
     @classmethod
     def get_difficulty_settings(cls):
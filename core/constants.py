@@ -96,8 +96,8 @@ DIFFICULTY_SETTINGS = {
     "EASY": {
         "enemy_attack_cooldown": (3.0, 5.0),
         "enemy_damage_multiplier": 0.7,
-        "player_attack_time": 3.5,
-        "enemy_attack_warning": 1.5,
+        "player_attack_time": 4.0,
+        "enemy_attack_warning": 1.2,
         "player_damage_ranges": {
             "JAB": (12, 13),
             "HOOK": (12, 14),
@@ -107,7 +107,7 @@ DIFFICULTY_SETTINGS = {
     "MEDIUM": {
         "enemy_attack_cooldown": (2.0, 3.5),
         "enemy_damage_multiplier": 1.0,
-        "player_attack_time": 3.0,
+        "player_attack_time": 4.0,
         "enemy_attack_warning": 1.0,
         "player_damage_ranges": {
             "JAB": (8, 10),
@@ -118,8 +118,8 @@ DIFFICULTY_SETTINGS = {
     "HARD": {
         "enemy_attack_cooldown": (1.5, 2.5),
         "enemy_damage_multiplier": 1.3,
-        "player_attack_time": 2.5,
-        "enemy_attack_warning": 0.7,
+        "player_attack_time": 4.0,
+        "enemy_attack_warning": 0.8,
         "player_damage_ranges": {
             "JAB": (5, 6),
             "HOOK": (5, 7),
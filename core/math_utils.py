@@ -1,16 +0,0 @@
-"""Math utilities - angle calculations and distance helpers."""
-
-import numpy as np
-import math
-
-def calculate_angle(a, b, c):
-    """Calculate angle at point b given points a, b, c"""
-    ba = np.array(a) - np.array(b)
-    bc = np.array(c) - np.array(b)
-    cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-    angle = np.arccos(np.clip(cosine_angle, -1.0, 1.0))
-    return np.degrees(angle)
-
-def distance(point1, point2):
-    """Calculate Euclidean distance between two points"""
-    return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
\ No newline at end of file
@@ -1,6 +1,10 @@
-"""Core utilities - font manager."""
+"""Core utilities - font manager, text cache, overlay cache, animation baker and pixel buffers."""
 
 import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
 import pygame
 
 class FontManager:
@@ -14,15 +18,231 @@ class FontManager:
         return cls._instance
     
     def get_font(self, font_path, size):
-        """Get or load font with caching"""
-        key = f"{font_path}_{size}"
+        """Get or load font with caching (font_path None is pygame's default font)"""
+        key = (font_path, size)
         if key not in self._font:
             try:
-                if os.path.exists(font_path):
+                if font_path is None or os.path.exists(font_path):
                     self._font[key] = pygame.font.Font(font_path, size)
                 else:
                     self._font[key] = pygame.font.SysFont("Arial", size)
             except Exception as e:
                 print(f"Error loading font {font_path} size {size}: {e}")
                 self._font[key] = pygame.font.SysFont("Arial", size)
-        return self._font[key]
\ No newline at end of file
+        return self._font[key]
+
+class TextCache:
+    """Singleton LRU cache of rendered text surfaces, fonts come from FontManager"""
+    _instance = None
+    _surfaces = OrderedDict()
+    max_entries = 256
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TextCache, cls).__new__(cls)
+            cls._instance.font_manager = FontManager()
+        return cls._instance
+    
+    def get_font(self, font_path, size):
+        """Get cached font by (path, size)"""
+        return self.font_manager.get_font(font_path, size)
+    
+    def render(self, font, text, color, antialias=True):
+        """Render text with caching - returned surface is shared, copy before mutating"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # Evict least recently used
+        return surface
+    
+    def render_text(self, font_path, size, text, color, antialias=True):
+        """Render text with a font looked up by (path, size)"""
+        return self.render(self.get_font(font_path, size), text, color, antialias)
+    
+    def clear(self):
+        """Drop all cached text surfaces"""
+        self._surfaces.clear()
+
+class OverlayManager:
+    """Singleton cache of pre-filled tint surfaces for full-screen overlays"""
+    _instance = None
+    _overlays = {}
+    _backend = None  # Texture render backend that draws overlays itself
+    ALPHA_STEP = 5  # Alpha is quantized to buckets of this size
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(OverlayManager, cls).__new__(cls)
+        return cls._instance
+    
+    def _alpha_bucket(self, alpha):
+        """Quantize alpha to its bucket so animated fades reuse surface state"""
+        bucket = int(round(alpha / self.ALPHA_STEP)) * self.ALPHA_STEP
+        return max(0, min(255, bucket))
+    
+    def get_overlay(self, size, color, alpha=255):
+        """Get cached tint surface filled with color, alpha applied via set_alpha"""
+        key = (tuple(size), tuple(color[:3]))
+        surface = self._overlays.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.fill(color[:3])
+            self._overlays[key] = surface
+        
+        bucket = self._alpha_bucket(alpha)
+        if surface.get_alpha() != bucket:
+            surface.set_alpha(bucket)
+        return surface
+    
+    def set_backend(self, backend):
+        """Route overlays aimed at the backend's target through its renderer"""
+        OverlayManager._backend = backend
+    
+    def blit_overlay(self, screen, color, alpha=255, offset=(0, 0)):
+        """Blit a full-screen tint onto screen (skipped when fully transparent)"""
+        if self._alpha_bucket(alpha) <= 0:
+            return
+        if self._backend is not None and self._backend.handles(screen):
+            self._backend.draw_overlay(color, self._alpha_bucket(alpha), offset)
+            return
+        screen.blit(self.get_overlay(screen.get_size(), color, alpha), offset)
+    
+    def clear(self):
+        """Drop all cached overlays (e.g. after display mode change)"""
+        self._overlays.clear()
+
+
+class BakedAnimation:
+    """Fixed sequence of pre-rendered frames played back by elapsed time"""
+    
+    def __init__(self, frames, duration, loop=True, alphas=None):
+        self.frames = frames
+        self.duration = duration
+        self.loop = loop
+        self.alphas = alphas  # Optional per-frame surface alpha
+    
+    def frame_index(self, elapsed):
+        """Get frame index for elapsed seconds (wraps when looping, holds the last frame otherwise)"""
+        count = len(self.frames)
+        if self.duration <= 0:
+            return 0
+        if self.loop:
+            return int(elapsed / self.duration * count) % count
+        return max(0, min(count - 1, int(round(elapsed / self.duration * (count - 1)))))
+    
+    def get_frame(self, elapsed):
+        """Get frame surface for elapsed seconds with its baked alpha applied"""
+        index = self.frame_index(elapsed)
+        surface = self.frames[index]
+        if self.alphas is not None and surface.get_alpha() != self.alphas[index]:
+            surface.set_alpha(self.alphas[index])
+        return surface
+
+class AnimationBaker:
+    """Singleton LRU cache of baked animations, optionally baked in a background thread"""
+    _instance = None
+    _animations = OrderedDict()
+    _pending = set()
+    _lock = threading.Lock()
+    max_animations = 16
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AnimationBaker, cls).__new__(cls)
+        return cls._instance
+    
+    def bake(self, frame_fn, duration, fps, loop=True, alpha_fn=None):
+        """Render frame_fn(t) at fps over duration; looping animations leave out the end time"""
+        frame_count = max(2, int(round(duration * fps)))
+        if loop:
+            times = [duration * i / frame_count for i in range(frame_count)]
+        else:
+            times = [duration * i / (frame_count - 1) for i in range(frame_count)]
+        
+        frames = [frame_fn(t) for t in times]
+        alphas = [max(0, min(255, int(alpha_fn(t)))) for t in times] if alpha_fn else None
+        return BakedAnimation(frames, duration, loop, alphas)
+    
+    def get(self, key, frame_fn, duration, fps, loop=True, alpha_fn=None, background=False):
+        """Get baked animation for key, baking it now or in the background (None until ready)"""
+        with self._lock:
+            animation = self._animations.get(key)
+            if animation is not None:
+                self._animations.move_to_end(key)
+                return animation
+            if key in self._pending:
+                return None
+            if background:
+                self._pending.add(key)
+        
+        if background:
+            thread = threading.Thread(target=self._bake_into_cache, args=(key, frame_fn, duration, fps, loop, alpha_fn), daemon=True)
+            thread.start()
+            return None
+        
+        animation = self.bake(frame_fn, duration, fps, loop, alpha_fn)
+        self._store(key, animation)
+        return animation
+    
+    def _bake_into_cache(self, key, frame_fn, duration, fps, loop, alpha_fn):
+        """Background bake worker"""
+        try:
+            self._store(key, self.bake(frame_fn, duration, fps, loop, alpha_fn))
+        except Exception as e:
+            # Key stays pending so callers keep their unbaked fallback instead of retrying every frame
+            print(f"Error baking animation {key}: {e}")
+    
+    def _store(self, key, animation):
+        """Insert animation and evict the least recently used ones beyond max_animations"""
+        with self._lock:
+            self._pending.discard(key)
+            self._animations[key] = animation
+            self._animations.move_to_end(key)
+            while len(self._animations) > self.max_animations:
+                self._animations.popitem(last=False)
+    
+    def clear(self):
+        """Drop all baked animations"""
+        with self._lock:
+            self._animations.clear()
+
+class PixelBuffer:
+    """Preallocated copy of a 32-bit surface's raw pixel rows
+    
+    Copying the rows is a single memcpy (far cheaper than a strided pixels3d copy), so the game
+    loop can hand frames to worker threads; channel reordering happens later in to_bgr().
+    """
+    
+    def __init__(self, surface, rows=None):
+        self.size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.shifts = surface.get_shifts()
+        # Optional caller-provided (height, pitch) storage, e.g. a view into shared memory
+        self.rows = rows if rows is not None else np.empty((self.size[1], self.pitch), dtype=np.uint8)
+        
+        # Byte offset of each channel within a 32-bit pixel
+        def byte_offset(shift):
+            return shift // 8 if sys.byteorder == 'little' else 3 - shift // 8
+        self.bgr_offsets = [byte_offset(self.shifts[2]), byte_offset(self.shifts[1]), byte_offset(self.shifts[0])]
+    
+    def matches(self, surface):
+        """Check whether surface has the layout this buffer was allocated for"""
+        return (surface.get_size() == self.size and surface.get_pitch() == self.pitch and
+                surface.get_shifts() == self.shifts)
+    
+    def copy_from(self, surface):
+        """Copy the surface's pixel rows into the buffer"""
+        np.copyto(self.rows, np.frombuffer(surface.get_buffer(), dtype=np.uint8).reshape(self.rows.shape))
+    
+    def to_bgr(self):
+        """Get the buffered frame as a contiguous (height, width, 3) BGR array"""
+        width, height = self.size
+        return np.ascontiguousarray(self.rows[:, :width * 4].reshape(height, width, 4)[..., self.bgr_offsets])
\ No newline at end of file
@@ -1,11 +1,12 @@
 """Player entity - manages player state, health, combo, and scoring."""
 
-import time
 from core import constants
+from core.clock import GameClock
 
 class Player:
     def __init__(self, game_config):
         self.config = game_config
+        self.clock = GameClock()
         self.health = constants.PLAYER_MAX_HEALTH
         self.combo_count = 0
         self.last_hit_time = 0
@@ -28,7 +29,7 @@ class Player:
     
     def register_hit(self, hitbox_value):
         """Register a successful hit on enemy"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Reset combo if too much time passed
         if current_time - self.last_hit_time > 1.5:  # 1.5 seconds between hits for combo
@@ -75,7 +76,7 @@ class Player:
         """Activate dodge state"""
         self.dodge_active = True
         # Dodge provides temporary invincibility
-        self.dodge_timer = time.time() + 0.5  # 0.5 seconds of invincibility
+        self.dodge_timer = self.clock.now() + 0.5  # 0.5 seconds of invincibility
     
     def update(self, current_time):
         """Update player state"""
@@ -0,0 +1,130 @@
+"""Combo recognizer - streaming punch sequence matching over a trie of combo definitions."""
+
+from collections import deque
+
+class ComboRecognizer:
+    """Matches a live punch stream against every defined combo at once
+    
+    The combo sequences are compiled into a prefix trie with failure links (Aho-Corasick) and
+    then into a full transition table, so each punch is one table lookup however many combos
+    exist. A state is the longest tail of the stream that is still the start of some combo.
+    
+    A completed combo is held back while the stream can still grow into a longer combo. It is
+    rewarded once the next punch breaks the pattern, the gap since the last punch exceeds
+    `window` seconds, or flush() is called. Rewarded punches are consumed, combos never overlap; the
+    punches after a rewarded combo are matched again from the start.
+    """
+    ROOT = 0
+    
+    def __init__(self, combos, window):
+        self.combos = combos
+        self.window = window
+        self.alphabet = sorted({punch for combo in combos.values() for punch in combo['sequence']})
+        self._compile()
+        self.reset()
+    
+    def _compile(self):
+        """Build the trie, failure links and the full transition table"""
+        children = [{}]
+        self.depth = [0]
+        self.prefix = [()]
+        terminal = [None]
+        for key, combo in self.combos.items():
+            node = self.ROOT
+            for punch in combo['sequence']:
+                if punch not in children[node]:
+                    children[node][punch] = len(children)
+                    children.append({})
+                    self.depth.append(self.depth[node] + 1)
+                    self.prefix.append(self.prefix[node] + (punch,))
+                    terminal.append(None)
+                node = children[node][punch]
+            terminal[node] = key
+        
+        # Breadth-first: failure links, longest combo ending at each state and the transition table
+        count = len(children)
+        fail = [self.ROOT] * count
+        self.best = [None] * count
+        self.extendable = [bool(node_children) for node_children in children]
+        self.transitions = [None] * count
+        self.transitions[self.ROOT] = {punch: children[self.ROOT].get(punch, self.ROOT) for punch in self.alphabet}
+        queue = deque(children[self.ROOT].values())
+        while queue:
+            node = queue.popleft()
+            # Own combo is longer than any combo ending at a proper suffix
+            self.best[node] = terminal[node] or self.best[fail[node]]
+            self.transitions[node] = {}
+            for punch in self.alphabet:
+                child = children[node].get(punch)
+                if child is None:
+                    self.transitions[node][punch] = self.transitions[fail[node]][punch]
+                else:
+                    fail[child] = self.transitions[fail[node]][punch] if node != self.ROOT else self.ROOT
+                    self.transitions[node][punch] = child
+                    queue.append(child)
+    
+    def reset(self):
+        """Forget the punch stream"""
+        self.state = self.ROOT
+        self.last_time = None
+        self.pending = None  # (combo key, punches it consumes, completion time) held back for a possible longer combo
+        self.stream = []  # (punch type, time) of the punches not consumed by a rewarded combo yet
+    
+    def feed(self, punch_type, punch_time):
+        """Add a punch to the stream; returns the combos rewarded by it (usually none)"""
+        rewarded = []
+        if self.last_time is not None and punch_time - self.last_time > self.window:
+            rewarded.extend(self._release_all())
+        self.last_time = punch_time
+        rewarded.extend(self._advance(punch_type, punch_time))
+        return rewarded
+    
+    def _advance(self, punch_type, punch_time):
+        """Step the state machine by one punch"""
+        self.stream.append((punch_type, punch_time))
+        self.state = self.transitions[self.state].get(punch_type, self.ROOT)
+        candidate = self.best[self.state]
+        pending_length = len(self.combos[self.pending[0]]['sequence']) if self.pending else 0
+        if candidate is not None and len(self.combos[candidate]['sequence']) > pending_length:
+            self.pending = (candidate, len(self.stream), punch_time)
+            pending_length = len(self.combos[candidate]['sequence'])
+        
+        # Keep waiting only while the stream can still become a longer combo
+        if self.pending is None or (self.extendable[self.state] and self.depth[self.state] >= pending_length):
+            return []
+        return self._release()
+    
+    def flush(self, current_time=None):
+        """Reward held combos (when their window has run out, or unconditionally without a time)"""
+        if self.pending is None:
+            return []
+        if current_time is not None and current_time - self.last_time <= self.window:
+            return []
+        return self._release_all()
+    
+    def _release(self):
+        """Reward the held combo, consume its punches and match the punches after it again"""
+        pending = self.pending
+        self.state = self.ROOT
+        self.pending = None
+        if pending is None:
+            self.stream = []
+            return []
+        key, consumed, completed_time = pending
+        unconsumed = self.stream[consumed:]
+        self.stream = []
+        rewarded = [{**self.combos[key], 'key': key, 'time': completed_time}]
+        for punch_type, punch_time in unconsumed:
+            rewarded.extend(self._advance(punch_type, punch_time))
+        return rewarded
+    
+    def _release_all(self):
+        """Reward every combo left in the stream and forget the rest"""
+        rewarded = []
+        while self.stream:
+            rewarded.extend(self._release())
+        return rewarded
+    
+    def get_prefix(self):
+        """Get the punches of the combo start matched so far"""
+        return self.prefix[self.state]
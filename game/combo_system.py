@@ -1,18 +1,29 @@
 """Combo system - manages punch combos, timing evaluation, and sequence tracking."""
 
-import time
 import random
 from core import constants
+from core.clock import GameClock
+from game.combo_recognizer import ComboRecognizer
 
 class ComboSystem:
     def __init__(self, game_config):
         self.config = game_config
+        self.clock = GameClock()
         self.current_combo = None
         self.combo_sequence = []
         self.combo_progress = 0
         self.last_hit_time = 0
         self.combo_complete = False
         
+        # Free play: every defined combo is matched against the landed punch stream
+        self.free_play = False
+        self.recognizer = ComboRecognizer(self.get_combo_library(), self.config.COMBO_WINDOW)
+        self.recognized_combos = []  # Combos rewarded in the current attack phase
+    
+    def get_combo_library(self):
+        """Get all combo definitions across difficulties"""
+        return {**constants.COMBO_EASY, **constants.COMBO_MEDIUM, **constants.COMBO_HARD}
+    
     def start_new_combo(self, difficulty="MEDIUM"):
         """Select and start a new combo based on difficulty"""
         # Select combo based on difficulty
@@ -28,11 +39,41 @@ class ComboSystem:
         self.current_combo = available_combos[combo_key]
         self.combo_sequence = self.current_combo['sequence']
         self.combo_progress = 0
-        self.last_hit_time = time.time()
+        self.last_hit_time = self.clock.now()
         self.combo_complete = False
+        self.free_play = False
         
         return self.current_combo
     
+    def start_free_play(self):
+        """Start a free play attack phase - any combo counts, recognized as the punches land"""
+        self.current_combo = {'name': 'Free Play', 'sequence': [], 'damage': 0}
+        self.combo_sequence = []
+        self.combo_progress = 0
+        self.last_hit_time = self.clock.now()
+        self.combo_complete = False
+        self.free_play = True
+        self.recognizer.reset()
+        self.recognized_combos = []
+        return self.current_combo
+    
+    def register_punch(self, punch_type, hit_time):
+        """Feed a landed punch to the free play recognizer; returns the combos it completes"""
+        self.last_hit_time = hit_time
+        self.combo_progress += 1
+        return self._record(self.recognizer.feed(punch_type, hit_time))
+    
+    def flush(self, current_time=None):
+        """Reward a held free play combo once its timing window ran out (or now, without a time)"""
+        return self._record(self.recognizer.flush(current_time))
+    
+    def _record(self, combos):
+        """Keep rewarded combos for the phase summary"""
+        for combo in combos:
+            self.recognized_combos.append(combo)
+            print(f"🔥 {combo['name']}! ({' '.join(combo['sequence'])})")
+        return combos
+    
     def register_hit(self, hit_time):
         """Register a hit in the combo sequence"""
         self.last_hit_time = hit_time
@@ -86,6 +127,15 @@ class ComboSystem:
         if not self.current_combo:
             return ""
         
+        if self.free_play:
+            # Combo start matched so far, or the last rewarded combo
+            prefix = self.recognizer.get_prefix()
+            if prefix:
+                return " ".join(f"✓{punch}" for punch in prefix)
+            if self.recognized_combos:
+                return f"{self.recognized_combos[-1]['name']}!"
+            return "Any combo"
+        
         display = []
         for i, punch in enumerate(self.combo_sequence):
             if i < self.combo_progress:
@@ -102,7 +152,8 @@ class ComboSystem:
         return {
             'hits': self.combo_progress,
             'total': len(self.combo_sequence),
-            'complete': self.combo_complete
+            'complete': self.combo_complete,
+            'combos': [combo['name'] for combo in self.recognized_combos] if self.free_play else []
         }
     
     def reset(self):
@@ -112,3 +163,6 @@ class ComboSystem:
         self.combo_progress = 0
         self.last_hit_time = 0
         self.combo_complete = False
+        self.free_play = False
+        self.recognizer.reset()
+        self.recognized_combos = []
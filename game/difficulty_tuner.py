@@ -0,0 +1,78 @@
+"""Difficulty tuner - resolves phase timing from the difficulty profile, vision latency and player reactions."""
+
+from collections import deque
+
+class DifficultyTuner:
+    """Runtime timing windows built on the DIFFICULTY_SETTINGS profile
+    
+    The profile's player_attack_time and enemy_attack_warning are the base windows. A guard only
+    counts once its vision sample has been processed, so the enemy warning grows by the measured
+    capture-to-processing latency. In a sequential combo each next target only appears once the
+    previous hit has been processed, so the player attack window grows by one latency per such
+    spawn. When the player's recent guard reactions (measured on capture time, a missed guard
+    counting as the slowest) are slower than the warning, the warning also gives back part of the
+    difference. Windows never shrink below the profile nor grow past DIFFICULTY_MAX_STRETCH times it.
+    """
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.latency = None  # Smoothed capture-to-processing latency (s)
+        self.reactions = deque(maxlen=self.config.DIFFICULTY_REACTION_HISTORY)
+        self.last_logged = {}  # Window name -> last logged value
+    
+    def record_latency(self, latency):
+        """Add a measured vision latency (processing time minus capture time)"""
+        latency = max(0.0, latency)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * self.config.DIFFICULTY_LATENCY_SMOOTHING
+    
+    def record_reaction(self, reaction):
+        """Add a guard reaction time (warning start to guard, on capture time)"""
+        self.reactions.append(max(0.0, reaction))
+    
+    def record_missed_guard(self):
+        """Add an enemy attack the player never guarded, as the slowest reaction the warning can stretch to"""
+        base = self.config.get_difficulty_settings()["enemy_attack_warning"]
+        self.reactions.append(base * self.config.DIFFICULTY_MAX_STRETCH)
+    
+    def get_reaction(self):
+        """Get the typical (median) recent reaction time, None without history"""
+        if not self.reactions:
+            return None
+        ordered = sorted(self.reactions)
+        return ordered[len(ordered) // 2]
+    
+    def get_enemy_warning(self):
+        """Get the enemy attack warning duration for the next attack"""
+        base = self.config.get_difficulty_settings()["enemy_attack_warning"]
+        latency = self.latency or 0.0
+        reaction = self.get_reaction()
+        reaction_extra = max(0.0, reaction - base) * self.config.DIFFICULTY_REACTION_GIVE if reaction is not None else 0.0
+        warning = self._clamp(base + latency + reaction_extra, base)
+        self._log('warning', base, warning, f"latency {latency * 1000:.0f}ms, reaction "
+                  + (f"{reaction:.2f}s" if reaction is not None else "n/a"))
+        return warning
+    
+    def get_player_attack_time(self, spawn_count):
+        """Get the player attack window for a combo whose targets spawn on spawn_count processed hits"""
+        base = self.config.get_difficulty_settings()["player_attack_time"]
+        latency = self.latency or 0.0
+        attack_time = self._clamp(base + latency * spawn_count, base)
+        self._log('player_attack', base, attack_time, f"latency {latency * 1000:.0f}ms x {spawn_count} spawns")
+        return attack_time
+    
+    def _clamp(self, value, base):
+        """Keep a window between its profile value and DIFFICULTY_MAX_STRETCH times it"""
+        if not self.config.DYNAMIC_DIFFICULTY:
+            return base
+        return min(max(value, base), base * self.config.DIFFICULTY_MAX_STRETCH)
+    
+    def _log(self, name, base, value, reason):
+        """Print a window adjustment when it changed noticeably since the last one"""
+        previous = self.last_logged.get(name)
+        if previous is not None and abs(value - previous) < 0.02:
+            return
+        self.last_logged[name] = value
+        print(f"⏱️  {self.config.DEFAULT_DIFFICULTY} {name} window: {base:.2f}s -> {value:.2f}s ({reason})")
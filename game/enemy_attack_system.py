@@ -1,8 +1,8 @@
 ﻿"""Enemy attack system - manages attack warnings, targeting, and combo attacks."""
 
-import time
 import random
 from core import constants
+from core.clock import TimerScheduler
 
 class EnemyAttackSystem:
     def __init__(self, game_config):
@@ -15,7 +15,8 @@ class EnemyAttackSystem:
         self.glove_position = None
         self.glove_progress = 0
         self.attack_damage = 0
-        self.warning_duration = 1.0  # Will be set based on difficulty
+        self.warning_duration = 1.0  # Set per attack (difficulty profile, adjusted at runtime)
+        self.attack_duration = 0.5  # 500ms for glove animation
         
         # Combo attack properties
         self.combo_count = 0  # Current attack in combo
@@ -24,7 +25,14 @@ class EnemyAttackSystem:
         self.combo_end_time = 0  # When to start next attack in combo
         self.was_defended_during_attack = False  # Track if player defended during attack animation
         
-    def start_attack(self, face_bbox, current_time, pose_landmarks=None):
+        # Warning end, impacts and combo delays are timer events
+        self.timers = TimerScheduler()
+        self.is_defending = False
+        self.face_bbox = None
+        self.face_motion = None  # FaceMotion predicting the face at impact time (pipeline latency)
+        self.attack_result = None  # Result of the impact resolved during the current update
+    
+    def start_attack(self, face_bbox, current_time, pose_landmarks=None, warning_duration=None):
         """Start enemy attack sequence with random target on player face or head (pose fallback)"""
         if face_bbox is None and pose_landmarks is None:
             return False
@@ -68,36 +76,40 @@ class EnemyAttackSystem:
         self.combo_count = 0
         self.combo_max = random.randint(2, 3)
         
-        # Set warning duration based on difficulty
+        # Warning duration from the difficulty profile unless resolved at runtime by the caller
         difficulty = self.config.get_difficulty_settings()
-        difficulty_name = self.config.DEFAULT_DIFFICULTY
-        
-        if difficulty_name == "EASY":
-            self.warning_duration = 1.2
-        elif difficulty_name == "MEDIUM":
-            self.warning_duration = 1.0
-        else:  # HARD
-            self.warning_duration = 0.8
+        if warning_duration is None:
+            warning_duration = difficulty["enemy_attack_warning"]
+        self.warning_duration = warning_duration
         
         # Calculate damage
         base_damage = random.randint(constants.ENEMY_DAMAGE_MIN, constants.ENEMY_DAMAGE_MAX)
         self.attack_damage = int(base_damage * difficulty["enemy_damage_multiplier"])
         
+        self.timers.schedule('swing', current_time + self.warning_duration, self._start_swing)
         return True
     
-    def update(self, current_time, is_defending, face_bbox=None):
+    def _start_swing(self, current_time):
+        """Warning over or combo delay elapsed - launch the glove"""
+        self.is_warning = False
+        self.is_attacking = True
+        self.attack_start_time = current_time
+        if self.combo_count == 0:
+            self.combo_count = 1  # Start first attack in combo
+        self.was_defended_during_attack = False
+        self.glove_position = [self.config.CAMERA_WIDTH // 2, self.config.CAMERA_HEIGHT]
+        self.glove_progress = 0
+        self.timers.schedule('impact', current_time + self.attack_duration, self._resolve_impact)
+    
+    def update(self, current_time, is_defending, face_bbox=None, face_motion=None):
         """Update attack state with glove animation from bottom to target"""
-        attack_duration = 0.5  # 500ms for glove animation
+        self.is_defending = is_defending
+        self.face_bbox = face_bbox
+        self.face_motion = face_motion
+        self.attack_result = None
         
-        # Warning phase -> Attack phase transition
-        if self.is_warning:
-            if current_time - self.warning_start_time >= self.warning_duration:
-                self.is_warning = False
-                self.is_attacking = True
-                self.attack_start_time = current_time
-                self.combo_count = 1  # Start first attack in combo
-                self.was_defended_during_attack = False
-                self.glove_position = [self.config.CAMERA_WIDTH // 2, self.config.CAMERA_HEIGHT]
+        # Warning -> attack, impacts and next combo attacks
+        self.timers.run_due(current_time)
         
         # Attack animation - linear interpolation from bottom to target
         if self.is_attacking:
@@ -106,103 +118,111 @@ class EnemyAttackSystem:
                 self.was_defended_during_attack = True
             
             elapsed = current_time - self.attack_start_time
-            self.glove_progress = min(1.0, elapsed / attack_duration)
+            self.glove_progress = min(1.0, elapsed / self.attack_duration)
+            self._move_glove()
+        
+        return self.attack_result
+    
+    def _move_glove(self):
+        """Interpolate glove position from the bottom center to the target"""
+        if self.target_position:
+            start_x = self.config.CAMERA_WIDTH // 2
+            start_y = self.config.CAMERA_HEIGHT
+            target_x, target_y = self.target_position
             
-            # Interpolate glove position
-            if self.target_position:
-                start_x = self.config.CAMERA_WIDTH // 2
-                start_y = self.config.CAMERA_HEIGHT
-                target_x, target_y = self.target_position
-                
-                current_x = int(start_x + (target_x - start_x) * self.glove_progress)
-                current_y = int(start_y + (target_y - start_y) * self.glove_progress)
-                self.glove_position = [current_x, current_y]
+            current_x = int(start_x + (target_x - start_x) * self.glove_progress)
+            current_y = int(start_y + (target_y - start_y) * self.glove_progress)
+            self.glove_position = [current_x, current_y]
+    
+    def _resolve_impact(self, current_time):
+        """Glove reached the target - decide dodge/block/hit and queue the next combo attack"""
+        self.is_attacking = False
+        self.glove_progress = 1.0
+        self._move_glove()
+        if self.is_defending:
+            self.was_defended_during_attack = True
+        face_bbox = self._get_face_at(current_time)
+        
+        # Check if player dodged - both target AND glove must be in the face bbox at impact time
+        player_dodged = False
+        if self.target_position and self.glove_position:
+            target_x, target_y = self.target_position
+            glove_x, glove_y = self.glove_position
             
-            # Attack complete - apply damage
-            if elapsed >= attack_duration:
-                self.is_attacking = False
+            # Check if face_bbox exists at hit moment
+            if face_bbox:
+                face_x, face_y, face_w, face_h = face_bbox
                 
-                # Check if player dodged - both target AND glove must be in CURRENT face bbox
-                player_dodged = False
-                if self.target_position and self.glove_position:
-                    target_x, target_y = self.target_position
-                    glove_x, glove_y = self.glove_position
-                    
-                    # Check if face_bbox exists at hit moment
-                    if face_bbox:
-                        face_x, face_y, face_w, face_h = face_bbox
-                        
-                        # Check if target is still in current face area
-                        target_in_face = (face_x <= target_x <= face_x + face_w and 
-                                         face_y <= target_y <= face_y + face_h)
-                        
-                        # Check if glove is in current face area
-                        glove_in_face = (face_x <= glove_x <= face_x + face_w and 
-                                        face_y <= glove_y <= face_y + face_h)
-                        
-                        # Player dodged if either target or glove is outside current face
-                        if not target_in_face or not glove_in_face:
-                            player_dodged = True
-                    else:
-                        player_dodged = True
+                # Check if target is still in current face area
+                target_in_face = (face_x <= target_x <= face_x + face_w and 
+                                 face_y <= target_y <= face_y + face_h)
                 
-                # Calculate final damage and play appropriate sound
-                if player_dodged:
-                    final_damage = 0  # Complete dodge
-                    # Sound will be played in game_state when registering attack result
-                elif self.was_defended_during_attack:
-                    final_damage = int(self.attack_damage * 0.2)
-                    # Sound will be played in game_state when registering attack result
-                else:
-                    final_damage = self.attack_damage
-                    # Sound will be played in game_state when registering attack result
+                # Check if glove is in current face area
+                glove_in_face = (face_x <= glove_x <= face_x + face_w and 
+                                face_y <= glove_y <= face_y + face_h)
                 
-                # Check if combo continues
-                if self.combo_count < self.combo_max:
-                    # Start next attack in combo after delay
-                    self.combo_end_time = current_time + self.combo_delay
-                    self.combo_count += 1
-                    
-                    # Generate new target for next attack
-                    # Priority: face_bbox > pose landmarks fallback
-                    if face_bbox:
-                        face_x, face_y, face_w, face_h = face_bbox
-                        margin_x = int(face_w * 0.2)
-                        margin_y = int(face_h * 0.2)
-                        target_x = face_x + margin_x + random.randint(0, face_w - 2*margin_x)
-                        target_y = face_y + margin_y + random.randint(0, face_h - 2*margin_y)
-                        self.target_position = (target_x, target_y)
-                    else:
-                        pass
-                    
-                    # Return damage but don't end combo
-                    return {
-                        'damage': final_damage,
-                        'position': self.target_position,
-                        'was_defended': self.was_defended_during_attack,
-                        'was_dodged': player_dodged,
-                        'combo_continues': True
-                    }
-                else:
-                    return {
-                        'damage': final_damage,
-                        'position': self.target_position,
-                        'was_defended': self.was_defended_during_attack,
-                        'was_dodged': player_dodged,
-                        'combo_continues': False
-                    }
+                # Player dodged if either target or glove is outside current face
+                if not target_in_face or not glove_in_face:
+                    player_dodged = True
+            else:
+                player_dodged = True
         
-        # Check if it's time to start next attack in combo
-        if not self.is_attacking and not self.is_warning and self.combo_count > 0 and self.combo_count <= self.combo_max:
-            if current_time >= self.combo_end_time:
-                # Start next attack in combo
-                self.is_attacking = True
-                self.attack_start_time = current_time
-                self.glove_position = [self.config.CAMERA_WIDTH // 2, self.config.CAMERA_HEIGHT]
-                self.glove_progress = 0
-                self.was_defended_during_attack = False
+        # Calculate final damage and play appropriate sound
+        if player_dodged:
+            final_damage = 0  # Complete dodge
+            # Sound will be played in game_state when registering attack result
+        elif self.was_defended_during_attack:
+            final_damage = int(self.attack_damage * 0.2)
+            # Sound will be played in game_state when registering attack result
+        else:
+            final_damage = self.attack_damage
+            # Sound will be played in game_state when registering attack result
         
-        return None
+        # Check if combo continues
+        if self.combo_count < self.combo_max:
+            # Start next attack in combo after delay
+            self.combo_end_time = current_time + self.combo_delay
+            self.combo_count += 1
+            self.timers.schedule('swing', self.combo_end_time, self._start_swing)
+            
+            # Generate new target for next attack
+            # Priority: face_bbox > pose landmarks fallback
+            if face_bbox:
+                face_x, face_y, face_w, face_h = face_bbox
+                margin_x = int(face_w * 0.2)
+                margin_y = int(face_h * 0.2)
+                target_x = face_x + margin_x + random.randint(0, face_w - 2*margin_x)
+                target_y = face_y + margin_y + random.randint(0, face_h - 2*margin_y)
+                self.target_position = (target_x, target_y)
+            else:
+                pass
+            
+            # Report damage but don't end combo
+            self.attack_result = {
+                'damage': final_damage,
+                'position': self.target_position,
+                'impact_position': tuple(self.glove_position) if self.glove_position else self.target_position,
+                'was_defended': self.was_defended_during_attack,
+                'was_dodged': player_dodged,
+                'combo_continues': True
+            }
+        else:
+            self.attack_result = {
+                'damage': final_damage,
+                'position': self.target_position,
+                'impact_position': tuple(self.glove_position) if self.glove_position else self.target_position,
+                'was_defended': self.was_defended_during_attack,
+                'was_dodged': player_dodged,
+                'combo_continues': False
+            }
+    
+    def _get_face_at(self, current_time):
+        """Face bbox at current_time - the newest face box is one pipeline latency old, so it is extrapolated"""
+        if self.config.FACE_PREDICTION and self.face_motion is not None:
+            predicted = self.face_motion.predict(current_time)
+            if predicted is not None:
+                return predicted
+        return self.face_bbox
     
     def is_active(self):
         """Check if attack is in progress"""
@@ -232,3 +252,5 @@ class EnemyAttackSystem:
         self.combo_max = 0
         self.combo_end_time = 0
         self.was_defended_during_attack = False
+        self.timers.clear()
+        self.attack_result = None
@@ -1,11 +1,13 @@
 """Game state - manages game flow, phases, rounds, and player/enemy health."""
 
-import time
 import random
 from core import constants
+from core.clock import GameClock, TimerScheduler
 from game.hit_box_system import HitBoxSystem
 from game.enemy_attack_system import EnemyAttackSystem
 from game.combo_system import ComboSystem
+from game.difficulty_tuner import DifficultyTuner
+from systems.face_motion import FaceMotion
 
 class GameState:
     def __init__(self, game_config):
@@ -21,13 +23,18 @@ class GameState:
         self.score = 0
         self.face_bbox = None
         self.pose_landmarks = None  # Store pose landmarks for fallback
+        self.face_motion = FaceMotion(game_config)  # Face box history for latency-compensated dodge judgment
         self.defense_active = False
         self.dodge_detected = False
         self.vfx_effects = []
         self.vfx_hits = []  # For hit VFX
         self.sounds_to_play = []
-        self.round_start_time = time.time()
-        self.phase_start_time = time.time()
+        self.clock = GameClock()
+        self.timers = TimerScheduler()  # Splash, round end, phase timeout, rest and KO events
+        self.round_start_time = self.clock.now()
+        self.phase_start_time = self.round_start_time
+        self.phase_deadline = self.round_start_time  # Capture time after which player attack input no longer counts
+        self.input_time = None  # Capture time of the newest processed vision sample
         self.rest_start_time = 0
         self.splash_played = False
         
@@ -41,16 +48,19 @@ class GameState:
         self.hitbox_system = HitBoxSystem(game_config)
         self.enemy_attack_system = EnemyAttackSystem(game_config)
         self.combo_system = ComboSystem(game_config)
+        self.difficulty_tuner = DifficultyTuner(game_config)  # Phase timing from the profile, latency and reactions
         
         # Combo tracking
         self.current_combo_name = None
         self.combo_active = False
         self.hit_hitboxes = {}  # Track which hitboxes were hit and when
+        self.free_play = self.config.COMBO_MODE == "free"  # Any combo from the punch stream instead of one prescribed combo
         
-        # Phase duration (4 seconds for player attack)
-        self.player_attack_duration = 4.0
+        # Phase durations, resolved per phase by the difficulty tuner
+        self.player_attack_duration = self.config.get_difficulty_settings()["player_attack_time"]
+        self.guard_reaction_pending = False  # Waiting for the first guard of the current enemy attack
         self.enemy_damage_applied = False
-        
+    
     def start_game(self):
         """Start the game from menu"""
         self.current_state = constants.GAME_STATES['ROUND_SPLASH']
@@ -63,172 +73,241 @@ class GameState:
         self.ko_effect_active = False
         self.ko_sfx_played = False
         self.result_shown = False  # Reset result flag
-        
-    def start_round(self, round_num):
+        self.timers.clear()
+        self.start_round_splash(self.clock.now())
+    
+    def start_round_splash(self, current_time):
+        """Show the round splash, the round starts when it ends"""
+        self.current_state = constants.GAME_STATES['ROUND_SPLASH']
+        self.splash_played = False
+        self.timers.schedule('splash', current_time + self.config.SPLASH_DURATION,
+                             lambda due_time: self.start_round(self.current_round, due_time))
+    
+    def start_round(self, round_num, current_time=None):
         """Start a specific round with combo-based hitbox generation"""
+        if current_time is None:
+            current_time = self.clock.now()
         self.current_state = constants.GAME_STATES['PLAYING']
         self.current_round = round_num
         self.phase = constants.PHASE_STATES['PLAYER_ATTACK']
         self.combo_count = 0
         self.splash_played = True
-        self.round_start_time = time.time()
-        self.phase_start_time = time.time()
+        self.round_start_time = current_time
+        self.phase_start_time = current_time
+        self.round_timer = self.config.ROUND_DURATION
+        self.timers.schedule('round_end', current_time + self.config.ROUND_DURATION, self._end_round)
         self.hit_hitboxes = {}  # Reset hit tracking
         
-        # Start new combo
-        difficulty = self.config.DEFAULT_DIFFICULTY
-        combo_data = self.combo_system.start_new_combo(difficulty)
-        self.current_combo_name = combo_data['name']
-        self.combo_active = True
-        
-        # Generate hitboxes with combo sequence and pose landmarks
-        self.hitbox_system.generate_hitboxes(
-            face_bbox=self.face_bbox,
-            combo_sequence=combo_data['sequence'],
-            pose_landmarks=self.pose_landmarks
-        )
+        # Start new combo, hitboxes placed around face and pose landmarks
+        self._start_combo(self.pose_landmarks)
+        self._schedule_phase_timeout(current_time)
         
         # Reset enemy attack system
         self.enemy_attack_system.reset()
         self.enemy_damage_applied = False
     
-    def start_rest_period(self):
+    def start_rest_period(self, current_time=None):
         """Start rest period between rounds"""
+        if current_time is None:
+            current_time = self.clock.now()
         self.current_state = constants.GAME_STATES['REST']
         self.rest_timer = self.config.REST_DURATION
-        self.rest_start_time = time.time()
+        self.rest_start_time = current_time
+        self.timers.clear()  # Pending phase timers end with the round
+        self.timers.schedule('rest', current_time + self.config.REST_DURATION, self._end_rest_period)
     
     def game_over(self, player_won):
         """End the game"""
+        self.timers.clear()
         self.current_state = constants.GAME_STATES['GAME_OVER']
         self.player_won = player_won
     
+    def record_input_timing(self, capture_time, processed_time):
+        """Store the capture time of the vision sample being processed and measure its latency"""
+        self.input_time = capture_time
+        self.difficulty_tuner.record_latency(processed_time - capture_time)
+    
+    def update_face(self, face_bbox, capture_time):
+        """Store the face bbox of a vision sample and its capture time"""
+        self.face_bbox = face_bbox
+        self.face_motion.update(face_bbox, capture_time)
+    
     def update(self, current_time, vision_system):
-        """Update game state"""
+        """Advance the game to current_time (one fixed simulation step)"""
+        if self.current_state == constants.GAME_STATES['PLAYING']:
+            # KO is checked before timers so a knockout beats a round ending in the same step
+            self._check_knockout(current_time)
+        
+        self.timers.run_due(current_time)
+        
         if self.current_state == constants.GAME_STATES['PLAYING']:
             self._update_playing_state(current_time)
         elif self.current_state == constants.GAME_STATES['REST']:
-            self._update_rest_period(current_time)
-        elif self.current_state == constants.GAME_STATES['ROUND_SPLASH']:
-            self._update_round_splash(current_time)
+            self.rest_timer = self.timers.remaining('rest', current_time)
     
-    def _update_playing_state(self, current_time):
-        """Update during active gameplay with phase transitions"""
-        # Check if either player is KO'd (trigger KO effect)
-        if self.player_health <= 0 and not self.ko_effect_active:
-            self.ko_effect_active = True
-            self.ko_start_time = current_time
-            self.ko_sfx_played = False
-            self.player_won = False
+    def get_next_event_time(self):
+        """Get the earliest pending game or enemy attack timer (None if there is none), for fast-forwarding"""
+        due_times = [due_time for due_time in (self.timers.next_due_time(), self.enemy_attack_system.timers.next_due_time())
+                     if due_time is not None]
+        return min(due_times) if due_times else None
+    
+    def _check_knockout(self, current_time):
+        """Start the KO effect when either fighter is out of health"""
+        if self.ko_effect_active:
             return
-        
-        if self.enemy_health <= 0 and not self.ko_effect_active:
-            self.ko_effect_active = True
-            self.ko_start_time = current_time
-            self.ko_sfx_played = False
-            self.player_won = True
+        if self.player_health <= 0:
+            self._start_knockout(current_time, False)
+        elif self.enemy_health <= 0:
+            self._start_knockout(current_time, True)
+    
+    def _start_knockout(self, current_time, player_won):
+        """Freeze the round and show the KO effect, the game ends after ko_duration"""
+        self.timers.clear()
+        self._log_face_prediction()
+        self.ko_effect_active = True
+        self.ko_start_time = current_time
+        self.ko_sfx_played = False
+        self.player_won = player_won
+        self.timers.schedule('ko', current_time + self.ko_duration, lambda due_time: self.game_over(self.player_won))
+    
+    def _end_round(self, current_time):
+        """Round timer expired"""
+        self.round_timer = 0
+        self._log_face_prediction()
+        if self.current_round < self.config.NUM_ROUNDS:
+            self.start_rest_period(current_time)
+        elif self.player_health <= 0 or self.enemy_health <= 0:
+            # Final round ended - only trigger KO effect if someone's HP is 0
+            self._start_knockout(current_time, self.player_health > self.enemy_health)
+        else:
+            # No knockout - direct to result screen
+            self.game_over(self.player_health > self.enemy_health)
+    
+    def _log_face_prediction(self):
+        """Print the recent face prediction latency and error for tuning"""
+        stats = self.face_motion.get_stats()
+        if stats is None:
             return
+        error = (f"{stats['avg_error_px']:.0f}px avg, {stats['max_error_px']:.0f}px max"
+                 if stats['avg_error_px'] is not None else "n/a")
+        print(f"🎯 Face prediction: {stats['predictions']} predictions, latency {stats['avg_latency_ms']:.0f}ms, error {error}")
+    
+    def _end_rest_period(self, current_time):
+        """Rest timer expired - next round splash or game over"""
+        self.rest_timer = 0
+        self.current_round += 1
+        if self.current_round <= self.config.NUM_ROUNDS:
+            self.start_round_splash(current_time)
+        else:
+            # Final round complete - game over
+            self.game_over(self.player_health > self.enemy_health)
+    
+    def _schedule_phase_timeout(self, current_time):
+        """Player attack phase ends after player_attack_duration unless the combo completes first
         
-        # Check if KO effect finished
-        if self.ko_effect_active:
-            if current_time - self.ko_start_time >= self.ko_duration:
-                pass
-            return
+        Punches are judged on capture time, so the phase only ends once a vision sample captured after
+        the deadline has been processed; the timer is the fallback when none arrives within the grace.
+        """
+        spawn_count = max(0, len(self.combo_system.combo_sequence) - 1) if self.hitbox_system.sequential_mode else 0
+        self.player_attack_duration = self.difficulty_tuner.get_player_attack_time(spawn_count)
+        self.phase_deadline = current_time + self.player_attack_duration
+        self.timers.schedule('phase_timeout', self.phase_deadline + self.config.INPUT_LATENCY_GRACE,
+                             self._end_player_attack)
+    
+    def _end_player_attack(self, current_time):
+        """End the player attack phase (combo complete or timeout) and start the enemy attack"""
+        self.timers.cancel('phase_timeout')
         
-        # Update timers
-        self.round_timer = max(0, self.config.ROUND_DURATION - (current_time - self.round_start_time))
+        # Free play: a combo still waiting for a longer continuation counts now
+        if self.free_play:
+            self._reward_combos(self.combo_system.flush())
         
-        # Check for round end
-        if self.round_timer <= 0:
-            if self.current_round < self.config.NUM_ROUNDS:
-                self.current_state = constants.GAME_STATES['REST']
-                self.rest_timer = self.config.REST_DURATION
-                self.rest_start_time = current_time
-            else:
-                # Final round ended - go directly to result screen
-                # Only trigger KO effect if someone's HP is 0
-                if self.player_health <= 0 or self.enemy_health <= 0:
-                    if not self.ko_effect_active:
-                        self.ko_effect_active = True
-                        self.ko_start_time = current_time
-                        self.ko_sfx_played = False
-                        self.player_won = self.player_health > self.enemy_health
-                else:
-                    # No knockout - direct to result screen
-                    self.current_state = constants.GAME_STATES['GAME_OVER']
-                    self.player_won = self.player_health > self.enemy_health
+        # Show result summary
+        perf = self.combo_system.get_performance_summary()
+        hit_count = perf['hits']
+        total_count = perf['total']
+        
+        if self.free_play:
+            print(f"\n🥊 Free play: {hit_count} hits, combos: {', '.join(perf['combos']) or 'none'}")
+        elif perf['complete']:
+            print(f"\n✅ COMBO COMPLETE! All {total_count} hits landed!")
+        elif hit_count > 0:
+            print(f"\n⚠️  Combo incomplete: {hit_count}/{total_count} hits (timeout)")
+        else:
+            print(f"\n❌ No hits landed (timeout)")
+        
+        # Transition to enemy attack warning
+        self.phase = constants.PHASE_STATES['ENEMY_ATTACK_WARNING']
+        self.phase_start_time = current_time
+        self.combo_active = False
+        
+        # Check if enemy still alive before starting attack
+        if self.enemy_health <= 0:
+            self.game_over(True)
+            return
+        
+        # Start enemy attack (with face bbox or pose landmarks fallback)
+        if self.face_bbox is not None or self.pose_landmarks is not None:
+            self.enemy_attack_system.start_attack(self.face_bbox, current_time, self.pose_landmarks,
+                                                  self.difficulty_tuner.get_enemy_warning())
+            self.guard_reaction_pending = True
+        else:
+            # Restart player attack if no face detected
+            self.phase = constants.PHASE_STATES['PLAYER_ATTACK']
+            self.phase_start_time = current_time
+            self._start_combo()
+            self._schedule_phase_timeout(current_time)
+    
+    def _update_playing_state(self, current_time):
+        """Update during active gameplay with phase transitions"""
+        # Frozen during the KO effect
+        if self.ko_effect_active:
             return
         
-        # Phase transitions
-        phase_elapsed = current_time - self.phase_start_time
+        self.round_timer = self.timers.remaining('round_end', current_time)
         
+        # Phase transitions (timeouts are timer events)
         if self.phase == constants.PHASE_STATES['PLAYER_ATTACK']:
-            # Player attack phase - check for combo completion or 4s timeout
-            combo_complete = self.combo_system.is_combo_complete()
-            
-            if phase_elapsed >= self.player_attack_duration or combo_complete:
-                # Show result summary
-                perf = self.combo_system.get_performance_summary()
-                hit_count = perf['hits']
-                total_count = perf['total']
-                
-                if combo_complete:
-                    print(f"\n✅ COMBO COMPLETE! All {total_count} hits landed!")
-                elif hit_count > 0:
-                    print(f"\n⚠️  Combo incomplete: {hit_count}/{total_count} hits (timeout)")
-                else:
-                    print(f"\n❌ No hits landed (timeout)")
-                
-                # Transition to enemy attack warning
-                self.phase = constants.PHASE_STATES['ENEMY_ATTACK_WARNING']
-                self.phase_start_time = current_time
-                self.combo_active = False
-                
-                # Check if enemy still alive before starting attack
-                if self.enemy_health <= 0:
-                    self.game_over(True)
-                    return
-                
-                # Start enemy attack (with face bbox or pose landmarks fallback)
-                if self.face_bbox is not None or self.pose_landmarks is not None:
-                    self.enemy_attack_system.start_attack(self.face_bbox, current_time, self.pose_landmarks)
-                else:
-                    # Restart player attack if no face detected
-                    self.phase = constants.PHASE_STATES['PLAYER_ATTACK']
-                    self.phase_start_time = current_time
-                    difficulty = self.config.DEFAULT_DIFFICULTY
-                    combo_data = self.combo_system.start_new_combo(difficulty)
-                    self.current_combo_name = combo_data['name']
-                    self.combo_active = True
-                    self.hitbox_system.generate_hitboxes(
-                        face_bbox=self.face_bbox,
-                        combo_sequence=combo_data['sequence']
-                    )
+            if self.free_play:
+                self._reward_combos(self.combo_system.flush(current_time))
+            if self.combo_system.is_combo_complete() or (self.free_play and self.hitbox_system.all_hit()):
+                self._end_player_attack(current_time)
+            elif current_time >= self.phase_deadline and self.input_time is not None and self.input_time >= self.phase_deadline:
+                # Every sample captured before the deadline has been judged
+                self._end_player_attack(current_time)
         
         elif self.phase == constants.PHASE_STATES['ENEMY_ATTACK_WARNING']:
+            self._track_guard_reaction()
             # Warning phase - target icon visible
             # Update enemy attack system to check for warning -> attack transition
-            attack_result = self.enemy_attack_system.update(current_time, self.defense_active, self.face_bbox)
+            attack_result = self.enemy_attack_system.update(current_time, self.defense_active, self.face_bbox,
+                                                                 self.face_motion)
             
             if not self.enemy_attack_system.is_warning:
                 self.phase = constants.PHASE_STATES['ENEMY_ATTACK']
         
         elif self.phase == constants.PHASE_STATES['ENEMY_ATTACK']:
+            self._track_guard_reaction()
             # Update enemy attack system
-            attack_result = self.enemy_attack_system.update(current_time, self.defense_active, self.face_bbox)
+            attack_result = self.enemy_attack_system.update(current_time, self.defense_active, self.face_bbox,
+                                                                 self.face_motion)
             
             if attack_result:
                 # Attack completed - apply damage
                 damage = attack_result['damage']
                 self.player_health = max(0, self.player_health - damage)  # Prevent negative health
                 
-                # Play appropriate sound based on attack result
+                # Play appropriate sound and impact VFX based on attack result
+                impact_x, impact_y = attack_result.get('impact_position') or attack_result['position']
                 if attack_result.get('was_dodged', False):
                     self.play_sound('enemy-punch-missed')
+                    self.add_vfx(impact_x, impact_y, 'miss')
                 elif attack_result.get('was_defended', False):
                     self.play_sound('enemy-punch-bloked')
+                    self.add_vfx(impact_x, impact_y, 'block')
                 elif damage > 0:
                     self.play_sound('enemy-punch')
+                    self.add_vfx(impact_x, impact_y, 'enemy_hit')
                 
                 # Check if combo continues or ends
                 if attack_result.get('combo_continues', False):
@@ -243,19 +322,15 @@ class GameState:
                     print(f"\n🔄 Transitioning: Enemy Attack → Player Attack")
                     self.phase = constants.PHASE_STATES['PLAYER_ATTACK']
                     self.phase_start_time = current_time
+                    if self.guard_reaction_pending:
+                        # No guard during the whole attack
+                        self.difficulty_tuner.record_missed_guard()
+                        self.guard_reaction_pending = False
                     
-                    # Start NEW combo (sequential mode)
-                    difficulty = self.config.DEFAULT_DIFFICULTY
-                    combo_data = self.combo_system.start_new_combo(difficulty)
-                    self.current_combo_name = combo_data['name']
-                    self.combo_active = True
-                    print(f"   New combo: {combo_data['name']} ({len(combo_data['sequence'])} hits)")
-                    
-                    # Generate sequential hitboxes
-                    self.hitbox_system.generate_hitboxes(
-                        face_bbox=self.face_bbox,
-                        combo_sequence=combo_data['sequence']
-                    )
+                    # Start NEW combo with its hitboxes
+                    combo_data = self._start_combo()
+                    print(f"   New combo: {combo_data['name']} ({len(combo_data['sequence']) or 'any'} hits)")
+                    self._schedule_phase_timeout(current_time)
                     self.hit_hitboxes = {}
                     self.combo_count = 0
                     self.enemy_damage_applied = False
@@ -263,45 +338,57 @@ class GameState:
         # Reset dodge detection
         self.dodge_detected = False
     
-    def _update_rest_period(self, current_time):
-        """Update during rest period"""
-        elapsed = current_time - self.rest_start_time
-        self.rest_timer = max(0, self.config.REST_DURATION - elapsed)
-        
-        # End of rest period
-        if self.rest_timer <= 0:
-            self.current_round += 1
-            if self.current_round <= self.config.NUM_ROUNDS:
-                self.current_state = constants.GAME_STATES['ROUND_SPLASH']
-                self.splash_played = False
-            else:
-                # Final round complete - game over
-                player_won = self.player_health > self.enemy_health
-                self.game_over(player_won)
+    def accepts_input(self, capture_time):
+        """Check whether motion captured at capture_time falls inside the current player attack window"""
+        return self.phase_start_time <= capture_time <= self.phase_deadline
     
-    def _update_round_splash(self, current_time):
-        """Update during round splash screen"""
-        if not hasattr(self, 'splash_start_time'):
-            self.splash_start_time = current_time
-        
-        elapsed = current_time - self.splash_start_time
-        if elapsed >= self.config.SPLASH_DURATION:
-            self.current_state = constants.GAME_STATES['PLAYING']
-            self.round_start_time = current_time
-            self.phase_start_time = current_time
+    def _track_guard_reaction(self):
+        """Record how long after the warning the player first guarded (capture time) for the tuner"""
+        if self.guard_reaction_pending and self.defense_active and self.input_time is not None:
+            self.guard_reaction_pending = False
+            self.difficulty_tuner.record_reaction(self.input_time - self.enemy_attack_system.warning_start_time)
+    
+    def _start_combo(self, pose_landmarks=None):
+        """Start the next player attack combo and generate its hitboxes"""
+        if self.free_play:
+            # All targets at once, any order; mixed punch types spread them over both sides
+            combo_data = self.combo_system.start_free_play()
+            punch_types = [random.choice(list(constants.PUNCH_TYPES)) for _ in range(self.config.MAX_HITBOXES)]
+            self.hitbox_system.generate_hitboxes(face_bbox=self.face_bbox, pose_landmarks=pose_landmarks,
+                                                 punch_types=punch_types)
+        else:
+            # Sequential targets following the combo
+            combo_data = self.combo_system.start_new_combo(self.config.DEFAULT_DIFFICULTY)
+            self.hitbox_system.generate_hitboxes(face_bbox=self.face_bbox, combo_sequence=combo_data['sequence'],
+                                                 pose_landmarks=pose_landmarks)
+        self.current_combo_name = combo_data['name']
+        self.combo_active = True
+        return combo_data
     
-    def register_hit(self, hitbox):
-        """Register a hit on a hitbox with sequence tracking"""
+    def _reward_combos(self, combos):
+        """Free play: bonus damage and score for recognized combos"""
+        for combo in combos:
+            bonus = int(combo['damage'] * self.config.COMBO_BONUS_RATIO)
+            self.enemy_health = max(0, self.enemy_health - bonus)
+            self.score += combo['damage']
+            print(f"   Combo bonus: {bonus} damage, +{combo['damage']} score")
+    
+    def register_hit(self, hitbox, hit_time=None, punch_type=None):
+        """Register a hit on a hitbox with sequence tracking (hit_time is when the punch landed on camera)"""
         if hitbox not in self.hit_hitboxes:
-            hit_time = time.time()
+            if hit_time is None:
+                hit_time = self.clock.now()
             self.hit_hitboxes[hitbox] = hit_time
             
+            # Free play: the landed punch joins the stream matched against every combo
+            if self.combo_active and self.free_play:
+                self._reward_combos(self.combo_system.register_punch(punch_type or "JAB", hit_time))
             # Register hit in combo sequence
-            if self.combo_active:
+            elif self.combo_active:
                 progress = self.combo_system.register_hit(hit_time)
                 combo_len = len(self.combo_system.combo_sequence)
                 print(f"✓ Combo hit {progress}/{combo_len}")
-                
+            
             self.combo_count += 1
             return self.combo_count
         return 0
@@ -312,7 +399,7 @@ class GameState:
             'x': x,
             'y': y,
             'type': effect_type,
-            'time': time.time(),
+            'time': self.clock.now(),
             'duration': 0.5
         })
     
@@ -322,8 +409,8 @@ class GameState:
     
     def clean_vfx(self):
         """Remove expired VFX"""
-        current_time = time.time()
-        self.vfx_effects = [vfx for vfx in self.vfx_effects if current_time - vfx['time'] < vfx['duration']]
+        current_time = self.clock.now()
+        self.vfx_effects[:] = [vfx for vfx in self.vfx_effects if current_time - vfx['time'] < vfx['duration']]
     
     def get_active_sounds(self):
         """Get and clear sounds to play"""
@@ -1,24 +1,37 @@
 """Hitbox system - generates and manages player attack targets."""
 
 import random
-import time
-import math
+import numpy as np
 from core import constants
+from core.clock import GameClock
 
 class HitBoxSystem:
+    BODY_ZONE_RADIUS = 120  # No targets within this distance of shoulders and hips
+    
     def __init__(self, game_config):
         self.config = game_config
+        self.clock = GameClock()
         self.active_hitboxes = []
         self.hit_hitboxes = set()
         self.hitbox_radius = 65
+        self.box_size = 130  # 130x130px untuk circle background + punch bag
         self.sequential_mode = False  # Sequential: next hitbox spawns on hit
         self.current_hitbox_index = 0  # Track which hitbox should be active
         self.last_hit_position = None  # Remember last hitbox position to avoid overlap
         self.face_bbox = None  # Store for spawn_next_hitbox
         self.pose_landmarks = None  # Store for spawn_next_hitbox
         
-    def generate_hitboxes(self, count=None, face_bbox=None, combo_sequence=None, pose_landmarks=None):
-        """Generate hitboxes - sequential if combo_sequence provided, random otherwise"""
+        # Collision store, row i mirrors active_hitboxes[i]
+        self.centers = np.empty((0, 2), dtype=np.float32)
+        self.radii = np.empty(0, dtype=np.float32)
+        self.active_mask = np.empty(0, dtype=bool)
+        
+        # Valid placement positions per side, rebuilt when the exclusion zones move
+        self.placement_grid = None
+        self.grid_zones = None
+    
+    def generate_hitboxes(self, count=None, face_bbox=None, combo_sequence=None, pose_landmarks=None, punch_types=None):
+        """Generate hitboxes - sequential if combo_sequence provided, random otherwise (punch_types per target)"""
         if combo_sequence:
             # Sequential mode: next spawns only when previous is hit
             self.sequential_mode = True
@@ -28,224 +41,29 @@ class HitBoxSystem:
         else:
             # Original random mode
             self.sequential_mode = False
-            if count is None:
+            if punch_types:
+                count = len(punch_types)
+            elif count is None:
                 count = random.randint(self.config.MIN_HITBOXES, self.config.MAX_HITBOXES)
         
         self.active_hitboxes = []
         self.hit_hitboxes = set()
         
-        margin = self.config.HITBOX_MARGIN
-        size = 130  # 130x130px untuk circle background + punch bag
-        
-        # Define face exclusion zone (larger than actual face for safety)
-        face_zone = None
-        if face_bbox:
-            face_x, face_y, face_w, face_h = face_bbox
-            # Expand face zone by 100px on all sides
-            face_zone = {
-                'x1': max(0, face_x - 100),
-                'y1': max(0, face_y - 100),
-                'x2': min(self.config.CAMERA_WIDTH, face_x + face_w + 100),
-                'y2': min(self.config.CAMERA_HEIGHT, face_y + face_h + 100)
-            }
-        
-        # Define body exclusion zones (shoulders 11,12 and hips 23,24 with 120px radius)
-        body_zones = []
-        if pose_landmarks:
-            # MediaPipe pose landmarks: 11=left_shoulder, 12=right_shoulder, 23=left_hip, 24=right_hip
-            body_landmark_indices = [11, 12, 23, 24]
-            for idx in body_landmark_indices:
-                if idx < len(pose_landmarks):
-                    lm = pose_landmarks[idx]
-                    body_x = int(lm.x * self.config.CAMERA_WIDTH)
-                    body_y = int(lm.y * self.config.CAMERA_HEIGHT)
-                    body_zones.append({'cx': body_x, 'cy': body_y, 'radius': 120})
+        # Valid positions only change when the face or body moved noticeably
+        self._update_placement_grid(face_bbox, pose_landmarks)
         
+        # Circles keep 30px spacing between each other
+        min_spacing = self.hitbox_radius * 2 + 30
         for i in range(count):
-            placed = False
-            attempts = 0  # Reset attempts counter per hitbox
-            max_attempts = 100  # Per-hitbox attempt limit
-            
-            # Determine punch type first to decide position zone
             punch_type = "JAB"
             if combo_sequence and i < len(combo_sequence):
                 punch_type = combo_sequence[i]
+            elif punch_types:
+                punch_type = punch_types[i]
             
-            while not placed and attempts < max_attempts:
-                attempts += 1
-                
-                # Position based on punch type:
-                # JAB = left side (0 to 50% width)
-                # CROSS/HOOK = right side (50% to 100% width)
-                if punch_type == "JAB":
-                    # Left side for JAB
-                    x = random.randint(margin, self.config.CAMERA_WIDTH // 2 - size)
-                else:  # CROSS or HOOK
-                    # Right side for CROSS/HOOK
-                    x = random.randint(self.config.CAMERA_WIDTH // 2, self.config.CAMERA_WIDTH - margin - size)
-                
-                y = random.randint(margin + 150, self.config.CAMERA_HEIGHT - margin - size)  # Avoid HUD
-                
-                # Center point for circle
-                center_x = x + size // 2
-                center_y = y + size // 2
-                
-                # Check if hitbox is in face exclusion zone
-                in_face_zone = False
-                if face_zone:
-                    # Check if hitbox center is in face zone
-                    if (face_zone['x1'] <= center_x <= face_zone['x2'] and 
-                        face_zone['y1'] <= center_y <= face_zone['y2']):
-                        in_face_zone = True
-                        continue  # Skip this position, try again
-                
-                # Check if hitbox is too close to body landmarks
-                in_body_zone = False
-                for body_zone in body_zones:
-                    dist_to_body = math.sqrt((center_x - body_zone['cx'])**2 + (center_y - body_zone['cy'])**2)
-                    if dist_to_body < body_zone['radius']:
-                        in_body_zone = True
-                        break
-                
-                if in_body_zone:
-                    continue  # Skip this position, try again
-                
-                # Check if overlaps with existing hitboxes
-                overlap = False
-                for existing in self.active_hitboxes:
-                    ex_center_x = existing['x'] + size // 2
-                    ex_center_y = existing['y'] + size // 2
-                    
-                    # Calculate distance between centers
-                    dist = math.sqrt((center_x - ex_center_x)**2 + (center_y - ex_center_y)**2)
-                    
-                    # Check if circles overlap - REDUCED spacing from 50px to 30px
-                    if dist < (self.hitbox_radius * 2 + 30):  # 30px minimum spacing (was 50px)
-                        overlap = True
-                        break
-                
-                if not overlap and not in_face_zone and not in_body_zone:
-                    # punch_type already determined at start of loop
-                    hitbox = {
-                        'id': i,
-                        'x': x,
-                        'y': y,
-                        'center_x': center_x,
-                        'center_y': center_y,
-                        'width': size,
-                        'height': size,
-                        'radius': self.hitbox_radius,
-                        'active': not self.sequential_mode,  # Only first active in sequential mode
-                        'visible': not self.sequential_mode,  # Control visibility
-                        'hit_time': 0,
-                        'type': random.choice(['red', 'blue', 'black']),
-                        'punch_type': punch_type,
-                        'sequence_index': i
-                    }
-                    self.active_hitboxes.append(hitbox)
-                    placed = True
-            
-            # FALLBACK: If can't place after max attempts, relax constraints
-            if not placed:
-                print(f"⚠️ WARNING: Could not place hitbox {i} ({punch_type}) after {max_attempts} attempts")
-                print(f"   Trying fallback with reduced exclusion zones...")
-                
-                # Try again with VERY relaxed constraints
-                for fallback_attempt in range(100):
-                    # Wider random range for fallback
-                    if punch_type == "JAB":
-                        x = random.randint(margin, self.config.CAMERA_WIDTH // 2 - size)
-                    else:
-                        x = random.randint(self.config.CAMERA_WIDTH // 2, self.config.CAMERA_WIDTH - margin - size)
-                    
-                    y = random.randint(margin + 100, self.config.CAMERA_HEIGHT - margin - size)  # Reduced top margin
-                    center_x = x + size // 2
-                    center_y = y + size // 2
-                    
-                    # Only check MINIMAL face zone in fallback (50px instead of 100px)
-                    if face_zone:
-                        face_zone_mini = {
-                            'x1': max(0, face_x - 50),
-                            'y1': max(0, face_y - 50),
-                            'x2': min(self.config.CAMERA_WIDTH, face_x + face_w + 50),
-                            'y2': min(self.config.CAMERA_HEIGHT, face_y + face_h + 50)
-                        }
-                        if (face_zone_mini['x1'] <= center_x <= face_zone_mini['x2'] and 
-                            face_zone_mini['y1'] <= center_y <= face_zone_mini['y2']):
-                            continue
-                    
-                    # Check overlap with REDUCED spacing (20px instead of 50px)
-                    overlap = False
-                    for existing in self.active_hitboxes:
-                        ex_center_x = existing['x'] + size // 2
-                        ex_center_y = existing['y'] + size // 2
-                        dist = math.sqrt((center_x - ex_center_x)**2 + (center_y - ex_center_y)**2)
-                        if dist < (self.hitbox_radius * 2 + 20):  # REDUCED from 50px to 20px
-                            overlap = True
-                            break
-                    
-                    if not overlap:
-                        hitbox = {
-                            'id': i,
-                            'x': x,
-                            'y': y,
-                            'center_x': center_x,
-                            'center_y': center_y,
-                            'width': size,
-                            'height': size,
-                            'radius': self.hitbox_radius,
-                            'active': not self.sequential_mode,
-                            'visible': not self.sequential_mode,
-                            'hit_time': 0,
-                            'type': random.choice(['red', 'blue', 'black']),
-                            'punch_type': punch_type,
-                            'sequence_index': i
-                        }
-                        self.active_hitboxes.append(hitbox)
-                        placed = True
-                        print(f"   ✓ Fallback placement successful at ({center_x}, {center_y})")
-                        break
-                
-                if not placed:
-                    print(f"   ✗ CRITICAL: Still failed after fallback! Using FORCE placement...")
-                    # FORCE PLACEMENT: Place without any checks (last resort)
-                    if punch_type == "JAB":
-                        x = random.randint(margin + 50, self.config.CAMERA_WIDTH // 2 - size - 50)
-                    else:
-                        x = random.randint(self.config.CAMERA_WIDTH // 2 + 50, self.config.CAMERA_WIDTH - margin - size - 50)
-                    
-                    y = random.randint(margin + 200, self.config.CAMERA_HEIGHT - margin - size - 50)
-                    center_x = x + size // 2
-                    center_y = y + size // 2
-                    
-                    hitbox = {
-                        'id': i,
-                        'x': x,
-                        'y': y,
-                        'center_x': center_x,
-                        'center_y': center_y,
-                        'width': size,
-                        'height': size,
-                        'radius': self.hitbox_radius,
-                        'active': not self.sequential_mode,
-                        'visible': not self.sequential_mode,
-                        'hit_time': 0,
-                        'type': random.choice(['red', 'blue', 'black']),
-                        'punch_type': punch_type,
-                        'sequence_index': i
-                    }
-                    self.active_hitboxes.append(hitbox)
-                    print(f"   ⚡ FORCE placed at ({center_x}, {center_y})")
-        
-        # Debug: Print hitbox generation summary
-        print(f"\n📦 Hitbox Generation Summary:")
-        print(f"   Requested: {count} hitboxes")
-        print(f"   Generated: {len(self.active_hitboxes)} hitboxes")
-        if combo_sequence:
-            print(f"   Combo: {' -> '.join(combo_sequence)}")
-        for hb in self.active_hitboxes:
-            status = "ACTIVE" if hb['active'] else "INACTIVE"
-            print(f"   [{hb['id']}] {hb['punch_type']:5s} at ({hb['center_x']:4d}, {hb['center_y']:4d}) - {status}")
+            placed_centers = [(hb['center_x'], hb['center_y']) for hb in self.active_hitboxes]
+            x, y = self._pick_position(punch_type, placed_centers, min_spacing)
+            self.active_hitboxes.append(self._make_hitbox(i, x, y, punch_type))
         
         # Store for spawn_next_hitbox
         self.face_bbox = face_bbox
@@ -257,6 +75,131 @@ class HitBoxSystem:
             self.active_hitboxes[0]['visible'] = True
             if self.active_hitboxes[0].get('center_x') and self.active_hitboxes[0].get('center_y'):
                 self.last_hit_position = (self.active_hitboxes[0]['center_x'], self.active_hitboxes[0]['center_y'])
+        
+        self._sync_arrays()
+    
+    def _make_hitbox(self, index, x, y, punch_type):
+        """Create a hitbox dict with its top-left at (x, y)"""
+        size = self.box_size
+        return {
+            'id': index,
+            'x': x,
+            'y': y,
+            'center_x': x + size // 2,
+            'center_y': y + size // 2,
+            'width': size,
+            'height': size,
+            'radius': self.hitbox_radius,
+            'active': not self.sequential_mode,  # Only first active in sequential mode
+            'visible': not self.sequential_mode,  # Control visibility
+            'hit_time': 0,
+            'type': random.choice(['red', 'blue', 'black']),
+            'punch_type': punch_type,
+            'sequence_index': index
+        }
+    
+    def _get_exclusion_zones(self, face_bbox, pose_landmarks):
+        """Get the face exclusion rectangle and body exclusion points in camera pixels"""
+        # Face zone is the face bbox expanded by 100px on all sides
+        face_zone = None
+        if face_bbox:
+            face_x, face_y, face_w, face_h = face_bbox
+            face_zone = (
+                max(0, face_x - 100),
+                max(0, face_y - 100),
+                min(self.config.CAMERA_WIDTH, face_x + face_w + 100),
+                min(self.config.CAMERA_HEIGHT, face_y + face_h + 100)
+            )
+        
+        # MediaPipe pose landmarks: 11=left_shoulder, 12=right_shoulder, 23=left_hip, 24=right_hip
+        body_points = []
+        if pose_landmarks:
+            for idx in [11, 12, 23, 24]:
+                if idx < len(pose_landmarks):
+                    lm = pose_landmarks[idx]
+                    body_points.append((int(lm.x * self.config.CAMERA_WIDTH), int(lm.y * self.config.CAMERA_HEIGHT)))
+        
+        return face_zone, body_points
+    
+    def _zones_moved(self, face_zone, body_points):
+        """Check whether exclusion zones moved more than HITBOX_ZONE_MOVE_THRESHOLD since the last grid build"""
+        if self.grid_zones is None:
+            return True
+        grid_face_zone, grid_body_points = self.grid_zones
+        if (grid_face_zone is None) != (face_zone is None) or len(grid_body_points) != len(body_points):
+            return True
+        
+        previous = np.array(list(grid_face_zone or ()) + [c for point in grid_body_points for c in point])
+        current = np.array(list(face_zone or ()) + [c for point in body_points for c in point])
+        return bool(np.abs(current - previous).max(initial=0) > self.config.HITBOX_ZONE_MOVE_THRESHOLD)
+    
+    def _update_placement_grid(self, face_bbox, pose_landmarks):
+        """Rebuild the per-side valid position grids if the exclusion zones moved"""
+        face_zone, body_points = self._get_exclusion_zones(face_bbox, pose_landmarks)
+        if not self._zones_moved(face_zone, body_points):
+            return
+        
+        self.grid_zones = (face_zone, body_points)
+        self.placement_grid = {
+            side: self._build_side_grid(side, face_zone, body_points)
+            for side in ("JAB", "CROSS")
+        }
+    
+    def _build_side_grid(self, side, face_zone, body_points):
+        """Get all and valid top-left positions of one side on a HITBOX_GRID_CELL lattice"""
+        margin = self.config.HITBOX_MARGIN
+        size = self.box_size
+        cell = self.config.HITBOX_GRID_CELL
+        
+        # JAB = left side (0 to 50% width), CROSS/HOOK = right side (50% to 100% width)
+        if side == "JAB":
+            xs = np.arange(margin, self.config.CAMERA_WIDTH // 2 - size + 1, cell)
+        else:
+            xs = np.arange(self.config.CAMERA_WIDTH // 2, self.config.CAMERA_WIDTH - margin - size + 1, cell)
+        ys = np.arange(margin + 150, self.config.CAMERA_HEIGHT - margin - size + 1, cell)  # Avoid HUD
+        
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        positions = np.stack([grid_x.ravel(), grid_y.ravel()], axis=1)
+        centers = positions + size // 2
+        
+        valid = np.ones(len(positions), dtype=bool)
+        if face_zone:
+            x1, y1, x2, y2 = face_zone
+            valid &= ~((centers[:, 0] >= x1) & (centers[:, 0] <= x2) & (centers[:, 1] >= y1) & (centers[:, 1] <= y2))
+        for body_x, body_y in body_points:
+            valid &= ((centers - (body_x, body_y)) ** 2).sum(axis=1) >= self.BODY_ZONE_RADIUS ** 2
+        
+        return {'all': positions, 'valid': positions[valid]}
+    
+    def _pick_position(self, punch_type, avoid_centers, min_distance):
+        """Pick a random top-left position for punch_type's side, at least min_distance from avoid_centers
+        
+        Exclusion zones and then spacing are relaxed when nothing satisfies them, so placement always succeeds.
+        """
+        grid = self.placement_grid["JAB" if punch_type == "JAB" else "CROSS"]
+        avoid = np.array(avoid_centers, dtype=np.int64).reshape(-1, 2)
+        
+        for positions, keep_spacing in ((grid['valid'], True), (grid['all'], True), (grid['valid'], False), (grid['all'], False)):
+            if keep_spacing and len(avoid) and len(positions):
+                centers = positions + self.box_size // 2
+                distances_sq = ((centers[:, None, :] - avoid[None, :, :]) ** 2).sum(axis=2)
+                positions = positions[(distances_sq >= min_distance ** 2).all(axis=1)]
+            if len(positions):
+                x, y = positions[random.randrange(len(positions))]
+                return int(x), int(y)
+        return self.config.HITBOX_MARGIN, self.config.HITBOX_MARGIN + 150
+    
+    def _sync_arrays(self):
+        """Rebuild the collision arrays from the hitbox dicts"""
+        self.centers = np.array([(hb['center_x'], hb['center_y']) for hb in self.active_hitboxes], dtype=np.float32).reshape(-1, 2)
+        self.radii = np.array([hb['radius'] for hb in self.active_hitboxes], dtype=np.float32)
+        self.active_mask = np.array([hb['active'] and hb['id'] not in self.hit_hitboxes for hb in self.active_hitboxes], dtype=bool)
+    
+    def _sync_row(self, index):
+        """Update one collision row after a hitbox moved or changed state"""
+        hitbox = self.active_hitboxes[index]
+        self.centers[index] = (hitbox['center_x'], hitbox['center_y'])
+        self.active_mask[index] = hitbox['active'] and hitbox['id'] not in self.hit_hitboxes
     
     def spawn_next_hitbox(self):
         """Spawn next hitbox in sequence after previous is hit"""
@@ -270,141 +213,119 @@ class HitBoxSystem:
             next_hitbox = self.active_hitboxes[self.current_hitbox_index]
             punch_type = next_hitbox.get('punch_type', 'JAB')
             
-            # Build exclusion zones
-            face_zone = None
-            if self.face_bbox:
-                face_x, face_y, face_w, face_h = self.face_bbox
-                face_zone = {
-                    'x1': max(0, face_x - 100),
-                    'y1': max(0, face_y - 100),
-                    'x2': min(self.config.CAMERA_WIDTH, face_x + face_w + 100),
-                    'y2': min(self.config.CAMERA_HEIGHT, face_y + face_h + 100)
-                }
-            
-            body_zones = []
-            if self.pose_landmarks:
-                body_landmark_indices = [11, 12, 23, 24]
-                for idx in body_landmark_indices:
-                    if idx < len(self.pose_landmarks):
-                        lm = self.pose_landmarks[idx]
-                        body_x = int(lm.x * self.config.CAMERA_WIDTH)
-                        body_y = int(lm.y * self.config.CAMERA_HEIGHT)
-                        body_zones.append({'cx': body_x, 'cy': body_y, 'radius': 120})
-            
-            # Regenerate position to avoid previous hit position and exclusion zones
-            margin = self.config.HITBOX_MARGIN
-            size = 130
-            placed = False
-            attempts = 0
-            
-            while attempts < 100 and not placed:
-                attempts += 1
-                
-                # Position based on punch type
-                if punch_type == "JAB":
-                    # Left side for JAB
-                    x = random.randint(margin, self.config.CAMERA_WIDTH // 2 - size)
-                else:  # CROSS or HOOK
-                    # Right side for CROSS/HOOK
-                    x = random.randint(self.config.CAMERA_WIDTH // 2, self.config.CAMERA_WIDTH - margin - size)
-                
-                y = random.randint(margin + 150, self.config.CAMERA_HEIGHT - margin - size)
-                
-                center_x = x + size // 2
-                center_y = y + size // 2
-                
-                # Check distance from last hit (must be 150px+ away)
-                if self.last_hit_position:
-                    dist = math.sqrt((center_x - self.last_hit_position[0])**2 + 
-                                   (center_y - self.last_hit_position[1])**2)
-                    if dist < 150:
-                        continue
-                
-                # Check face exclusion zone
-                if face_zone:
-                    if (face_zone['x1'] <= center_x <= face_zone['x2'] and 
-                        face_zone['y1'] <= center_y <= face_zone['y2']):
-                        continue
-                
-                # Check body exclusion zones
-                in_body_zone = False
-                for body_zone in body_zones:
-                    dist_to_body = math.sqrt((center_x - body_zone['cx'])**2 + (center_y - body_zone['cy'])**2)
-                    if dist_to_body < body_zone['radius']:
-                        in_body_zone = True
-                        break
-                
-                if in_body_zone:
-                    continue
-                
-                # Position is valid
-                next_hitbox['x'] = x
-                next_hitbox['y'] = y
-                next_hitbox['center_x'] = center_x
-                next_hitbox['center_y'] = center_y
-                self.last_hit_position = (center_x, center_y)
-                placed = True
-            
-            if not placed:
-                print(f"⚠️ WARNING: spawn_next_hitbox failed for index {self.current_hitbox_index} ({punch_type})")
-                print(f"   Using original position: ({next_hitbox['center_x']}, {next_hitbox['center_y']})")
-                # Use the original pre-generated position as fallback
-                if next_hitbox.get('center_x') and next_hitbox.get('center_y'):
-                    self.last_hit_position = (next_hitbox['center_x'], next_hitbox['center_y'])
-            else:
-                print(f"✓ Spawned hitbox {self.current_hitbox_index} ({punch_type}) at ({center_x}, {center_y})")
+            # New position from the cached grid, 150px+ away from the last hit
+            avoid = [self.last_hit_position] if self.last_hit_position else []
+            x, y = self._pick_position(punch_type, avoid, 150)
+            next_hitbox['x'] = x
+            next_hitbox['y'] = y
+            next_hitbox['center_x'] = x + self.box_size // 2
+            next_hitbox['center_y'] = y + self.box_size // 2
+            self.last_hit_position = (next_hitbox['center_x'], next_hitbox['center_y'])
             
             next_hitbox['active'] = True
             next_hitbox['visible'] = True
+            self._sync_row(self.current_hitbox_index)
             return True
         
         return False
     
     def check_hit(self, hand_x, hand_y, is_fist):
         """Check if fist punch hits any active hitbox (circle collision)"""
-        if not is_fist:
+        return self.check_hits(np.array([(hand_x, hand_y)], dtype=np.float32), is_fist)
+    
+    def check_hits(self, points, is_fist, landmark_ids=None, previous_points=None, sample_time=None, previous_time=None):
+        """Check many fist points (N, 2) against all active hitboxes at once
+        
+        With previous_points, each point's segment from its previous sample position is swept
+        against the circles and the earliest contact wins ('contact_fraction' 0..1 along the
+        segment); points that were already inside a circle at the previous sample do not hit it
+        (a fist resting on a target). Without, this is a point test returning the first hit in
+        point order (then hitbox order), like calling check_hit per point. 'landmark_index' is landmark_ids[point]
+        (or the point's row). 'contact_time' is interpolated between the capture times of the two
+        samples (sample_time alone for a point test, processing time if neither is given).
+        """
+        if not is_fist or not self.active_mask.any():
             return None
         
-        for hitbox in self.active_hitboxes:
-            if not hitbox['active'] or hitbox['id'] in self.hit_hitboxes:
-                continue
-            
-            # Circle collision detection
-            dist = math.sqrt((hand_x - hitbox['center_x'])**2 + (hand_y - hitbox['center_y'])**2)
-            
-            if dist <= hitbox['radius']:
-                # Mark as hit
-                hitbox['active'] = False
-                hitbox['hit_time'] = time.time()
-                self.hit_hitboxes.add(hitbox['id'])
-                
-                # Check if this is the last hitbox in combo
-                is_last_hit = (len(self.hit_hitboxes) == len(self.active_hitboxes))
-                
-                # Get random damage from difficulty settings
-                punch_type = hitbox.get('punch_type', 'JAB')
-                difficulty = self.config.DEFAULT_DIFFICULTY
-                damage_ranges = constants.DIFFICULTY_SETTINGS[difficulty]['player_damage_ranges']
-                damage_range = damage_ranges.get(punch_type, (8, 12))
-                
-                # Random damage within range
-                base_damage = random.randint(damage_range[0], damage_range[1])
-                
-                # Apply 1.1x multiplier for last hit
-                damage = base_damage
-                if is_last_hit:
-                    damage = int(base_damage * 1.1)
-                
-                return {
-                    'hitbox_id': hitbox['id'],
-                    'damage': damage,
-                    'combo': len(self.hit_hitboxes),
-                    'position': (hitbox['center_x'], hitbox['center_y']),
-                    'is_last_hit': is_last_hit,
-                    'punch_type': punch_type
-                }
-        
-        return None
+        end = np.asarray(points, dtype=np.float32)
+        start = end if previous_points is None else np.asarray(previous_points, dtype=np.float32)
+        contact = self._contact_fractions(start, end, from_outside=previous_points is not None)
+        contact[:, ~self.active_mask] = np.inf
+        first_contact = contact.min()
+        if not np.isfinite(first_contact):
+            return None
+        
+        if sample_time is None:
+            contact_time = self.clock.now()
+        elif previous_time is None or previous_points is None:
+            contact_time = sample_time
+        else:
+            contact_time = previous_time + float(first_contact) * (sample_time - previous_time)
+        
+        point_index, hitbox_index = np.unravel_index(np.argmax(contact == first_contact), contact.shape)
+        hit_result = self._register_hit(int(hitbox_index), contact_time)
+        hit_result['landmark_index'] = int(landmark_ids[point_index]) if landmark_ids is not None else int(point_index)
+        hit_result['contact_fraction'] = float(first_contact)
+        hit_result['contact_time'] = contact_time
+        return hit_result
+    
+    def _contact_fractions(self, start, end, from_outside=False):
+        """Earliest t in [0, 1] where start + t * (end - start) enters each circle, inf if never
+        
+        Returns a (points, hitboxes) array; segments starting inside a circle touch it at t = 0,
+        or never with from_outside.
+        """
+        direction = end - start
+        offsets = start[:, None, :] - self.centers[None, :, :]
+        
+        # |offset + t * direction|^2 = r^2  ->  a t^2 + b t + c = 0
+        a = np.einsum('ik,ik->i', direction, direction)[:, None]
+        b = 2 * np.einsum('ik,ijk->ij', direction, offsets)
+        c = np.einsum('ijk,ijk->ij', offsets, offsets) - self.radii ** 2
+        discriminant = b * b - 4 * a * c
+        
+        contact = np.full(c.shape, np.inf, dtype=np.float32)
+        if not from_outside:
+            contact[c <= 0] = 0.0
+        
+        t = (-b - np.sqrt(np.maximum(discriminant, 0))) / np.where(a > 0, 2 * a, 1)
+        entering = (a > 0) & (c > 0) & (discriminant >= 0) & (t >= 0) & (t <= 1)
+        contact[entering] = t[entering]
+        return contact
+    
+    def _register_hit(self, index, hit_time):
+        """Mark hitbox as hit and build the hit result"""
+        hitbox = self.active_hitboxes[index]
+        hitbox['active'] = False
+        hitbox['hit_time'] = hit_time
+        self.hit_hitboxes.add(hitbox['id'])
+        self.active_mask[index] = False
+        
+        # Check if this is the last hitbox in combo
+        is_last_hit = (len(self.hit_hitboxes) == len(self.active_hitboxes))
+        
+        # Get random damage from difficulty settings
+        punch_type = hitbox.get('punch_type', 'JAB')
+        difficulty = self.config.DEFAULT_DIFFICULTY
+        damage_ranges = constants.DIFFICULTY_SETTINGS[difficulty]['player_damage_ranges']
+        damage_range = damage_ranges.get(punch_type, (8, 12))
+        
+        # Random damage within range
+        base_damage = random.randint(damage_range[0], damage_range[1])
+        
+        # Apply 1.1x multiplier for last hit
+        damage = base_damage
+        if is_last_hit:
+            damage = int(base_damage * 1.1)
+        
+        return {
+            'hitbox_id': hitbox['id'],
+            'damage': damage,
+            'combo': len(self.hit_hitboxes),
+            'position': (hitbox['center_x'], hitbox['center_y']),
+            'is_last_hit': is_last_hit,
+            'punch_type': punch_type
+        }
     
     def _calculate_damage(self, combo_count):
         """Calculate damage based on combo"""
@@ -433,6 +354,7 @@ class HitBoxSystem:
         """Clear all hitboxes"""
         self.active_hitboxes = []
         self.hit_hitboxes = set()
+        self._sync_arrays()
     
     def all_hit(self):
         """Check if all hitboxes are hit"""
@@ -7,12 +7,16 @@ import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 
 import pygame
-import time
 from core.config import Config
+from core.clock import GameClock, FixedTimestep
 from systems.vision_system import VisionSystem
 from systems.audio_system import AudioSystem
 from systems.render_system import RenderSystem
 from systems.input_processor import InputProcessor
+from systems.landmark_interpolator import LandmarkInterpolator
+from systems.recorder import GameplayRecorder
+from systems.replay_buffer import ReplayBuffer, ReplayPlayer
+from systems.spectator_server import SpectatorServer
 from entities.player import Player
 from entities.enemy import Enemy
 from game.game_state import GameState
@@ -30,11 +34,28 @@ def main():
     # Initialize configuration
     game_config = Config()
     
+    if game_config.HEADLESS:
+        # Offscreen benchmark run: no window or audio device needed
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    
     # Initialize systems
     vision_system = VisionSystem(game_config)
     audio_system = AudioSystem(game_config)
     render_system = RenderSystem(game_config)
     input_processor = InputProcessor(game_config)
+    landmark_interpolator = LandmarkInterpolator(game_config)
+    recorder = GameplayRecorder(game_config)
+    if recorder.enabled:
+        render_system.add_frame_listener(recorder.capture_frame, recorder.wants_frame)
+    replay_buffer = ReplayBuffer(game_config)
+    replay_player = ReplayPlayer(game_config, replay_buffer)
+    if replay_buffer.enabled:
+        render_system.add_frame_listener(replay_buffer.capture_frame, replay_buffer.wants_frame)
+    spectator_server = SpectatorServer(game_config)
+    if spectator_server.enabled:
+        spectator_server.start()
+        render_system.add_frame_listener(spectator_server.capture_frame, spectator_server.wants_frame)
     
     # Initialize game entities
     player = Player(game_config)
@@ -49,20 +70,40 @@ def main():
     
     # Game state variables
     running = True
-    last_update_time = time.time()
+    game_clock = GameClock()
+    simulation = FixedTimestep(1.0 / game_config.SIMULATION_RATE, game_config.SIMULATION_MAX_STEPS)
+    simulated_states = (constants.GAME_STATES['ROUND_SPLASH'], constants.GAME_STATES['PLAYING'],
+                        constants.GAME_STATES['REST'])
     clock = pygame.time.Clock()
+    frame_count = 0
     
     audio_system.preload_music("ko")
     audio_system.play_music("menu", 0.5)
     
+    # Vision runs on its own thread; the loop below updates and renders at display rate
+    if game_config.VISION_THREADED:
+        vision_system.start()
+    
     while running:
-        current_time = time.time()
-        delta_time = current_time - last_update_time
-        last_update_time = current_time
+        current_time = game_clock.now()
+        previous_state = game_state.current_state
         
-        vision_data = vision_system.get_frame()
-        if vision_data is None:
-            continue
+        if game_config.VISION_THREADED:
+            # Newest vision result, possibly the same one as last frame
+            vision_data = vision_system.get_latest()
+            if vision_data is None:
+                # Waiting for the first processed camera frame
+                render_system.handle_events()
+                clock.tick(game_config.FPS)
+                continue
+        else:
+            vision_data = vision_system.get_frame()
+            if vision_data is None:
+                continue
+        
+        # Landmark visuals (helm, skeleton) are interpolated between vision samples
+        new_vision_sample = landmark_interpolator.push(vision_data, current_time)
+        visual_results = landmark_interpolator.get_results(current_time)
         
         # Handle Pygame events
         pygame_event = render_system.handle_events()
@@ -79,15 +120,18 @@ def main():
         if game_state.current_state == constants.GAME_STATES['MENU']:
             # Store vision data for helm rendering in menu
             game_state.face_bbox = vision_system.get_face_bbox(vision_data['face'])
-            game_state.face_results = vision_data['face']
-            game_state.pose_results = vision_data['pose']
-            game_state.hand_results = vision_data['hands']
+            game_state.face_results = visual_results['face']
+            game_state.pose_results = visual_results['pose']
+            game_state.hand_results = visual_results['hands']
             
             # Let menu system handle input
             menu_command = menu_system.handle_input(keys)
+            if game_config.HEADLESS and menu_command is None:
+                # No keyboard in headless runs, go straight into the match
+                menu_command = "START"
             if menu_command == "START":
                 game_state.start_game()
-                fight_overlay.show_round_start(1)
+                replay_buffer.reset()
                 
                 audio_system.stop_music()
                 audio_system.play_music("fight", 0.3)
@@ -96,68 +140,33 @@ def main():
             elif keys[pygame.K_ESCAPE]:
                 running = False
         
-        elif game_state.current_state == constants.GAME_STATES['ROUND_SPLASH']:
-            if not hasattr(game_state, 'round_sound_played') or not game_state.round_sound_played:
-                round_sound = f"round_{game_state.current_round}"
-                audio_system.play_sound(round_sound)
-                game_state.round_sound_played = True
-            
-            if not fight_overlay.is_active():
-                game_state.start_round(game_state.current_round)
-                audio_system.play_sound("bell")
-        
         elif game_state.current_state == constants.GAME_STATES['PLAYING']:
-            # Process input
-            input_processor.process_input(vision_data, game_state)
+            # Process input once per vision sample
+            if new_vision_sample:
+                input_processor.process_input(vision_data, game_state)
             
-            # Get face bbox for defense and store results for helm rendering
-            game_state.face_bbox = vision_system.get_face_bbox(vision_data['face'])
+            # Get face bbox for defense (stamped with its capture time) and store results for helm rendering
+            game_state.update_face(vision_system.get_face_bbox(vision_data['face']),
+                                   vision_data.get('capture_time', current_time))
             game_state.pose_landmarks = vision_system.get_body_landmarks(vision_data['pose'])  # For fallback targeting
-            game_state.face_results = vision_data['face']
-            game_state.pose_results = vision_data['pose']
-            game_state.hand_results = vision_data['hands']  # For hand skeleton rendering
-            
-            # Update game state (phase transitions, timers, etc)
-            game_state.update(current_time, vision_system)
-            
-            # Play queued sounds
-            for sound_name in game_state.get_active_sounds():
-                audio_system.play_sound(sound_name, 0.7)
+            game_state.face_results = visual_results['face']
+            game_state.pose_results = visual_results['pose']
+            game_state.hand_results = visual_results['hands']  # For hand skeleton rendering
             
             if game_state.ko_effect_active:
+                # Slow-motion replay of the last seconds during the KO and result screens
+                replay_player.play_pre_roll(current_time)
+                
                 if not hasattr(game_state, 'ko_sfx_played') or not game_state.ko_sfx_played:
                     audio_system.play_sound("ko", 1.0)
                     game_state.ko_sfx_played = True
-                
-                if current_time - game_state.ko_start_time >= game_state.ko_duration:
-                    if not game_state.result_shown:
-                        game_state.current_state = constants.GAME_STATES['GAME_OVER']
-                        result_screen.show(game_state.player_won, game_state.score)
-                        game_state.result_shown = True
-                        audio_system.stop_music()
-                        audio_system.play_music("ko", 0.5)
-            
-            # Update player and enemy (even during KO to keep rendering smooth)
-            player.health = game_state.player_health
-            enemy.health = game_state.enemy_health
-            player.score = game_state.score
         
         elif game_state.current_state == constants.GAME_STATES['REST']:
             # Store vision data for helm rendering during rest
             game_state.face_bbox = vision_system.get_face_bbox(vision_data['face'])
-            game_state.face_results = vision_data['face']
-            game_state.pose_results = vision_data['pose']
-            game_state.hand_results = vision_data['hands']
-            
-            if current_time - game_state.rest_start_time >= game_config.REST_DURATION:
-                game_state.current_round += 1
-                if game_state.current_round <= game_config.NUM_ROUNDS:
-                    game_state.current_state = constants.GAME_STATES['ROUND_SPLASH']
-                    fight_overlay.show_round_start(game_state.current_round)
-                    game_state.round_sound_played = False
-                else:
-                    # All rounds complete - handled by game_state.py
-                    pass
+            game_state.face_results = visual_results['face']
+            game_state.pose_results = visual_results['pose']
+            game_state.hand_results = visual_results['hands']
         
         elif game_state.current_state == constants.GAME_STATES['GAME_OVER']:
             # Show result screen if not already shown
@@ -166,21 +175,43 @@ def main():
                 game_state.result_shown = True
                 audio_system.stop_music()
                 audio_system.play_music("ko", 0.5)
+            replay_player.play_pre_roll(current_time)
             
             if command == "SPACE" or keys[pygame.K_RETURN]:
                 player = Player(game_config)
                 enemy = Enemy(game_config)
                 game_state = GameState(game_config)
                 game_state.current_state = constants.GAME_STATES['MENU']
+                replay_player.stop()
                 audio_system.play_music("menu", 0.5)
             elif pygame_event == False:
                 running = False
         
-        # Update game_state timers
-        if game_state.current_state == constants.GAME_STATES['PLAYING']:
-            game_state.round_timer = max(0, game_config.ROUND_DURATION - (current_time - game_state.round_start_time))
-        elif game_state.current_state == constants.GAME_STATES['REST']:
-            game_state.rest_timer = max(0, game_config.REST_DURATION - (current_time - game_state.rest_start_time))
+        # Game logic advances in fixed steps (phase transitions, timers, etc), independent of the render rate
+        if game_state.current_state in simulated_states:
+            for step_time in simulation.advance(current_time):
+                game_state.update(step_time, vision_system)
+        else:
+            simulation.reset(current_time)
+        
+        # Play queued sounds
+        for sound_name in game_state.get_active_sounds():
+            audio_system.play_sound(sound_name, 0.7)
+        
+        # Present state changes made by the simulation
+        if game_state.current_state != previous_state:
+            if game_state.current_state == constants.GAME_STATES['ROUND_SPLASH']:
+                fight_overlay.show_round_start(game_state.current_round)
+                audio_system.play_sound(f"round_{game_state.current_round}")
+            elif (game_state.current_state == constants.GAME_STATES['PLAYING'] and
+                  previous_state == constants.GAME_STATES['ROUND_SPLASH']):
+                audio_system.play_sound("bell")
+        
+        # Update player and enemy (even during KO to keep rendering smooth), including the step that ended the match
+        if previous_state == constants.GAME_STATES['PLAYING'] or game_state.current_state == constants.GAME_STATES['PLAYING']:
+            player.health = game_state.player_health
+            enemy.health = game_state.enemy_health
+            player.score = game_state.score
         
         # Update health values
         game_state.player_health = player.health
@@ -201,12 +232,36 @@ def main():
         elif game_state.current_state == constants.GAME_STATES['GAME_OVER']:
             result_screen.render(render_system.screen)
         
+        # KO replay inset
+        if replay_player.active:
+            if game_state.current_state == constants.GAME_STATES['GAME_OVER']:
+                replay_player.render(render_system.screen, current_time, "top")
+            elif game_state.ko_effect_active:
+                replay_player.render(render_system.screen, current_time, "corner")
+        
         # Update display
-        pygame.display.flip()
-        clock.tick(game_config.FPS)
+        recorder.update(game_state.current_state)
+        render_system.present()
+        if game_config.HEADLESS:
+            # Uncapped to measure render throughput
+            clock.tick()
+            frame_count += 1
+            if game_config.HEADLESS_MAX_FRAMES and frame_count >= game_config.HEADLESS_MAX_FRAMES:
+                running = False
+        else:
+            clock.tick(game_config.FPS)
+    
+    if game_config.HEADLESS:
+        # Steps dropped after stalls: game time fell behind the frame clock
+        print(f"[simulation] {simulation.steps_dropped} fixed steps dropped")
+        frame_age = landmark_interpolator.get_frame_age_stats()
+        if frame_age is not None:
+            print(f"[vision] frame age: avg {frame_age['avg_ms']:.1f} ms, max {frame_age['max_ms']:.1f} ms")
     
     # Clean up resources
     vision_system.release()
+    recorder.close()
+    spectator_server.close()
     render_system.close()
     pygame.quit()
 
@@ -0,0 +1,205 @@
+"""Shadow Boxing - headless match simulator for difficulty tuning and regression checks."""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import deque
+from core.config import Config
+from core.clock import GameClock
+from core import constants
+from game.game_state import GameState
+from systems.input_processor import InputProcessor
+from systems.bot_player import BotPlayer
+
+STAT_KEYS = ('punches', 'landed', 'hits', 'combos', 'combos_complete', 'recognized', 'attacks', 'blocked', 'dodged', 'taken')
+
+def get_difficulty_config(difficulty, combo_mode=Config.COMBO_MODE):
+    """Config class playing the given DIFFICULTY_SETTINGS profile"""
+    return type(f"{difficulty.title()}Config", (Config,), {'DEFAULT_DIFFICULTY': difficulty, 'COMBO_MODE': combo_mode})
+
+def simulate_match(task):
+    """Play one match on virtual time; task is (difficulty, seed, bot settings, vision fps, vision latency, combo mode)"""
+    difficulty, seed, bot_settings, vision_fps, vision_latency, combo_mode = task
+    game_config = get_difficulty_config(difficulty, combo_mode)
+    random.seed(seed)  # Combo choice, hitbox placement, damage rolls and enemy targets
+    clock = GameClock()
+    clock.use_virtual_time(0.0)
+    
+    game_state = GameState(game_config)
+    input_processor = InputProcessor(game_config)
+    bot = BotPlayer(game_config, random.Random(seed * 7919 + 1), **bot_settings)
+    sample_interval = 1.0 / vision_fps
+    step = 1.0 / game_config.SIMULATION_RATE
+    max_time = (game_config.NUM_ROUNDS * (game_config.SPLASH_DURATION + game_config.ROUND_DURATION + game_config.REST_DURATION)
+                + game_state.ko_duration + 10)
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    next_sample = None
+    in_flight = deque()  # Captured samples still in the vision pipeline (delivered vision_latency later)
+    phase = game_state.phase
+    landed_punches = set()  # Bot punches that hit at least one target
+    
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # Gameplay logging is per hit, far too chatty here
+        game_state.start_game()
+        while game_state.current_state != constants.GAME_STATES['GAME_OVER'] and clock.now() < max_time:
+            current_time = clock.now()
+            sampling = game_state.current_state == constants.GAME_STATES['PLAYING'] and not game_state.ko_effect_active
+            
+            # Vision sample: bot landmarks captured now, processed by the real input processor once
+            # they come out of the pipeline, as in the main loop
+            if sampling:
+                if next_sample is None:
+                    next_sample = current_time
+                if current_time >= next_sample:
+                    in_flight.append(bot.sample(game_state, current_time))
+                    next_sample += sample_interval
+                while in_flight and in_flight[0]['capture_time'] + vision_latency <= current_time:
+                    vision_data = in_flight.popleft()
+                    game_state.update_face(vision_data['face_bbox'], vision_data['capture_time'])
+                    game_state.pose_landmarks = vision_data['pose'].pose_landmarks.landmark
+                    input_processor.process_input(vision_data, game_state)
+                    stats['hits'] += len(game_state.vfx_hits)
+                    if game_state.vfx_hits and vision_data['punch_id'] is not None:
+                        landed_punches.add(vision_data['punch_id'])
+                    game_state.vfx_hits.clear()
+            else:
+                next_sample = None
+                in_flight.clear()
+            
+            game_state.update(current_time, None)
+            
+            # Enemy attack outcomes and combo results
+            for effect in game_state.vfx_effects:
+                stats['attacks'] += 1
+                stats[{'miss': 'dodged', 'block': 'blocked'}.get(effect['type'], 'taken')] += 1
+            game_state.vfx_effects.clear()
+            game_state.get_active_sounds()
+            if phase == constants.PHASE_STATES['PLAYER_ATTACK'] and game_state.phase != phase:
+                stats['combos'] += 1
+                # Free play phases count as complete when any combo was recognized
+                recognized = len(game_state.combo_system.recognized_combos) if game_state.free_play else 0
+                stats['combos_complete'] += int(game_state.combo_system.is_combo_complete() or recognized > 0)
+                stats['recognized'] += recognized
+            phase = game_state.phase
+            
+            # Fast-forward to the next thing that can change the match (sampling starts as soon as play does)
+            next_time = game_state.get_next_event_time()
+            sampling = game_state.current_state == constants.GAME_STATES['PLAYING'] and not game_state.ko_effect_active
+            if sampling:
+                if next_sample is None:
+                    next_sample = current_time
+                next_vision = next_sample
+                if in_flight:
+                    next_vision = min(next_vision, in_flight[0]['capture_time'] + vision_latency)
+                next_time = next_vision if next_time is None else min(next_time, next_vision)
+            clock.advance_to(next_time if next_time is not None and next_time > current_time else current_time + step)
+    
+    stats['punches'] = bot.punches_thrown
+    stats['landed'] = len(landed_punches)
+    return {
+        'difficulty': difficulty,
+        'seed': seed,
+        'player_won': bool(getattr(game_state, 'player_won', False)),
+        'knockout': game_state.player_health <= 0 or game_state.enemy_health <= 0,
+        'rounds': game_state.current_round,
+        'duration': clock.now(),
+        'player_health': game_state.player_health,
+        'enemy_health': game_state.enemy_health,
+        'finished': game_state.current_state == constants.GAME_STATES['GAME_OVER'],
+        'cpu_time': time.perf_counter() - started,
+        **stats
+    }
+
+def aggregate(results):
+    """Outcome statistics per difficulty"""
+    summary = {}
+    for difficulty in sorted({result['difficulty'] for result in results}):
+        matches = [result for result in results if result['difficulty'] == difficulty]
+        count = len(matches)
+        totals = {key: sum(result[key] for result in matches) for key in STAT_KEYS}
+        summary[difficulty] = {
+            'matches': count,
+            'win_rate': sum(result['player_won'] for result in matches) / count,
+            'ko_win_rate': sum(result['player_won'] and result['knockout'] for result in matches) / count,
+            'ko_loss_rate': sum(not result['player_won'] and result['knockout'] for result in matches) / count,
+            'unfinished': sum(not result['finished'] for result in matches),
+            'avg_duration': sum(result['duration'] for result in matches) / count,
+            'avg_player_health': sum(result['player_health'] for result in matches) / count,
+            'avg_enemy_health': sum(result['enemy_health'] for result in matches) / count,
+            'hit_accuracy': totals['landed'] / max(1, totals['punches']),  # Share of bot punches that hit a target
+            'combo_completion': totals['combos_complete'] / max(1, totals['combos']),
+            'combos_per_phase': totals['recognized'] / max(1, totals['combos']),
+            'block_rate': totals['blocked'] / max(1, totals['attacks']),
+            'dodge_rate': totals['dodged'] / max(1, totals['attacks']),
+            'hit_taken_rate': totals['taken'] / max(1, totals['attacks']),
+            **{f'total_{key}': value for key, value in totals.items()}
+        }
+    return summary
+
+def run_simulations(difficulties, matches, seed, bot_settings, vision_fps=30, workers=None, vision_latency=0.0,
+                    combo_mode=Config.COMBO_MODE):
+    """Play matches per difficulty over a process pool; seeds repeat across difficulties"""
+    tasks = [(difficulty, seed + index, bot_settings, vision_fps, vision_latency, combo_mode)
+             for difficulty in difficulties for index in range(matches)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [simulate_match(task) for task in tasks]
+    with multiprocessing.Pool(workers) as pool:
+        return list(pool.imap_unordered(simulate_match, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+
+def print_summary(summary):
+    """Print the per-difficulty outcome table"""
+    print(f"{'Difficulty':10s} {'Matches':>7s} {'Win':>6s} {'KO win':>7s} {'KO loss':>8s} {'Time':>6s} "
+          f"{'HP P/E':>9s} {'Acc':>5s} {'Combo':>6s} {'Block':>6s} {'Dodge':>6s} {'Taken':>6s}")
+    for difficulty, stats in summary.items():
+        print(f"{difficulty:10s} {stats['matches']:7d} {stats['win_rate']:6.1%} {stats['ko_win_rate']:7.1%} "
+              f"{stats['ko_loss_rate']:8.1%} {stats['avg_duration']:5.1f}s "
+              f"{stats['avg_player_health']:4.0f}/{stats['avg_enemy_health']:<4.0f} {stats['hit_accuracy']:5.0%} "
+              f"{stats['combo_completion']:6.0%} {stats['block_rate']:6.0%} {stats['dodge_rate']:6.0%} "
+              f"{stats['hit_taken_rate']:6.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless bot matches and report outcomes per difficulty")
+    parser.add_argument('--matches', type=int, default=200, help="matches per difficulty")
+    parser.add_argument('--difficulty', nargs='+', default=list(Config.DIFFICULTY_SETTINGS), help="profiles to play")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument('--vision-fps', type=float, default=30, help="landmark samples per second")
+    parser.add_argument('--combo-mode', choices=('sequence', 'free'), default=Config.COMBO_MODE)
+    parser.add_argument('--latency', type=float, default=0.0, help="capture-to-processing vision latency (s)")
+    parser.add_argument('--reaction', type=float, default=0.35, help="bot reaction time (s)")
+    parser.add_argument('--jitter', type=float, default=0.08, help="reaction time standard deviation (s)")
+    parser.add_argument('--accuracy', type=float, default=0.8, help="chance a punch is on target")
+    parser.add_argument('--speed', type=float, default=2500, help="fist speed (camera px/s)")
+    parser.add_argument('--guard', type=float, default=0.7, help="chance to guard an enemy attack")
+    parser.add_argument('--dodge', type=float, default=0.1, help="chance to slip an enemy attack")
+    parser.add_argument('--json', help="write the summary to this file")
+    args = parser.parse_args()
+    
+    bot_settings = {
+        'reaction_time': args.reaction,
+        'reaction_jitter': args.jitter,
+        'accuracy': args.accuracy,
+        'punch_speed': args.speed,
+        'guard_rate': args.guard,
+        'dodge_rate': args.dodge
+    }
+    started = time.perf_counter()
+    results = run_simulations(args.difficulty, args.matches, args.seed, bot_settings, args.vision_fps, args.workers,
+                              args.latency, args.combo_mode)
+    elapsed = time.perf_counter() - started
+    
+    summary = aggregate(results)
+    print_summary(summary)
+    print(f"{len(results)} matches in {elapsed:.1f}s ({len(results) / elapsed * 60:.0f} matches/min)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'bot': bot_settings, 'seed': args.seed, 'latency': args.latency, 'summary': summary}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Bot player - procedural hand/pose/face landmark streams for headless match simulation."""
+
+import math
+from types import SimpleNamespace
+import numpy as np
+from core import constants
+
+# Hand landmark offsets from the middle finger MCP (landmark 9), in units of the hand scale
+FIST_TEMPLATE = np.array([
+    (0.0, 2.2),                                                # 0 wrist
+    (-0.9, 1.6), (-1.2, 1.0), (-1.0, 0.5), (-0.6, 0.2),        # 1-4 thumb
+    (-0.75, 0.0), (-0.75, -0.8), (-0.6, -0.45), (-0.65, -0.1),  # 5-8 index
+    (-0.25, 0.0), (-0.25, -0.8), (-0.1, -0.45), (-0.15, -0.1),  # 9-12 middle
+    (0.25, 0.0), (0.25, -0.8), (0.4, -0.45), (0.35, -0.1),      # 13-16 ring
+    (0.75, 0.0), (0.75, -0.8), (0.9, -0.45), (0.85, -0.1)       # 17-20 pinky
+]) - (-0.25, 0.0)
+OPEN_TEMPLATE = np.array([
+    (0.0, 2.2),
+    (-0.9, 1.6), (-1.3, 1.0), (-1.6, 0.5), (-1.9, 0.1),
+    (-0.75, 0.0), (-0.8, -0.9), (-0.85, -1.5), (-0.9, -2.0),
+    (-0.25, 0.0), (-0.25, -1.0), (-0.25, -1.7), (-0.25, -2.2),
+    (0.25, 0.0), (0.3, -0.9), (0.35, -1.5), (0.4, -2.0),
+    (0.75, 0.0), (0.85, -0.7), (0.95, -1.2), (1.05, -1.6)
+]) - (-0.25, 0.0)
+
+class BotHand:
+    """One fist moving between its rest position and punch/guard targets at a fixed speed"""
+    
+    def __init__(self, label, rest_position):
+        self.label = label
+        self.rest_position = np.array(rest_position, dtype=np.float64)
+        self.position = self.rest_position.copy()
+        self.goal = self.rest_position.copy()
+        self.speed = 0.0
+        self.start_time = None  # Movement towards goal starts at this time (reaction delay)
+        self.open_hand = False
+    
+    def move_to(self, goal, speed, start_time):
+        """Start moving towards goal at start_time"""
+        self.goal = np.array(goal, dtype=np.float64)
+        self.speed = speed
+        self.start_time = start_time
+    
+    def update(self, dt, current_time):
+        """Advance towards the goal; returns True once it is reached"""
+        if self.start_time is None or current_time < self.start_time:
+            return False
+        offset = self.goal - self.position
+        distance = math.hypot(offset[0], offset[1])
+        travel = self.speed * dt
+        if distance <= travel:
+            self.position = self.goal.copy()
+            return True
+        self.position += offset * (travel / distance)
+        return False
+
+class BotPlayer:
+    """Scripted opponent for the game's own systems, seen through synthetic landmarks
+    
+    Punches the current target after a reaction delay, with a chance to miss by more than the
+    target radius; raises its guard and/or slips its head on enemy warnings. All randomness
+    comes from the rng passed in, so a seeded bot plays the same match every time.
+    """
+    
+    def __init__(self, game_config, rng, reaction_time=0.35, reaction_jitter=0.08, accuracy=0.8,
+                 punch_speed=2500.0, guard_rate=0.7, dodge_rate=0.1, hand_scale=40.0):
+        self.config = game_config
+        self.rng = rng
+        self.reaction_time = reaction_time
+        self.reaction_jitter = reaction_jitter
+        self.accuracy = accuracy
+        self.punch_speed = punch_speed
+        self.guard_rate = guard_rate
+        self.dodge_rate = dodge_rate
+        self.hand_scale = hand_scale
+        
+        width, height = self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT
+        self.frame_size = np.array([width, height], dtype=np.float64)
+        self.hands = {
+            'Left': BotHand('Left', (width * 0.35, height * 0.75)),
+            'Right': BotHand('Right', (width * 0.65, height * 0.75))
+        }
+        self.head_rest = np.array([width * 0.5, height * 0.35])
+        self.head = BotHand('Head', self.head_rest)
+        self.face_size = (200, 250)
+        
+        self.last_time = None
+        self.current_target = None  # Hitbox id being punched
+        self.last_target = None  # Retries at the same target react faster
+        self.punch_hand = None
+        self.retracting = False
+        self.defended_attack = None  # Enemy swing (warning start time, combo count) already reacted to
+        self.punches_thrown = 0
+    
+    def _reaction(self):
+        """Random reaction delay"""
+        return max(0.05, self.rng.gauss(self.reaction_time, self.reaction_jitter))
+    
+    def sample(self, game_state, current_time):
+        """Move for one vision sample and return vision data like VisionSystem.get_frame()"""
+        dt = 0.0 if self.last_time is None else current_time - self.last_time
+        self.last_time = current_time
+        
+        if game_state.phase == constants.PHASE_STATES['PLAYER_ATTACK']:
+            self._attack(game_state, current_time)
+        else:
+            self._defend(game_state, current_time)
+        
+        for hand in self.hands.values():
+            hand.update(dt, current_time)
+        self.head.update(dt, current_time)
+        
+        return {
+            'hands': self._hand_results(),
+            'pose': SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=self._pose_landmarks())),
+            'face_bbox': self._face_bbox(),
+            'capture_time': current_time,
+            'punch_id': self.punches_thrown if self.punch_hand is not None else None  # Punch in flight, for hit attribution
+        }
+    
+    def _attack(self, game_state, current_time):
+        """Punch the current target, retract and retry until it is hit"""
+        self.defended_attack = None
+        self.head.move_to(self.head_rest, self.punch_speed / 2, current_time)
+        for hand in self.hands.values():
+            hand.open_hand = False
+        
+        target = next((hb for hb in game_state.hitbox_system.get_all_hitboxes()
+                       if hb['active'] and hb.get('visible', True)), None)
+        
+        if self.punch_hand is not None:
+            hand = self.hands[self.punch_hand]
+            reached = np.allclose(hand.position, hand.goal)
+            if self.retracting:
+                if reached:
+                    self.punch_hand = None
+                    self.retracting = False
+                return
+            if reached or target is None or target['id'] != self.current_target:
+                # Punch landed or missed - pull back
+                hand.move_to(hand.rest_position, self.punch_speed, current_time)
+                self.retracting = True
+            return
+        
+        if target is None:
+            return
+        
+        # New punch after a reaction delay, aimed at the target (or beside it on a miss)
+        center = np.array([target['center_x'], target['center_y']], dtype=np.float64)
+        angle = self.rng.uniform(0, 2 * math.pi)
+        radius = game_state.hitbox_system.hitbox_radius
+        if self.rng.random() < self.accuracy:
+            offset = self.rng.uniform(0, 0.5) * radius
+        else:
+            offset = self.rng.uniform(1.6, 3.0) * radius
+        aim = center + offset * np.array([math.cos(angle), math.sin(angle)])
+        
+        self.punch_hand = 'Left' if center[0] < self.config.CAMERA_WIDTH / 2 else 'Right'
+        self.current_target = target['id']
+        self.retracting = False
+        delay = self._reaction() if target['id'] != self.last_target else self._reaction() / 2
+        self.last_target = target['id']
+        self.hands[self.punch_hand].move_to(aim, self.punch_speed, current_time + delay)
+        self.punches_thrown += 1
+    
+    def _defend(self, game_state, current_time):
+        """React once per enemy swing: guard the eyes and/or slip the head"""
+        self.punch_hand = None
+        self.retracting = False
+        enemy = game_state.enemy_attack_system
+        attack = (enemy.warning_start_time, enemy.combo_count)
+        if self.defended_attack == attack:
+            return
+        self.defended_attack = attack
+        
+        start_time = current_time + self._reaction()
+        if self.rng.random() < self.guard_rate:
+            eyes = self.head_rest - (0, self.face_size[1] * 0.1)
+            for label, side in (('Left', -1), ('Right', 1)):
+                hand = self.hands[label]
+                hand.open_hand = True
+                # Fingertips end up around the eyes
+                hand.move_to(eyes + (side * self.hand_scale, self.hand_scale * 1.8), self.punch_speed, start_time)
+        else:
+            for hand in self.hands.values():
+                hand.move_to(hand.rest_position, self.punch_speed, current_time)
+        
+        if self.rng.random() < self.dodge_rate:
+            # Slip away from where the head is now (the next swing aims at the current face)
+            if np.allclose(self.head.goal, self.head_rest):
+                side = self.rng.choice((-1, 1))
+                self.head.move_to(self.head_rest + (side * self.face_size[0] * 1.5, 0), self.punch_speed, start_time)
+            else:
+                self.head.move_to(self.head_rest, self.punch_speed, start_time)
+    
+    def _hand_results(self):
+        """Synthetic MediaPipe hand results for both hands"""
+        landmarks, handedness = [], []
+        for label, hand in self.hands.items():
+            template = OPEN_TEMPLATE if hand.open_hand else FIST_TEMPLATE
+            points = (hand.position + template * self.hand_scale) / self.frame_size
+            landmarks.append(SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=0.0) for x, y in points]))
+            handedness.append(SimpleNamespace(classification=[SimpleNamespace(label=label, score=0.95)]))
+        return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+    
+    def _pose_landmarks(self):
+        """Synthetic 33 pose landmarks around the head, shoulders and hips"""
+        head_x, head_y = self.head.position
+        face_w, face_h = self.face_size
+        points = np.tile([head_x, head_y], (33, 1))
+        points[1:4] = [(head_x - face_w * (0.1 + 0.1 * i), head_y - face_h * 0.1) for i in range(3)]  # Left eye
+        points[4:7] = [(head_x + face_w * (0.1 + 0.1 * i), head_y - face_h * 0.1) for i in range(3)]  # Right eye
+        points[7:11] = [(head_x - face_w * 0.5, head_y), (head_x + face_w * 0.5, head_y),
+                        (head_x - face_w * 0.1, head_y + face_h * 0.3), (head_x + face_w * 0.1, head_y + face_h * 0.3)]
+        points[11:23] = [(head_x + side * face_w * 0.9, head_y + face_h * 1.1) for side in (-1, 1)] * 6  # Shoulders, arms
+        points[23:33] = [(head_x + side * face_w * 0.6, head_y + face_h * 2.4) for side in (-1, 1)] * 5  # Hips, legs
+        normalized = points / self.frame_size
+        return [SimpleNamespace(x=x, y=y, z=0.0, visibility=1.0) for x, y in normalized]
+    
+    def _face_bbox(self):
+        """Face bounding box in camera pixels"""
+        face_w, face_h = self.face_size
+        return (int(self.head.position[0] - face_w / 2), int(self.head.position[1] - face_h / 2), face_w, face_h)
@@ -0,0 +1,93 @@
+"""Compositor - named render layers built from cached panels that redraw only on change."""
+
+import pygame
+
+class CachedPanel:
+    """Offscreen surface that is redrawn only when its input key changes"""
+    
+    def __init__(self, name, size, position=(0, 0)):
+        self.name = name
+        self.size = size
+        self.position = position
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.key = None
+        self.visible = True
+        self.alpha = 255
+        self.redraw_count = 0
+    
+    def update(self, key, draw_fn):
+        """Redraw with draw_fn(surface) if key differs from the last drawn key"""
+        self.visible = True
+        if key == self.key:
+            return False
+        
+        self.surface.fill((0, 0, 0, 0))
+        draw_fn(self.surface)
+        self.key = key
+        self.redraw_count += 1
+        return True
+    
+    def set_alpha(self, alpha):
+        """Set panel opacity without redrawing its contents"""
+        if alpha != self.alpha:
+            self.alpha = alpha
+            self.surface.set_alpha(alpha)
+    
+    def invalidate(self):
+        """Force a redraw on the next update"""
+        self.key = None
+
+class Compositor:
+    # Back-to-front draw order
+    LAYER_ORDER = ('camera', 'world', 'hud', 'overlay')
+    
+    def __init__(self, game_config, backend=None):
+        self.config = game_config
+        self.backend = backend  # Render backend; panels become cached textures on the texture backend
+        self.layers = {name: {} for name in self.LAYER_ORDER}
+    
+    def get_panel(self, layer_name, panel_name, size, position=(0, 0)):
+        """Get or create a cached panel in a layer (recreated if its size changes)"""
+        layer = self.layers[layer_name]
+        panel = layer.get(panel_name)
+        if panel is None or panel.size != size:
+            panel = CachedPanel(panel_name, size, position)
+            layer[panel_name] = panel
+        panel.position = position
+        return panel
+    
+    def begin_layer(self, layer_name):
+        """Hide all panels of a layer; panels updated this frame become visible again"""
+        for panel in self.layers[layer_name].values():
+            panel.visible = False
+    
+    def blit_panel(self, screen, panel):
+        """Blit a single panel onto screen"""
+        if self.backend is not None and self.backend.uses_textures and self.backend.handles(screen):
+            self.backend.blit_static(panel.surface, panel.position, panel.redraw_count)
+        else:
+            screen.blit(panel.surface, panel.position)
+    
+    def composite(self, screen, layer_name):
+        """Blit all visible panels of a layer in insertion order"""
+        panels = [panel for panel in self.layers[layer_name].values() if panel.visible]
+        if self.backend is not None and self.backend.uses_textures and self.backend.handles(screen):
+            for panel in panels:
+                self.backend.blit_static(panel.surface, panel.position, panel.redraw_count)
+        else:
+            screen.blits([(panel.surface, panel.position) for panel in panels], doreturn=False)
+    
+    def invalidate(self, layer_name=None):
+        """Force redraw of one layer or all layers"""
+        names = [layer_name] if layer_name else self.LAYER_ORDER
+        for name in names:
+            for panel in self.layers[name].values():
+                panel.invalidate()
+    
+    def get_redraw_counts(self):
+        """Get per-panel redraw counters for profiling"""
+        return {
+            f"{layer_name}.{panel_name}": panel.redraw_count
+            for layer_name, layer in self.layers.items()
+            for panel_name, panel in layer.items()
+        }
@@ -0,0 +1,121 @@
+"""Face motion - face box history and latency-compensated face position prediction."""
+
+from collections import deque
+import numpy as np
+
+class FaceMotion:
+    """Predicts where the face is at a given game time from recent face boxes
+    
+    Face boxes arrive one capture-plus-inference latency late. The face center is extrapolated
+    from its newest box to the requested time with the velocity fitted over the last
+    FACE_PREDICTION_WINDOW seconds (lead capped at FACE_PREDICTION_MAX_LEAD); times already covered by
+    the history are interpolated instead. Each prediction is checked against the boxes captured
+    around its time once they arrive, and the error is logged.
+    """
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        size = self.config.FACE_HISTORY
+        self.boxes = np.zeros((size, 4), dtype=np.float64)  # x, y, w, h
+        self.times = np.zeros(size, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.pending = []  # Predictions waiting for the samples around their time: (time, center, latency)
+        self.latencies = deque(maxlen=50)
+        self.errors = deque(maxlen=50)
+    
+    def update(self, face_bbox, capture_time):
+        """Add the face box of a vision sample (None when the face is lost)"""
+        if face_bbox is None:
+            self.reset()
+            return
+        if self.count and capture_time <= self.times[(self.index - 1) % len(self.times)]:
+            return  # Same or out-of-order sample
+        self.boxes[self.index] = face_bbox
+        self.times[self.index] = capture_time
+        self.index = (self.index + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+        self._check_predictions()
+    
+    def reset(self):
+        """Forget history (face lost); unresolved predictions are dropped"""
+        self.count = 0
+        self.pending = []
+    
+    def _latest(self, n):
+        """Get the newest n boxes and capture times in time order"""
+        n = min(n, self.count)
+        order = (self.index - n + np.arange(n)) % len(self.times)
+        return self.boxes[order], self.times[order]
+    
+    def get_velocity(self):
+        """Face center velocity (px/s), least-squares fit over the prediction window"""
+        if self.count < 2:
+            return np.zeros(2)
+        boxes, times = self._latest(self.count)
+        recent = times >= times[-1] - self.config.FACE_PREDICTION_WINDOW
+        if np.count_nonzero(recent) < 2:
+            return np.zeros(2)
+        centers = boxes[recent, :2] + boxes[recent, 2:] / 2
+        offsets = times[recent] - times[recent].mean()
+        return offsets @ (centers - centers.mean(axis=0)) / max(offsets @ offsets, 1e-9)
+    
+    def predict(self, target_time):
+        """Get the face box extrapolated to target_time (None without a face); the prediction is logged"""
+        if not self.count:
+            return None
+        boxes, times = self._latest(self.count)
+        latency = target_time - times[-1]
+        if latency < 0:
+            # Game time lags the newest capture (fixed steps catching up) - use the box captured around target_time
+            lead, shift = 0.0, self._interpolate(target_time)[:2] - boxes[-1][:2]
+        else:
+            lead = min(latency, self.config.FACE_PREDICTION_MAX_LEAD)
+            shift = self.get_velocity() * lead
+        x, y, w, h = boxes[-1]
+        x, y = x + shift[0], y + shift[1]
+        
+        self.latencies.append(latency)
+        self.pending.append((target_time, np.array([x + w / 2, y + h / 2]), latency))
+        if self.config.FACE_PREDICTION_LOG:
+            print(f"🎯 Face prediction: latency {latency * 1000:.0f}ms, lead {lead * 1000:.0f}ms, "
+                  f"shift ({shift[0]:+.0f}, {shift[1]:+.0f})px")
+        return (int(round(x)), int(round(y)), int(w), int(h))
+    
+    def _interpolate(self, target_time):
+        """Face box at a time covered by the history, interpolated between the samples around it"""
+        boxes, times = self._latest(self.count)
+        if self.count < 2:
+            return boxes[-1]
+        i = min(max(int(np.searchsorted(times, target_time)), 1), self.count - 1)
+        fraction = min(1.0, max(0.0, (target_time - times[i - 1]) / max(times[i] - times[i - 1], 1e-9)))
+        return boxes[i - 1] + (boxes[i] - boxes[i - 1]) * fraction
+    
+    def _check_predictions(self):
+        """Score pending predictions whose time is now covered by captured samples"""
+        newest_time = self.times[(self.index - 1) % len(self.times)]
+        still_pending = []
+        for target_time, predicted, latency in self.pending:
+            if target_time > newest_time:
+                still_pending.append((target_time, predicted, latency))
+                continue
+            # Actual face center at target_time
+            box = self._interpolate(target_time)
+            actual = box[:2] + box[2:] / 2
+            error = float(np.hypot(*(predicted - actual)))
+            self.errors.append(error)
+            if self.config.FACE_PREDICTION_LOG:
+                print(f"   Face prediction error: {error:.0f}px at latency {latency * 1000:.0f}ms "
+                      f"(avg {np.mean(self.errors):.0f}px over {len(self.errors)})")
+        self.pending = still_pending
+    
+    def get_stats(self):
+        """Get recent prediction latency (ms) and error (px) for tuning"""
+        if not self.latencies:
+            return None
+        return {
+            'avg_latency_ms': float(np.mean(self.latencies)) * 1000,
+            'avg_error_px': float(np.mean(self.errors)) if self.errors else None,
+            'max_error_px': float(np.max(self.errors)) if self.errors else None,
+            'predictions': len(self.latencies)
+        }
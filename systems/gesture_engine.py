@@ -0,0 +1,91 @@
+"""Gesture engine - batched fist and guard features for all detected hands."""
+
+import numpy as np
+
+class GestureEngine:
+    """Computes fist and guard features of all hands in one vectorized pass
+    
+    Works on stacked landmark arrays instead of per-landmark helper calls, so the cost no longer
+    comes from NumPy overhead on tiny arrays. Thresholds are plain attributes initialised from
+    the config and can be changed at runtime (e.g. by a calibration step).
+    """
+    FINGERTIP_IDS = np.array([8, 12, 16, 20])  # Index, middle, ring, pinky tips
+    PALM_ID = 9  # Middle finger MCP
+    FINGER_JOINT_IDS = np.stack([FINGERTIP_IDS, FINGERTIP_IDS - 1, FINGERTIP_IDS - 2, np.full(4, PALM_ID)])
+    EYE_IDS = [1, 2, 3, 4, 5, 6]  # Pose eye landmarks (inner, center, outer of both eyes)
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.fist_angle_threshold = game_config.FIST_ANGLE_THRESHOLD
+        self.fist_distance_threshold = game_config.FIST_DISTANCE_THRESHOLD
+        self.defense_radius = game_config.DEFENSE_RADIUS
+        self.frame_size = np.array([game_config.CAMERA_WIDTH, game_config.CAMERA_HEIGHT], dtype=np.float64)
+    
+    def get_eye_points(self, pose_landmarks):
+        """Get normalized eye landmark positions from pose landmarks (None if unavailable)"""
+        if not pose_landmarks:
+            return None
+        points = [(pose_landmarks[i].x, pose_landmarks[i].y) for i in self.EYE_IDS if i < len(pose_landmarks)]
+        return np.array(points, dtype=np.float64) if points else None
+    
+    def analyze(self, hand_points, eye_points=None, hand_scores=None):
+        """Analyze hands (hands, 21, 2) of normalized landmarks against optional eye points (n, 2)
+        
+        Per hand: fist_angle (avg finger joint angle), fist_distance (avg fingertip-to-palm distance),
+        fist_score (0..1, 0.5 at the thresholds), is_fist, confidence (handedness score times how
+        clear-cut the fist decision is), guard_distance (closest fingertip to the eye centroid, px)
+        and guarding. Overall: guard_coverage (share of fingertips inside the defense radius) and
+        defense_active (at least one hand guarding).
+        """
+        hand_points = np.asarray(hand_points, dtype=np.float64).reshape(-1, 21, 2)
+        hand_count = len(hand_points)
+        if hand_scores is None:
+            hand_scores = np.ones(hand_count)
+        
+        # (hands, 4 points, 4 fingers, 2): tip, middle joint, base joint, palm
+        fingers = hand_points[:, self.FINGER_JOINT_IDS]
+        tips = fingers[:, 0]
+        # Middle joint -> tip, middle joint -> base and palm -> tip vectors
+        vectors = fingers[:, [0, 2, 0]] - fingers[:, [1, 1, 3]]
+        lengths = np.sqrt((vectors * vectors).sum(axis=3))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Angle at each finger's middle joint via dot products
+            cosine = (vectors[:, 0] * vectors[:, 1]).sum(axis=2) / (lengths[:, 0] * lengths[:, 1])
+            fist_angle = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0))).mean(axis=1)
+            fist_distance = lengths[:, 2].mean(axis=1)
+            is_fist = (fist_angle < self.fist_angle_threshold) & (fist_distance < self.fist_distance_threshold)
+            
+            # Scores reach 0.5 at the thresholds and grow towards 1 with margin
+            angle_score = (180.0 - fist_angle) / (180.0 - self.fist_angle_threshold)
+            distance_score = 2.0 - fist_distance / self.fist_distance_threshold
+            fist_score = np.nan_to_num(np.clip(np.minimum(angle_score, distance_score), 0.0, 2.0) / 2)
+        
+        confidence = np.asarray(hand_scores, dtype=np.float64) * np.abs(fist_score - 0.5) * 2
+        
+        # Guard: fingertips near the eye centroid (pixel coordinates)
+        guard_distance = np.full(hand_count, np.inf)
+        guarding = np.zeros(hand_count, dtype=bool)
+        guard_coverage = 0.0
+        if eye_points is not None and len(eye_points) and hand_count:
+            eye_pixels = (np.asarray(eye_points) * self.frame_size).astype(np.int64)
+            eye_center = eye_pixels.sum(axis=0) // len(eye_pixels)
+            tip_pixels = (tips * self.frame_size).astype(np.int64)
+            offsets = tip_pixels - eye_center
+            squared = (offsets * offsets).sum(axis=2)
+            inside = squared < self.defense_radius ** 2
+            guard_distance = np.sqrt(squared.min(axis=1))
+            guarding = inside.any(axis=1)
+            guard_coverage = float(inside.mean())
+        
+        return {
+            'fist_angle': fist_angle,
+            'fist_distance': fist_distance,
+            'fist_score': fist_score,
+            'is_fist': is_fist,
+            'confidence': confidence,
+            'guard_distance': guard_distance,
+            'guarding': guarding,
+            'guard_coverage': guard_coverage,
+            'defense_active': bool(guarding.any())
+        }
@@ -0,0 +1,165 @@
+"""Hand kinematics - per-hand motion history, punch detection and punch classification."""
+
+import numpy as np
+
+class HandTrack:
+    """Fixed-size ring buffer of one hand's positions and timestamps plus its punch state"""
+    
+    def __init__(self, size):
+        self.positions = np.zeros((size, 2), dtype=np.float64)
+        self.times = np.zeros(size, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.rest_position = None  # Where the hand idles (guard), punches move away from it
+        self.retracting = False  # Moving fast back towards the rest position
+        
+        # Current or last punch
+        self.punching = False
+        self.onset_time = 0.0
+        self.onset_position = None
+        self.peak_speed = 0.0
+        self.peak_time = 0.0
+        self.end_time = None
+        self.punch_type = None
+    
+    def push(self, position, timestamp):
+        """Append a sample, overwriting the oldest one"""
+        self.positions[self.index] = position
+        self.times[self.index] = timestamp
+        self.index = (self.index + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+    
+    def latest(self, n):
+        """Get the newest n samples in time order"""
+        n = min(n, self.count)
+        order = (self.index - n + np.arange(n)) % len(self.times)
+        return self.positions[order], self.times[order]
+    
+    def reset(self):
+        """Forget history (hand lost)"""
+        self.count = 0
+        self.punching = False
+        self.retracting = False
+        self.rest_position = None
+
+class HandKinematics:
+    """Tracks hand velocity/acceleration and recognizes punches from motion
+    
+    A punch starts when the smoothed hand speed crosses VELOCITY_THRESHOLD while moving away from
+    the hand's rest position, and ends once speed drops below VELOCITY_THRESHOLD * PUNCH_END_RATIO
+    or the hand turns back towards rest, so pulling the fist back is never a punch. Hits land at the
+    end of the extension, when the fist is already slowing down, so a punch stays hit-eligible for
+    PUNCH_HIT_WINDOW after it ends. Mostly horizontal punches are hooks; straight punches are jabs
+    from the lead hand and crosses from the rear hand.
+    """
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.tracks = {}
+    
+    def _get_track(self, hand_label):
+        """Get or create the track of a hand"""
+        track = self.tracks.get(hand_label)
+        if track is None:
+            track = HandTrack(self.config.KINEMATICS_HISTORY)
+            self.tracks[hand_label] = track
+        return track
+    
+    def update(self, hand_label, position, timestamp):
+        """Add a hand sample (camera pixels) and advance its punch state"""
+        track = self._get_track(hand_label)
+        if track.count and timestamp <= track.times[(track.index - 1) % len(track.times)]:
+            return  # Same or out-of-order sample
+        track.push(position, timestamp)
+        
+        velocity, acceleration = self._derivatives(track)
+        speed = float(np.hypot(velocity[0], velocity[1]))
+        threshold = self.config.VELOCITY_THRESHOLD
+        position = np.asarray(position, dtype=np.float64)
+        
+        # Rest position follows the hand while it is slow (guard, idling)
+        if track.rest_position is None:
+            track.rest_position = position.copy()
+        elif not track.punching and speed < threshold * self.config.PUNCH_END_RATIO:
+            track.rest_position += (position - track.rest_position) * self.config.KINEMATICS_REST_SMOOTHING
+        outward = float(np.dot(velocity, position - track.rest_position))
+        track.retracting = speed >= threshold * self.config.PUNCH_END_RATIO and outward < 0
+        
+        if not track.punching:
+            # Onset: fast, not decelerating and moving away from rest
+            if speed >= threshold and np.dot(velocity, acceleration) >= 0 and outward >= 0:
+                track.punching = True
+                track.onset_time = timestamp
+                positions, _ = track.latest(self.config.KINEMATICS_WINDOW)
+                track.onset_position = positions[0].copy()
+                track.peak_speed = speed
+                track.peak_time = timestamp
+                track.end_time = None
+                track.punch_type = self._classify(hand_label, position - track.onset_position)
+            return
+        
+        if speed > track.peak_speed:
+            track.peak_speed = speed
+            track.peak_time = timestamp
+        # Classify from the displacement so far, settles as the punch extends
+        track.punch_type = self._classify(hand_label, position - track.onset_position)
+        
+        if (speed < threshold * self.config.PUNCH_END_RATIO or track.retracting or
+                timestamp - track.onset_time > self.config.PUNCH_MAX_DURATION):
+            track.punching = False
+            track.end_time = timestamp
+    
+    def hand_lost(self, hand_label):
+        """Reset a hand that is no longer tracked"""
+        track = self.tracks.get(hand_label)
+        if track is not None:
+            track.reset()
+    
+    def _derivatives(self, track):
+        """Smoothed velocity and acceleration (px/s, px/s^2) from the newest samples"""
+        positions, times = track.latest(self.config.KINEMATICS_WINDOW)
+        if len(times) < 2:
+            return np.zeros(2), np.zeros(2)
+        
+        dt = np.maximum(np.diff(times), 1e-3)
+        velocities = np.diff(positions, axis=0) / dt[:, None]
+        # Newer differences weigh more
+        weights = np.arange(1, len(velocities) + 1, dtype=np.float64)
+        velocity = weights @ velocities / weights.sum()
+        if len(velocities) < 2:
+            return velocity, np.zeros(2)
+        
+        accelerations = np.diff(velocities, axis=0) / ((dt[1:] + dt[:-1]) / 2)[:, None]
+        weights = weights[:len(accelerations)]
+        acceleration = weights @ accelerations / weights.sum()
+        return velocity, acceleration
+    
+    def _classify(self, hand_label, displacement):
+        """Classify a punch as JAB, CROSS or HOOK from its displacement and handedness"""
+        dx, dy = abs(displacement[0]), abs(displacement[1])
+        if dx > dy * self.config.HOOK_DIRECTION_RATIO:
+            return "HOOK"
+        return "JAB" if hand_label == self.config.PUNCH_LEAD_HAND else "CROSS"
+    
+    def is_punching(self, hand_label, timestamp):
+        """Check whether a hand is punching or its punch ended less than PUNCH_HIT_WINDOW ago (never while retracting)"""
+        track = self.tracks.get(hand_label)
+        if track is None or track.retracting:
+            return False
+        if track.punching:
+            return True
+        return track.end_time is not None and 0 <= timestamp - track.end_time <= self.config.PUNCH_HIT_WINDOW
+    
+    def get_punch(self, hand_label):
+        """Get the current or last punch of a hand"""
+        track = self.tracks.get(hand_label)
+        if track is None or track.punch_type is None:
+            return None
+        return {
+            'type': track.punch_type,
+            'active': track.punching,
+            'onset_time': track.onset_time,
+            'peak_speed': track.peak_speed,
+            'peak_time': track.peak_time,
+            'end_time': track.end_time
+        }
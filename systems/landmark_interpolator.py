@@ -0,0 +1,156 @@
+"""Landmark interpolator - smooths landmark-driven visuals between vision samples."""
+
+from collections import deque
+from types import SimpleNamespace
+import numpy as np
+
+class Landmark:
+    """Minimal stand-in for a MediaPipe landmark"""
+    __slots__ = ('x', 'y', 'z', 'visibility')
+    
+    def __init__(self, x, y, z=0.0, visibility=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+class LandmarkInterpolator:
+    """Blends hand, face and pose landmarks from the previous to the newest vision sample
+    
+    The render loop runs faster than vision, so each display frame moves the visuals from the
+    previous sample towards the newest one over one sample interval (at most one sample of delay).
+    Game logic keeps using the raw vision results; only what gets drawn is interpolated.
+    """
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.latest_data = None
+        self.previous = None
+        self.latest = None
+        self.latest_arrival = None
+        self.sample_interval = 1.0 / self.config.FPS
+        self.frame_age = 0.0
+        self.frame_ages = deque(maxlen=self.config.FPS * 5)
+    
+    def push(self, vision_data, current_time):
+        """Register the vision result used this frame; returns True if it is a new sample"""
+        if vision_data is None:
+            return False
+        
+        # Frame-age metric: time from capture to the display frame that uses it
+        capture_time = vision_data.get('capture_time', current_time)
+        self.frame_age = max(0.0, current_time - capture_time)
+        self.frame_ages.append(self.frame_age)
+        
+        if vision_data is self.latest_data:
+            return False
+        
+        if self.latest_arrival is not None:
+            # Smoothed vision sample interval
+            interval = min(0.5, max(1e-3, current_time - self.latest_arrival))
+            self.sample_interval += (interval - self.sample_interval) * 0.2
+        
+        self.latest_data = vision_data
+        self.previous = self.latest
+        self.latest = self._extract(vision_data)
+        self.latest_arrival = current_time
+        return True
+    
+    def _extract(self, vision_data):
+        """Copy landmarks of a vision result into arrays"""
+        sample = {'hands': None, 'handedness': None, 'face': None, 'pose': None}
+        
+        hand_results = vision_data.get('hands')
+        if hand_results and hand_results.multi_hand_landmarks:
+            sample['hands'] = [
+                np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+                for hand_landmarks in hand_results.multi_hand_landmarks
+            ]
+            sample['handedness'] = hand_results.multi_handedness
+        
+        face_results = vision_data.get('face')
+        if face_results and face_results.multi_face_landmarks:
+            landmarks = face_results.multi_face_landmarks[0].landmark
+            sample['face'] = np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+        
+        pose_results = vision_data.get('pose')
+        if pose_results and pose_results.pose_landmarks:
+            landmarks = pose_results.pose_landmarks.landmark
+            sample['pose'] = np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float32)
+        
+        return sample
+    
+    def get_blend(self, current_time):
+        """Get blend factor from previous (0) to newest (1) sample"""
+        if self.previous is None or self.latest_arrival is None:
+            return 1.0
+        return min(1.0, max(0.0, (current_time - self.latest_arrival) / self.sample_interval))
+    
+    def _blend(self, previous, latest, t):
+        """Blend two landmark arrays (newest wins if shapes differ)"""
+        if previous is None or latest is None or previous.shape != latest.shape or t >= 1.0:
+            return latest
+        return previous + (latest - previous) * t
+    
+    def _to_landmark_list(self, points):
+        """Wrap landmark array rows as a MediaPipe-like landmark list"""
+        if points.shape[1] == 4:
+            return SimpleNamespace(landmark=[Landmark(x, y, z, v) for x, y, z, v in points.tolist()])
+        return SimpleNamespace(landmark=[Landmark(x, y, z) for x, y, z in points.tolist()])
+    
+    def get_results(self, current_time):
+        """Get interpolated hand, face and pose results for rendering"""
+        if self.latest is None:
+            return {'hands': None, 'face': None, 'pose': None}
+        
+        t = self.get_blend(current_time)
+        if t >= 1.0:
+            # Caught up with the newest sample, draw it as is
+            return {
+                'hands': self.latest_data.get('hands'),
+                'face': self.latest_data.get('face'),
+                'pose': self.latest_data.get('pose')
+            }
+        
+        previous = self.previous or {}
+        latest = self.latest
+        
+        hands = None
+        if latest['hands'] is not None:
+            # Hands only blend when both samples saw the same hands in the same order
+            previous_hands = previous.get('hands')
+            same_hands = (previous_hands is not None and len(previous_hands) == len(latest['hands']) and
+                          self._hand_labels(previous.get('handedness')) == self._hand_labels(latest['handedness']))
+            hand_points = [
+                self._blend(previous_hands[i] if same_hands else None, points, t)
+                for i, points in enumerate(latest['hands'])
+            ]
+            hands = SimpleNamespace(
+                multi_hand_landmarks=[self._to_landmark_list(points) for points in hand_points],
+                multi_handedness=latest['handedness']
+            )
+        
+        face = None
+        if latest['face'] is not None:
+            face_points = self._blend(previous.get('face'), latest['face'], t)
+            face = SimpleNamespace(multi_face_landmarks=[self._to_landmark_list(face_points)])
+        
+        pose = None
+        if latest['pose'] is not None:
+            pose_points = self._blend(previous.get('pose'), latest['pose'], t)
+            pose = SimpleNamespace(pose_landmarks=self._to_landmark_list(pose_points))
+        
+        return {'hands': hands, 'face': face, 'pose': pose}
+    
+    def _hand_labels(self, handedness):
+        """Get handedness labels in detection order"""
+        if not handedness:
+            return []
+        return [hand.classification[0].label for hand in handedness]
+    
+    def get_frame_age_stats(self):
+        """Get vision frame age of recent display frames in milliseconds"""
+        if not self.frame_ages:
+            return None
+        ages = np.fromiter(self.frame_ages, dtype=np.float64) * 1000
+        return {'current_ms': self.frame_age * 1000, 'avg_ms': float(ages.mean()), 'max_ms': float(ages.max())}
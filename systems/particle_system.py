@@ -0,0 +1,150 @@
+"""Particle system - fixed-capacity NumPy particle engine for hit VFX."""
+
+import numpy as np
+import pygame
+from core.clock import GameClock
+
+class ParticleSystem:
+    # Burst colors per effect type (RGB)
+    EFFECT_COLORS = {
+        'hit': [(255, 215, 0), (255, 140, 0), (255, 255, 255)],
+        'enemy_hit': [(255, 40, 40), (200, 0, 0), (255, 255, 255)],
+        'block': [(80, 160, 255), (200, 230, 255), (255, 255, 255)],
+        'miss': [(200, 200, 200), (150, 150, 150)]
+    }
+    ALPHA_LEVELS = 16  # Number of cached alpha steps per stamp
+    
+    def __init__(self, game_config, capacity=None):
+        self.config = game_config
+        self.clock = GameClock()
+        self.capacity = capacity or self.config.PARTICLE_CAPACITY
+        
+        # Particle state (struct of arrays, preallocated)
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.life = np.zeros(self.capacity, dtype=np.float32)
+        self.size = np.zeros(self.capacity, dtype=np.float32)
+        self.color = np.zeros(self.capacity, dtype=np.int16)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        
+        # Flat palette so each particle only stores a color index
+        self.palette = []
+        self.effect_palette = {}
+        for effect_type, colors in self.EFFECT_COLORS.items():
+            indices = []
+            for color in colors:
+                if color not in self.palette:
+                    self.palette.append(color)
+                indices.append(self.palette.index(color))
+            self.effect_palette[effect_type] = np.array(indices, dtype=np.int16)
+        
+        # Cached sprite stamps keyed by (color index, size, alpha level)
+        self._stamps = {}
+        self._blit_sequence = []
+        self.last_update_time = None
+        self.rng = np.random.default_rng()
+    
+    def spawn_burst(self, x, y, effect_type='hit', count=None, speed=None):
+        """Spawn a radial burst of particles at screen position (x, y)"""
+        count = count or self.config.PARTICLES_PER_BURST
+        speed = speed or self.config.PARTICLE_SPEED * self.config.RENDER_SCALE
+        count = min(count, self.capacity)
+        
+        # Reuse dead slots first, then recycle the particles closest to expiring
+        free = np.flatnonzero(~self.alive)
+        if len(free) < count:
+            alive_idx = np.flatnonzero(self.alive)
+            oldest = alive_idx[np.argsort(self.life[alive_idx])[:count - len(free)]]
+            free = np.concatenate((free, oldest))
+        slots = free[:count]
+        
+        angles = self.rng.uniform(0, 2 * np.pi, count)
+        speeds = self.rng.uniform(0.4, 1.0, count) * speed
+        
+        self.pos[slots, 0] = x
+        self.pos[slots, 1] = y
+        self.vel[slots, 0] = np.cos(angles) * speeds
+        self.vel[slots, 1] = np.sin(angles) * speeds
+        self.life[slots] = self.rng.uniform(0.7, 1.0, count)
+        self.size[slots] = self.rng.uniform(4, self.config.PARTICLE_MAX_SIZE, count) * self.config.RENDER_SCALE
+        colors = self.effect_palette.get(effect_type, self.effect_palette['hit'])
+        self.color[slots] = self.rng.choice(colors, count)
+        self.alive[slots] = True
+    
+    def consume_events(self, game_state):
+        """Spawn bursts from queued hit VFX and drain the queues in place"""
+        render_width, render_height = self.config.get_render_size()
+        scale_x = render_width / self.config.CAMERA_WIDTH
+        scale_y = render_height / self.config.CAMERA_HEIGHT
+        
+        vfx_hits = getattr(game_state, 'vfx_hits', None)
+        if vfx_hits:
+            for hit in vfx_hits:
+                x, y = hit['position']
+                # Bigger punches throw more particles
+                count = self.config.PARTICLES_PER_BURST + int(hit.get('damage', 0))
+                self.spawn_burst(x * scale_x, y * scale_y, 'hit', count)
+            vfx_hits.clear()
+        
+        vfx_effects = getattr(game_state, 'vfx_effects', None)
+        if vfx_effects:
+            for effect in vfx_effects:
+                self.spawn_burst(effect['x'] * scale_x, effect['y'] * scale_y, effect['type'])
+            vfx_effects.clear()
+    
+    def update(self, current_time=None):
+        """Advance all live particles in one vectorized step"""
+        if current_time is None:
+            current_time = self.clock.now()
+        if self.last_update_time is None:
+            self.last_update_time = current_time
+        
+        # Express dt in frames so tuning matches the original per-frame constants
+        frames = min(3.0, (current_time - self.last_update_time) * self.config.FPS)
+        self.last_update_time = current_time
+        if frames <= 0 or not self.alive.any():
+            return
+        
+        self.pos += self.vel * frames
+        self.vel[:, 1] += self.config.PARTICLE_GRAVITY * self.config.RENDER_SCALE * frames
+        self.life -= 0.05 * frames
+        self.size *= 0.95 ** frames
+        self.alive &= (self.life > 0) & (self.size > 0.5)
+    
+    def _get_stamp(self, color_idx, size, alpha_level):
+        """Get cached circle stamp for a color, pixel radius and alpha level"""
+        key = (color_idx, size, alpha_level)
+        stamp = self._stamps.get(key)
+        if stamp is None:
+            stamp = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, self.palette[color_idx], (size, size), size)
+            stamp.set_alpha(int(255 * (alpha_level + 1) / self.ALPHA_LEVELS))
+            self._stamps[key] = stamp
+        return stamp
+    
+    def draw(self, screen):
+        """Blit all live particles from cached stamps in one batch"""
+        idx = np.flatnonzero(self.alive)
+        if len(idx) == 0:
+            return
+        
+        sizes = np.maximum(1, self.size[idx].astype(np.int32))
+        alpha_levels = np.clip((self.life[idx] * self.ALPHA_LEVELS).astype(np.int32) - 1, 0, self.ALPHA_LEVELS - 1)
+        xs = (self.pos[idx, 0] - sizes).astype(np.int32)
+        ys = (self.pos[idx, 1] - sizes).astype(np.int32)
+        colors = self.color[idx]
+        
+        blit_sequence = self._blit_sequence
+        blit_sequence.clear()
+        for color_idx, size, alpha_level, x, y in zip(colors.tolist(), sizes.tolist(), alpha_levels.tolist(), xs.tolist(), ys.tolist()):
+            blit_sequence.append((self._get_stamp(color_idx, size, alpha_level), (x, y)))
+        screen.blits(blit_sequence, doreturn=False)
+    
+    def get_active_count(self):
+        """Get number of live particles"""
+        return int(np.count_nonzero(self.alive))
+    
+    def clear(self):
+        """Kill all particles"""
+        self.alive[:] = False
+        self.last_update_time = None
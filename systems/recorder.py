@@ -0,0 +1,174 @@
+"""Gameplay recorder - writes the composited display to a video file on a background thread."""
+
+import os
+import queue
+import threading
+import time
+import cv2
+from core import constants
+from core.utils import PixelBuffer
+
+class RecordingSession:
+    """Buffers, queue and counters of one recorded match"""
+    
+    def __init__(self, path, buffer_count):
+        self.path = path
+        self.buffer_count = buffer_count
+        self.buffers = None  # Allocated from the first frame
+        self.free_buffers = queue.Queue()
+        self.frame_queue = queue.Queue()  # Bounded by the buffer pool (at most buffer_count entries)
+        self.stop_event = threading.Event()
+        self.frames_captured = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+    
+    def allocate(self, surface):
+        """Preallocate frame buffers matching the surface layout"""
+        self.buffers = [PixelBuffer(surface) for _ in range(self.buffer_count)]
+        for index in range(self.buffer_count):
+            self.free_buffers.put(index)
+
+class GameplayRecorder:
+    """Records matches from ROUND_SPLASH until GAME_OVER
+    
+    Frames are copied after present into a pool of preallocated buffers and queued for a writer
+    thread. When the writer falls behind, frames are dropped, never the game loop: "drop_newest"
+    skips the incoming frame, "drop_oldest" reuses the buffer of the oldest queued one.
+    """
+    RECORDING_STATES = (
+        constants.GAME_STATES['ROUND_SPLASH'],
+        constants.GAME_STATES['PLAYING'],
+        constants.GAME_STATES['REST']
+    )
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.enabled = self.config.RECORDING_ENABLED
+        self.recording = False
+        self.session = None
+        self.writer_threads = []
+        self.last_capture_time = 0
+        self.frame_interval = 1.0 / self.config.RECORDING_FPS
+    
+    def update(self, state):
+        """Start or stop recording on game state transitions"""
+        if not self.enabled:
+            return
+        if state in self.RECORDING_STATES and not self.recording:
+            self.start()
+        elif state not in self.RECORDING_STATES and self.recording:
+            self.stop()
+    
+    def start(self):
+        """Begin a new recording session"""
+        os.makedirs(self.config.RECORDING_DIR, exist_ok=True)
+        path = os.path.join(self.config.RECORDING_DIR, time.strftime("match_%Y%m%d_%H%M%S.mp4"))
+        self.session = RecordingSession(path, self.config.RECORDING_QUEUE_SIZE)
+        self.last_capture_time = 0
+        self.recording = True
+        
+        # Previous sessions may still be draining
+        self.writer_threads = [thread for thread in self.writer_threads if thread.is_alive()]
+        writer_thread = threading.Thread(target=self._writer_loop, args=(self.session,), name="recorder", daemon=True)
+        writer_thread.start()
+        self.writer_threads.append(writer_thread)
+    
+    def stop(self):
+        """End the session; the writer drains queued frames in the background"""
+        if not self.recording:
+            return
+        self.recording = False
+        self.session.stop_event.set()
+        print(f"Recording stopped: {self.session.path} "
+              f"({self.session.frames_captured} frames captured, {self.session.frames_dropped} dropped)")
+    
+    def wants_frame(self):
+        """Check whether the next frame should be captured (recording and due at RECORDING_FPS)"""
+        return self.recording and time.time() - self.last_capture_time >= self.frame_interval
+    
+    def capture_frame(self, surface):
+        """Frame listener - copy the composited frame into a free buffer and queue it"""
+        if not self.wants_frame():
+            return
+        self.last_capture_time = time.time()
+        
+        session = self.session
+        if session.buffers is None:
+            session.allocate(surface)
+        if not session.buffers[0].matches(surface):
+            session.frames_dropped += 1
+            return
+        
+        index = self._acquire_buffer(session)
+        if index is None:
+            session.frames_dropped += 1
+            return
+        
+        session.buffers[index].copy_from(surface)
+        session.frame_queue.put(index)
+        session.frames_captured += 1
+    
+    def _acquire_buffer(self, session):
+        """Get a free buffer index, applying the drop policy when the writer is behind"""
+        try:
+            return session.free_buffers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if self.config.RECORDING_DROP_POLICY == "drop_oldest":
+            try:
+                index = session.frame_queue.get_nowait()
+            except queue.Empty:
+                return None
+            session.frames_dropped += 1
+            return index
+        return None
+    
+    def _writer_loop(self, session):
+        """Writer thread - encode queued frames until the session stops and the queue is drained"""
+        writer = None
+        try:
+            while not (session.stop_event.is_set() and session.frame_queue.empty()):
+                try:
+                    index = session.frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                
+                # Convert (copies), then hand the buffer straight back to the pool
+                frame = session.buffers[index].to_bgr()
+                session.free_buffers.put(index)
+                
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    fourcc = cv2.VideoWriter_fourcc(*self.config.RECORDING_CODEC)
+                    writer = cv2.VideoWriter(session.path, fourcc, self.config.RECORDING_FPS, (width, height))
+                    if not writer.isOpened():
+                        print(f"Error: Could not open video writer for {session.path}")
+                        return
+                writer.write(frame)
+                session.frames_written += 1
+        except Exception as e:
+            print(f"Error writing recording {session.path}: {e}")
+        finally:
+            if writer is not None:
+                writer.release()
+    
+    def get_stats(self):
+        """Get frame counters of the current or last session"""
+        if self.session is None:
+            return None
+        return {
+            'recording': self.recording,
+            'path': self.session.path,
+            'captured': self.session.frames_captured,
+            'written': self.session.frames_written,
+            'dropped': self.session.frames_dropped,
+            'queued': self.session.frame_queue.qsize()
+        }
+    
+    def close(self):
+        """Stop recording and wait for writers to finish"""
+        self.stop()
+        for thread in self.writer_threads:
+            thread.join(timeout=10.0)
+        self.writer_threads = []
@@ -0,0 +1,396 @@
+"""Render backends - software display surface, SDL2 renderer with textures, or offscreen (headless).
+
+Both backends expose the same drawing interface used by RenderSystem and the UI:
+    get_target()                        surface for immediate-mode drawing (pygame.draw, blit)
+    mark_dirty()                        note pygame.draw drawing on the target (blit/fill are tracked)
+    begin_frame()                       start a new frame
+    draw_camera(frame_surface)          draw the camera frame scaled to the render resolution
+    blit_static(surface, pos, version)  blit a surface that rarely changes (cached as texture)
+    draw_overlay(color, alpha, offset)  full-screen tint
+    present()                           show the finished frame
+    add_frame_listener(fn)              call fn(surface) with every composited frame (recording, streaming)
+
+Drawing happens at Config.get_render_size(); when RENDER_SCALE is below 1 the finished
+frame is scaled to the window once (SCALED display flag or renderer logical size).
+"""
+
+import os
+import time
+import weakref
+from collections import OrderedDict, deque
+import numpy as np
+import pygame
+from core.utils import OverlayManager
+
+class RenderBackend:
+    """Shared frame listener support for all backends"""
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.frame_listeners = []
+    
+    def add_frame_listener(self, listener, wants_frame=None):
+        """Register listener(surface) called with each composited frame (surface is reused, copy what you keep)
+        
+        wants_frame() lets a listener skip frames, so backends avoid reading pixels back when nobody needs them.
+        """
+        self.frame_listeners.append((listener, wants_frame))
+    
+    def remove_frame_listener(self, listener):
+        """Unregister a frame listener"""
+        self.frame_listeners = [entry for entry in self.frame_listeners if entry[0] != listener]
+    
+    def mark_dirty(self):
+        """Note immediate-mode drawing that does not go through blit/fill (pygame.draw on the target)"""
+        pass
+    
+    def _frame_wanted(self):
+        """Check whether any listener wants this frame"""
+        return any(wants_frame is None or wants_frame() for _, wants_frame in self.frame_listeners)
+    
+    def _notify_frame_listeners(self, surface):
+        """Hand the composited frame to all listeners that want it"""
+        for listener, wants_frame in self.frame_listeners:
+            if wants_frame is not None and not wants_frame():
+                continue
+            try:
+                listener(surface)
+            except Exception as e:
+                print(f"Warning: Frame listener failed: {e}")
+
+class SurfaceBackend(RenderBackend):
+    """Default backend - everything is drawn onto the display surface and flipped"""
+    uses_textures = False
+    
+    def __init__(self, game_config):
+        super().__init__(game_config)
+        self.screen = None
+        self.overlay_manager = OverlayManager()
+    
+    def open(self):
+        """Open the display window"""
+        # Use DOUBLEBUF for better performance
+        flags = pygame.DOUBLEBUF
+        if self.config.FULLSCREEN:
+            flags |= pygame.FULLSCREEN
+        
+        render_size = self.config.get_render_size()
+        if not self.config.FULLSCREEN and render_size == (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT):
+            # Unscaled window
+            self.screen = pygame.display.set_mode(render_size, flags)
+        else:
+            # Composite at the internal resolution and let SDL scale to the window/desktop once,
+            # fullscreen keeps the desktop mode instead of switching resolution
+            flags |= pygame.SCALED
+            try:
+                self.screen = pygame.display.set_mode(render_size, flags, vsync=1 if self.config.VSYNC else 0)
+            except pygame.error as e:
+                print(f"Warning: Vsync unavailable ({e}), continuing without it")
+                self.screen = pygame.display.set_mode(render_size, flags)
+        pygame.display.set_caption("Shadow Boxing")
+    
+    def handles(self, surface):
+        """Check if surface is this backend's drawing target"""
+        return surface is self.screen
+    
+    def get_target(self):
+        """Get surface for immediate-mode drawing"""
+        return self.screen
+    
+    def begin_frame(self):
+        """Start a new frame (camera blit covers the whole screen)"""
+        pass
+    
+    def draw_camera(self, frame_surface):
+        """Scale camera frame to the render resolution and blit it"""
+        if frame_surface.get_size() != self.screen.get_size():
+            frame_surface = pygame.transform.scale(frame_surface, self.screen.get_size())
+        self.screen.blit(frame_surface, (0, 0))
+    
+    def blit_static(self, surface, position, version=0):
+        """Blit a rarely changing surface"""
+        self.screen.blit(surface, position)
+    
+    def draw_overlay(self, color, alpha, offset=(0, 0)):
+        """Blit a full-screen tint from the overlay cache"""
+        self.overlay_manager.blit_overlay(self.screen, color, alpha, offset)
+    
+    def present(self):
+        """Flip the display, then pass the composited frame to listeners"""
+        pygame.display.flip()
+        if self.frame_listeners:
+            self._notify_frame_listeners(self.screen)
+    
+    def close(self):
+        """Release backend resources"""
+        pass
+
+class ScratchSurface(pygame.Surface):
+    """Texture backend drawing target that remembers whether anything was blitted or filled onto it"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drawn = False
+    
+    def blit(self, *args, **kwargs):
+        self.drawn = True
+        return super().blit(*args, **kwargs)
+    
+    def blits(self, *args, **kwargs):
+        self.drawn = True
+        return super().blits(*args, **kwargs)
+    
+    def fill(self, *args, **kwargs):
+        self.drawn = True
+        return super().fill(*args, **kwargs)
+    
+    def clear(self):
+        """Make the surface transparent again, nothing drawn"""
+        super().fill((0, 0, 0, 0))
+        self.drawn = False
+
+class TextureBackend(RenderBackend):
+    """SDL2 renderer backend - camera is a streaming texture, static surfaces become cached textures
+    
+    Immediate-mode drawing goes to a transparent scratch surface which is uploaded and
+    drawn whenever a texture draw follows it, so back-to-front order is preserved. Only
+    scratch contents that were actually drawn on are uploaded.
+    Works with SDL's software renderer (RENDER_ACCELERATED = 0) on machines without a GPU.
+    """
+    uses_textures = True
+    
+    def __init__(self, game_config):
+        super().__init__(game_config)
+        self.window = None
+        self.renderer = None
+        self.render_size = None
+        self.scratch = None
+        self.scratch_texture = None
+        self.camera_texture = None
+        self.overlay_texture = None
+        self._static_textures = OrderedDict()  # id(surface) -> (weakref, version, texture)
+        self.max_static_textures = 512
+    
+    def open(self):
+        """Open SDL2 window and renderer"""
+        from pygame._sdl2 import video
+        self._video = video
+        
+        window_size = (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT)
+        size = self.config.get_render_size()
+        self.render_size = size
+        self.window = video.Window("Shadow Boxing", size=window_size, fullscreen_desktop=self.config.FULLSCREEN)
+        self.renderer = video.Renderer(self.window, accelerated=self.config.RENDER_ACCELERATED, vsync=self.config.VSYNC)
+        # Render at the internal resolution, SDL scales to the real output
+        self.renderer.logical_size = size
+        
+        self.scratch = ScratchSurface(size, pygame.SRCALPHA)
+        self.scratch_texture = video.Texture(self.renderer, size, streaming=True)
+        self.scratch_texture.blend_mode = pygame.BLENDMODE_BLEND
+        
+        # 1x1 white texture tinted via color/alpha mod for full-screen overlays
+        white = pygame.Surface((1, 1))
+        white.fill((255, 255, 255))
+        self.overlay_texture = video.Texture.from_surface(self.renderer, white)
+        self.overlay_texture.blend_mode = pygame.BLENDMODE_BLEND
+    
+    def handles(self, surface):
+        """Check if surface is this backend's drawing target"""
+        return surface is self.scratch
+    
+    def get_target(self):
+        """Get scratch surface for immediate-mode drawing"""
+        return self.scratch
+    
+    def mark_dirty(self):
+        """Mark the scratch surface for upload after pygame.draw drawing"""
+        self.scratch.drawn = True
+    
+    def _flush_scratch(self):
+        """Upload and draw pending immediate-mode drawing, then clear the scratch surface"""
+        if not self.scratch.drawn:
+            return
+        self.scratch_texture.update(self.scratch)
+        self.scratch_texture.draw()
+        self.scratch.clear()
+    
+    def begin_frame(self):
+        """Clear renderer and scratch surface"""
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.scratch.clear()
+    
+    def draw_camera(self, frame_surface):
+        """Upload camera frame into the streaming texture; the renderer scales it"""
+        self._flush_scratch()
+        size = frame_surface.get_size()
+        if self.camera_texture is None or self.camera_texture.get_rect().size != size:
+            self.camera_texture = self._video.Texture(self.renderer, size, streaming=True)
+        self.camera_texture.update(frame_surface)
+        self.camera_texture.draw(dstrect=(0, 0, *self.render_size))
+    
+    def _get_static_texture(self, surface, version):
+        """Get cached texture for a surface, re-uploading when its version changes"""
+        key = id(surface)
+        entry = self._static_textures.get(key)
+        if entry is not None:
+            surface_ref, cached_version, texture = entry
+            if surface_ref() is surface and cached_version == version:
+                self._static_textures.move_to_end(key)
+                return texture
+        
+        texture = self._video.Texture.from_surface(self.renderer, surface)
+        texture.blend_mode = pygame.BLENDMODE_BLEND
+        self._static_textures[key] = (weakref.ref(surface), version, texture)
+        if len(self._static_textures) > self.max_static_textures:
+            self._static_textures.popitem(last=False)
+        return texture
+    
+    def blit_static(self, surface, position, version=0):
+        """Draw a rarely changing surface from its cached texture"""
+        self._flush_scratch()
+        texture = self._get_static_texture(surface, version)
+        surface_alpha = surface.get_alpha()
+        texture.alpha = 255 if surface_alpha is None else surface_alpha
+        texture.draw(dstrect=(position[0], position[1], surface.get_width(), surface.get_height()))
+    
+    def draw_overlay(self, color, alpha, offset=(0, 0)):
+        """Draw a full-screen tint with renderer blending"""
+        if alpha <= 0:
+            return
+        self._flush_scratch()
+        self.overlay_texture.color = tuple(color[:3])
+        self.overlay_texture.alpha = max(0, min(255, int(alpha)))
+        self.overlay_texture.draw(dstrect=(offset[0], offset[1], *self.render_size))
+    
+    def present(self):
+        """Flush pending drawing and present the frame"""
+        self._flush_scratch()
+        if self._frame_wanted():
+            # Read back before present, the back buffer is undefined afterwards
+            self._notify_frame_listeners(self.renderer.to_surface())
+        self.renderer.present()
+    
+    def close(self):
+        """Release textures and window"""
+        self._static_textures.clear()
+        self.camera_texture = None
+        self.scratch_texture = None
+        self.overlay_texture = None
+        self.renderer = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+class HeadlessBackend(SurfaceBackend):
+    """Offscreen backend for servers and benchmarks - no window, optional frame dumps and render cost stats
+    
+    Needs SDL_VIDEODRIVER=dummy (set by RenderSystem when Config.HEADLESS is on).
+    Render cost is measured from begin_frame() to present(), i.e. everything composited for one frame.
+    """
+    
+    def __init__(self, game_config):
+        super().__init__(game_config)
+        self.frame_index = 0
+        self.frame_start = None
+        self.frame_times = deque(maxlen=max(1, self.config.RENDER_STATS_INTERVAL))
+        self.total_frames = 0
+        self.total_render_time = 0.0
+        self.captured_frames = 0
+        self.last_report_frame = 0
+    
+    def open(self):
+        """Create the offscreen target"""
+        # Tiny dummy display so convert()/convert_alpha() work; all drawing goes to the offscreen surface
+        pygame.display.set_mode((1, 1))
+        self.screen = pygame.Surface(self.config.get_render_size()).convert()
+        
+        if self.config.CAPTURE_EVERY_N_FRAMES:
+            os.makedirs(self.config.CAPTURE_DIR, exist_ok=True)
+    
+    def begin_frame(self):
+        """Start timing a new frame"""
+        self.frame_start = time.perf_counter()
+    
+    def present(self):
+        """Record render cost and dump the frame if it is due"""
+        if self.frame_start is not None:
+            render_time = time.perf_counter() - self.frame_start
+            self.frame_times.append(render_time)
+            self.total_render_time += render_time
+            self.total_frames += 1
+            self.frame_start = None
+        
+        if self.frame_listeners:
+            self._notify_frame_listeners(self.screen)
+        
+        self.frame_index += 1
+        capture_every = self.config.CAPTURE_EVERY_N_FRAMES
+        if capture_every and self.frame_index % capture_every == 0:
+            self._capture_frame()
+        
+        if self.config.RENDER_STATS_INTERVAL and self.frame_index % self.config.RENDER_STATS_INTERVAL == 0:
+            self.report()
+    
+    def _capture_frame(self):
+        """Write the composited frame to CAPTURE_DIR as PNG or raw RGB array"""
+        path = os.path.join(self.config.CAPTURE_DIR, f"frame_{self.frame_index:06d}")
+        try:
+            if self.config.CAPTURE_FORMAT == "npy":
+                # (height, width, 3) RGB, same layout as OpenCV frames
+                np.save(path + ".npy", pygame.surfarray.array3d(self.screen).swapaxes(0, 1))
+            else:
+                pygame.image.save(self.screen, path + ".png")
+            self.captured_frames += 1
+        except Exception as e:
+            print(f"Warning: Failed to capture frame {self.frame_index}: {e}")
+    
+    def get_stats(self):
+        """Get render cost over the recent window and the whole run (milliseconds)"""
+        if not self.frame_times:
+            return None
+        
+        times = np.fromiter(self.frame_times, dtype=np.float64) * 1000
+        return {
+            'frames': self.total_frames,
+            'avg_ms': float(times.mean()),
+            'p95_ms': float(np.percentile(times, 95)),
+            'max_ms': float(times.max()),
+            'run_avg_ms': self.total_render_time * 1000 / self.total_frames,
+            'captured': self.captured_frames
+        }
+    
+    def report(self):
+        """Print render cost summary"""
+        stats = self.get_stats()
+        if stats is None or stats['frames'] == self.last_report_frame:
+            return
+        self.last_report_frame = stats['frames']
+        
+        render_fps = 1000 / stats['avg_ms'] if stats['avg_ms'] > 0 else 0
+        print(f"[render] frame {stats['frames']}: avg {stats['avg_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+              f"max {stats['max_ms']:.2f} ms ({render_fps:.0f} fps), run avg {stats['run_avg_ms']:.2f} ms, "
+              f"{stats['captured']} frames captured")
+    
+    def close(self):
+        """Print final render cost summary"""
+        self.report()
+
+def create_backend(game_config):
+    """Create render backend selected by Config.HEADLESS / Config.RENDER_BACKEND (falls back to surface)"""
+    if game_config.HEADLESS:
+        backend = HeadlessBackend(game_config)
+        backend.open()
+        return backend
+    
+    if game_config.RENDER_BACKEND == "texture":
+        backend = TextureBackend(game_config)
+        try:
+            backend.open()
+            return backend
+        except Exception as e:
+            print(f"Warning: Texture backend unavailable ({e}), using surface backend")
+    
+    backend = SurfaceBackend(game_config)
+    backend.open()
+    return backend
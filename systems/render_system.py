@@ -4,22 +4,61 @@ import cv2
 import numpy as np
 import pygame
 import os
-import time
 import math
 import mediapipe as mp
 from core import constants
+from core.utils import FontManager, TextCache, OverlayManager, AnimationBaker
+from core.clock import GameClock
+from systems.particle_system import ParticleSystem
+from systems.compositor import Compositor
+from systems.render_backend import create_backend
 
 class RenderSystem:
+    # Enemy glove sprite size and motion-trail alpha per step (newest first)
+    GLOVE_SIZE = 120
+    GLOVE_TRAIL_ALPHAS = (100, 70, 40)
+    
+    # MediaPipe hand skeleton as landmark chains (thumb, index, middle, ring, pinky, palm)
+    HAND_CHAINS = (
+        np.array([0, 1, 2, 3, 4]),
+        np.array([0, 5, 6, 7, 8]),
+        np.array([0, 9, 10, 11, 12]),
+        np.array([0, 13, 14, 15, 16]),
+        np.array([0, 17, 18, 19, 20]),
+        np.array([5, 9, 13, 17])
+    )
+    SKELETON_JOINT_RADIUS = 4
+    
     def __init__(self, game_config):
         self.config = game_config
-        self.screen = None
+        self.clock = GameClock()
+        self.backend = None
+        
+        # Internal render resolution; the backend scales the finished frame to the window once
+        self.render_width, self.render_height = self.config.get_render_size()
+        self.glove_size = self.config.px(self.GLOVE_SIZE)
         self._initialize_display()
         
+        # Shared cache of pre-filled full-screen tint surfaces (drawn by the renderer on the texture backend)
+        self.overlay_manager = OverlayManager()
+        if self.backend.uses_textures:
+            self.overlay_manager.set_backend(self.backend)
+        
+        # Cached HUD/menu layers (camera and world sprites are redrawn every frame)
+        self.compositor = Compositor(self.config, self.backend)
+        
         # Load assets with error handling
         self._load_assets()
         
-        # Font initialization
+        # Bake the KO pulse in the background at load time so it is ready when a KO happens
+        self.animation_baker = AnimationBaker()
+        if self.ko_sprite is not None:
+            self._get_ko_pulse_animation()
+        
+        # Font initialization (shared font and text caches)
         self.font_path = os.path.join(self.config.FONT_DIR, "PressStart2P.ttf")
+        self.font_manager = FontManager()
+        self.text_cache = TextCache()
         self.font = {
             'large': self._load_font(72),
             'medium': self._load_font(48),
@@ -28,22 +67,52 @@ class RenderSystem:
         }
         
         # VFX particles
-        self.particles = []
+        self.particle_system = ParticleSystem(self.config)
+        
+        # Hand skeleton drawing; skeleton_enabled can be switched off at runtime to save frame time
+        self.skeleton_enabled = self.config.SKELETON_MODE != "off"
+        self._skeleton_joint_stamp = None
+        
+        # Last converted camera frame (reused while vision has no newer frame)
+        self._camera_frame = None
+        self._camera_surface = None
         
         # Store last helm size from face detection
         self.last_helm_size = (120, 120)  # Default size
     
     def _initialize_display(self):
-        """Initialize pygame display"""
+        """Initialize pygame display through the configured render backend"""
+        if self.config.HEADLESS:
+            # No window: SDL must pick the dummy driver before the display initializes
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
-        # Use DOUBLEBUF for better performance
-        flags = pygame.DOUBLEBUF
-        if self.config.FULLSCREEN:
-            flags |= pygame.FULLSCREEN
-            self.screen = pygame.display.set_mode((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), flags)
-        else:
-            self.screen = pygame.display.set_mode((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), flags)
-        pygame.display.set_caption("Shadow Boxing")
+        self.backend = create_backend(self.config)
+    
+    @property
+    def screen(self):
+        """Surface for immediate-mode drawing (display surface or texture backend scratch)"""
+        return self.backend.get_target()
+    
+    def present(self):
+        """Show the finished frame"""
+        self.backend.present()
+    
+    def add_frame_listener(self, listener, wants_frame=None):
+        """Receive composited frames on present (listener(surface), optionally filtered by wants_frame())"""
+        self.backend.add_frame_listener(listener, wants_frame)
+    
+    def draw_camera_frame(self, frame):
+        """Convert OpenCV frame (BGR) and draw it as the camera layer"""
+        # The render loop outpaces vision, so the same camera frame is often drawn several times
+        if frame is not self._camera_frame:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self._camera_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+            self._camera_frame = frame
+        self.backend.draw_camera(self._camera_surface)
+    
+    def blit_static(self, surface, position, version=0):
+        """Blit a surface that rarely changes (cached as a texture on the texture backend)"""
+        self.backend.blit_static(surface, position, version)
     
     def _load_assets(self):
         """Load critical visual assets only, defer non-critical assets"""
@@ -62,6 +131,8 @@ class RenderSystem:
         self.punch_bag_black = None
         self.glove_image = None
         self.target_icon = None
+        self.glove_surface = None
+        self.glove_trail_surfaces = []
     
     def _ensure_punch_bags_loaded(self):
         """Lazy load punch bag assets when needed"""
@@ -85,8 +156,33 @@ class RenderSystem:
         if not self._attack_assets_loaded:
             self.glove_image = self._load_asset("boxing_glove.png", (80, 80))
             self.target_icon = self._load_asset("target-icon.png", (60, 60))
+            self._bake_glove_surfaces()
             self._attack_assets_loaded = True
     
+    def _bake_glove_surfaces(self):
+        """Build glove surface and motion-trail frames once so the attack only blits"""
+        if self.glove_image is None:
+            return
+        
+        try:
+            glove_size = self.glove_size
+            glove_resized = cv2.resize(self.glove_image, (glove_size, glove_size))
+            glove_rgba = cv2.cvtColor(glove_resized, cv2.COLOR_BGRA2RGBA)
+            self.glove_surface = pygame.image.frombuffer(glove_rgba.tobytes(), (glove_size, glove_size), "RGBA")
+            if pygame.display.get_surface() is not None:
+                self.glove_surface = self.glove_surface.convert_alpha()
+            
+            # One pre-faded copy per trail step
+            self.glove_trail_surfaces = []
+            for alpha in self.GLOVE_TRAIL_ALPHAS:
+                trail_surface = self.glove_surface.copy()
+                trail_surface.set_alpha(alpha)
+                self.glove_trail_surfaces.append(trail_surface)
+        except Exception as e:
+            print(f"Error baking glove surfaces: {str(e)}")
+            self.glove_surface = None
+            self.glove_trail_surfaces = []
+    
     def _load_asset(self, filename, size=None):
         """Load asset with proper alpha channel handling"""
         asset_path = os.path.join(self.config.SPRITES_DIR, filename)
@@ -140,32 +236,28 @@ class RenderSystem:
         return bag
     
     def _load_font(self, size):
-        """Load font with fallback"""
-        try:
-            if os.path.exists(self.font_path):
-                return pygame.font.Font(self.font_path, size)
-            else:
-                print(f"Warning: Font not found at {self.font_path}, using default")
-                return pygame.font.SysFont("Arial", size)
-        except:
-            print(f"Warning: Failed to load font, using default")
-            return pygame.font.SysFont("Arial", size)
+        """Load font through the shared FontManager"""
+        if not os.path.exists(self.font_path):
+            print(f"Warning: Font not found at {self.font_path}, using default")
+        return self.font_manager.get_font(self.font_path, self.config.px(size))
     
     def render_frame(self, frame, game_state):
-        """Main render function - NO pygame.display.flip() here"""
+        """Main render function - NO present() here, done in main loop"""
+        self.backend.begin_frame()
+        
+        draw_skeleton = self.skeleton_enabled and hasattr(game_state, 'hand_results')
+        skeleton_on_frame = self.config.SKELETON_MODE == "frame"
+        
         # Draw hand skeletons on camera frame BEFORE converting to pygame
-        if hasattr(game_state, 'hand_results'):
+        if draw_skeleton and skeleton_on_frame:
             frame = self._draw_hand_skeletons(frame, game_state.hand_results)
         
-        # Convert OpenCV frame (BGR) to Pygame surface (RGB)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_surface = pygame.surfarray.make_surface(frame_rgb)
-        frame_surface = pygame.transform.rotate(frame_surface, -90)
-        frame_surface = pygame.transform.flip(frame_surface, True, False)
-        frame_surface = pygame.transform.scale(frame_surface, (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
+        # Draw base frame (scaled to the window by the backend)
+        self.draw_camera_frame(frame)
         
-        # Draw base frame
-        self.screen.blit(frame_surface, (0, 0))
+        # Or draw them on the display target, leaving the camera frame unmodified
+        if draw_skeleton and not skeleton_on_frame:
+            self._draw_hand_skeletons_on_screen(game_state.hand_results)
         
         # Render game elements based on state
         if game_state.current_state == constants.GAME_STATES['PLAYING']:
@@ -215,52 +307,55 @@ class RenderSystem:
             self._render_enemy_attack(game_state)
         
         # Render VFX particles
-        self._render_particles()
+        self._render_particles(game_state)
+    
+    def _hand_landmark_points(self, hand_results, width, height):
+        """Get pixel-space landmarks as an int32 array of shape (hands, 21, 2)"""
+        hands = [[(landmark.x, landmark.y) for landmark in hand_landmarks.landmark]
+                 for hand_landmarks in hand_results.multi_hand_landmarks]
+        points = np.array(hands, dtype=np.float32) * (width, height)
+        return points.astype(np.int32)
     
     def _draw_hand_skeletons(self, frame, hand_results):
-        """Draw hand skeleton lines on camera frame"""
+        """Draw hand skeleton lines on a copy of the camera frame (one polyline batch per hand)"""
         if not hand_results or not hand_results.multi_hand_landmarks:
             return frame
         
-        # Hand connections (MediaPipe hand skeleton)
-        HAND_CONNECTIONS = [
-            (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
-            (0, 5), (5, 6), (6, 7), (7, 8),  # Index
-            (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
-            (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
-            (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
-            (5, 9), (9, 13), (13, 17)  # Palm connections
-        ]
+        # The same vision frame can be rendered several times, so never draw into it
+        frame = frame.copy()
         
         h, w, _ = frame.shape
+        points = self._hand_landmark_points(hand_results, w, h)
         
-        for hand_landmarks in hand_results.multi_hand_landmarks:
-            # Draw connections (lines)
-            for connection in HAND_CONNECTIONS:
-                start_idx, end_idx = connection
-                start_point = hand_landmarks.landmark[start_idx]
-                end_point = hand_landmarks.landmark[end_idx]
-                
-                start_x = int(start_point.x * w)
-                start_y = int(start_point.y * h)
-                end_x = int(end_point.x * w)
-                end_y = int(end_point.y * h)
-                
-                # Draw line 
-                cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 0, 255), 2)
+        for hand_points in points:
+            # Draw connections (lines), one polyline per finger chain
+            cv2.polylines(frame, [hand_points[chain] for chain in self.HAND_CHAINS], False, (0, 0, 255), 2)
             
-            # Draw landmarks (circles)
-            for idx, landmark in enumerate(hand_landmarks.landmark):
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
-
-                color = (0, 0, 255)  
-                radius = 4
-                
-                cv2.circle(frame, (x, y), radius, color, -1)
+            # Draw landmarks as zero-length thick segments (round caps) in a single call
+            joints = np.repeat(hand_points[:, None, :], 2, axis=1)
+            cv2.polylines(frame, joints, False, (0, 0, 255), self.SKELETON_JOINT_RADIUS * 2 + 1)
         
         return frame
     
+    def _draw_hand_skeletons_on_screen(self, hand_results):
+        """Draw hand skeletons on the display target so the camera frame stays untouched"""
+        if not hand_results or not hand_results.multi_hand_landmarks:
+            return
+        
+        screen = self.screen
+        points = self._hand_landmark_points(hand_results, self.render_width, self.render_height)
+        radius = max(1, self.config.px(self.SKELETON_JOINT_RADIUS))
+        if self._skeleton_joint_stamp is None:
+            self._skeleton_joint_stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(self._skeleton_joint_stamp, (255, 0, 0), (radius, radius), radius)
+        
+        for hand_points in points:
+            for chain in self.HAND_CHAINS:
+                pygame.draw.lines(screen, (255, 0, 0), False, hand_points[chain].tolist(), 2)
+            self.backend.mark_dirty()
+            stamp = self._skeleton_joint_stamp
+            screen.blits([(stamp, (x - radius, y - radius)) for x, y in hand_points.tolist()], doreturn=False)
+    
     def _render_player_helm(self, face_bbox, face_results=None, pose_results=None):
         """Render boxing helm following face mesh with proper coverage"""
         if self.helm_image is None:
@@ -324,10 +419,10 @@ class RenderSystem:
         if helm_x is not None and helm_y is not None:
             try:
                 # Convert coordinates to screen space
-                screen_x = int(helm_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                screen_y = int(helm_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
-                screen_w = int(helm_size[0] * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                screen_h = int(helm_size[1] * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
+                screen_x = int(helm_x * self.render_width / self.config.CAMERA_WIDTH)
+                screen_y = int(helm_y * self.render_height / self.config.CAMERA_HEIGHT)
+                screen_w = int(helm_size[0] * self.render_width / self.config.CAMERA_WIDTH)
+                screen_h = int(helm_size[1] * self.render_height / self.config.CAMERA_HEIGHT)
                 
                 # Resize and convert helm image
                 helm_resized = cv2.resize(self.helm_image, helm_size)
@@ -338,7 +433,7 @@ class RenderSystem:
                 self.screen.blit(helm_surface, (screen_x, screen_y))
             except Exception as e:
                 pass  # Silently fail if helm rendering fails
-
+    
     def _add_debug_overlay(self, frame, hand_results, face_results, pose_results):
         """Add debug visualization on frame - ONLY HAND LANDMARKS"""
         # FPS counter
@@ -377,16 +472,16 @@ class RenderSystem:
     
     def _render_player_attack_phase(self, game_state):
         """Render hitboxes as punch bags during player attack phase"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         for i, hitbox in enumerate(game_state.active_hitboxes):
             x, y, w, h = hitbox
             
             # Convert to screen coordinates
-            screen_x = int(x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-            screen_y = int(y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
-            screen_w = int(w * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-            screen_h = int(h * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
+            screen_x = int(x * self.render_width / self.config.CAMERA_WIDTH)
+            screen_y = int(y * self.render_height / self.config.CAMERA_HEIGHT)
+            screen_w = int(w * self.render_width / self.config.CAMERA_WIDTH)
+            screen_h = int(h * self.render_height / self.config.CAMERA_HEIGHT)
             
             # Calculate center position for punch bag
             center_x = screen_x + screen_w // 2
@@ -443,122 +538,102 @@ class RenderSystem:
                 # Fallback to colored rectangle
                 color = glow_color if hitbox not in game_state.hit_hitboxes else (0, 255, 255)
                 pygame.draw.rect(self.screen, color, (bag_x, bag_y, bag_width, bag_height), border_radius=20)
+                self.backend.mark_dirty()
     
     def _render_rest_period(self, game_state):
         """Render rest period UI"""
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 100, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.overlay_manager.blit_overlay(self.screen, (0, 0, 100), 180)
         
-        rest_text = self.font['large'].render("REST PERIOD", True, (255, 255, 255))
-        timer_text = self.font['medium'].render(f"Next round in: {int(game_state.rest_timer)}s", True, (255, 255, 0))
+        rest_text = self.text_cache.render(self.font['large'], "REST PERIOD", (255, 255, 255))
+        timer_text = self.text_cache.render(self.font['medium'], f"Next round in: {int(game_state.rest_timer)}s", (255, 255, 0))
         
-        self.screen.blit(rest_text, rest_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 - 30)))
-        self.screen.blit(timer_text, timer_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 + 30)))
+        self.screen.blit(rest_text, rest_text.get_rect(center=(self.render_width//2, self.render_height//2 - self.config.px(30))))
+        self.screen.blit(timer_text, timer_text.get_rect(center=(self.render_width//2, self.render_height//2 + self.config.px(30))))
     
     def _render_ko_effect(self, game_state):
         """Render KO effect with ko.png sprite animation"""
-        import time
-        
         # Calculate animation progress (0.0 to 1.0)
-        elapsed = time.time() - game_state.ko_start_time
+        elapsed = self.clock.now() - game_state.ko_start_time
         progress = min(1.0, elapsed / game_state.ko_duration)
         
         # Semi-transparent red overlay for dramatic effect
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
         alpha = int(150 * progress)  # Lighter fade to 150 alpha
-        overlay.fill((100, 0, 0, alpha))  # Red tint instead of black
-        self.screen.blit(overlay, (0, 0))
+        self.overlay_manager.blit_overlay(self.screen, (100, 0, 0), alpha)  # Red tint instead of black
         
-        # Use ko.png sprite if available, otherwise fallback to text
-        if self.ko_sprite is not None:
-            # Cache scaled sprites for better performance
-            if not hasattr(self, '_ko_sprite_cache'):
-                self._ko_sprite_cache = {}
-            
-            # Pulsing scale effect for KO sprite (simplified for performance)
-            pulse_scale = 1.0 + 0.15 * abs(math.sin(elapsed * 3))  # Reduced pulse range
-            
-            # Calculate size with pulse - LARGER base size for better visibility
-            base_width = 600
-            base_height = 360
-            sprite_width = int(base_width * pulse_scale)
-            sprite_height = int(base_height * pulse_scale)
-            
-            # Use cached sprite if size matches, otherwise resize
-            cache_key = f"{sprite_width}x{sprite_height}"
-            if cache_key not in self._ko_sprite_cache:
-                try:
-                    ko_surface = cv2.resize(self.ko_sprite, (sprite_width, sprite_height), interpolation=cv2.INTER_LINEAR)
-                    ko_rgba = cv2.cvtColor(ko_surface, cv2.COLOR_BGRA2RGBA)
-                    self._ko_sprite_cache[cache_key] = pygame.image.frombuffer(ko_rgba.tobytes(), (sprite_width, sprite_height), "RGBA")
-                except Exception:
-                    pass
-                    self._render_ko_text_fallback(elapsed, progress)
-                    return
-            
+        # Use baked ko.png pulse if available, otherwise fallback to text
+        ko_animation = self._get_ko_pulse_animation() if self.ko_sprite is not None else None
+        if ko_animation is not None:
             try:
-                ko_pygame = self._ko_sprite_cache[cache_key]
+                ko_pygame = ko_animation.get_frame(elapsed)
+                sprite_width, sprite_height = ko_pygame.get_size()
                 
                 # Slight shake effect in first 0.5 seconds
-                shake_x = int(15 * math.sin(elapsed * 20)) if progress < 0.2 else 0
-                shake_y = int(15 * math.cos(elapsed * 20)) if progress < 0.2 else 0
+                shake_x = int(self.config.px(15) * math.sin(elapsed * 20)) if progress < 0.2 else 0
+                shake_y = int(self.config.px(15) * math.cos(elapsed * 20)) if progress < 0.2 else 0
                 
                 # Center position with shake
-                sprite_x = (self.config.WINDOW_WIDTH - sprite_width) // 2 + shake_x
-                sprite_y = (self.config.WINDOW_HEIGHT - sprite_height) // 2 + shake_y
-                
-                # Apply fade in alpha to sprite - FULL opacity for visibility
-                sprite_alpha = 255  # Always full opacity
-                ko_pygame.set_alpha(sprite_alpha)
+                sprite_x = (self.render_width - sprite_width) // 2 + shake_x
+                sprite_y = (self.render_height - sprite_height) // 2 + shake_y
                 
                 # Add white flash effect in first 0.3 seconds for impact
                 if progress < 0.3:
                     flash_alpha = int(200 * (1.0 - progress / 0.3))  # Fade from 200 to 0
-                    flash_overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-                    flash_overlay.fill((255, 255, 255, flash_alpha))
-                    self.screen.blit(flash_overlay, (0, 0))
+                    self.overlay_manager.blit_overlay(self.screen, (255, 255, 255), flash_alpha)
                 
-                self.screen.blit(ko_pygame, (sprite_x, sprite_y))
+                self.blit_static(ko_pygame, (sprite_x, sprite_y))
             except Exception:
                 pass
                 # Fallback to text if sprite fails
                 self._render_ko_text_fallback(elapsed, progress)
         else:
-            # Fallback to text rendering
+            # Fallback to text rendering (also while the pulse is still baking)
             self._render_ko_text_fallback(elapsed, progress)
     
+    def _get_ko_pulse_animation(self):
+        """Get baked KO sprite pulse (one pulse period), None while it bakes in the background"""
+        # Calculate size with pulse - LARGER base size for better visibility
+        base_width = self.config.px(600)
+        base_height = self.config.px(360)
+        
+        def render_pulse_frame(t):
+            # Pulsing scale effect for KO sprite (simplified for performance)
+            pulse_scale = 1.0 + 0.15 * abs(math.sin(t * 3))  # Reduced pulse range
+            sprite_size = (int(base_width * pulse_scale), int(base_height * pulse_scale))
+            ko_surface = cv2.resize(self.ko_sprite, sprite_size, interpolation=cv2.INTER_LINEAR)
+            ko_rgba = cv2.cvtColor(ko_surface, cv2.COLOR_BGRA2RGBA)
+            return pygame.image.frombuffer(ko_rgba.tobytes(), sprite_size, "RGBA")
+        
+        # abs(sin(3t)) repeats every pi/3 seconds
+        return self.animation_baker.get(('ko_pulse', base_width, base_height), render_pulse_frame, math.pi / 3,
+                                        self.config.ANIMATION_BAKE_FPS, background=True)
+    
     def _render_ko_text_fallback(self, elapsed, progress):
         """Fallback text rendering for KO effect"""
         # KO text with pulsing scale effect
         pulse_scale = 1.0 + 0.3 * abs(math.sin(elapsed * 3))  # Pulse between 1.0 and 1.3
-        ko_size = int(200 * pulse_scale)
+        ko_size = int(self.config.px(200) * pulse_scale) // 10 * 10  # Snap to 10px steps so only a few font sizes get cached
+        ko_font = self.font_manager.get_font(self.font_path, ko_size)
         
-        try:
-            ko_font = pygame.font.Font(self.font_path, ko_size)
-        except:
-            ko_font = pygame.font.SysFont("Arial", ko_size, bold=True)
-        
-        # Gradient effect: red to orange
-        color_phase = (elapsed * 2) % 1.0
+        # Gradient effect: red to orange (quantized so rendered text stays cacheable)
+        color_phase = int((elapsed * 2) % 1.0 * 16) / 16
         red = 255
         green = int(100 + 155 * color_phase)
         ko_color = (red, green, 0)
         
-        ko_text = ko_font.render("K.O.", True, ko_color)
+        ko_text = self.text_cache.render(ko_font, "K.O.", ko_color)
         
         # Slight shake effect
-        shake_x = int(10 * math.sin(elapsed * 15)) if progress < 0.5 else 0
-        shake_y = int(10 * math.cos(elapsed * 15)) if progress < 0.5 else 0
+        shake_x = int(self.config.px(10) * math.sin(elapsed * 15)) if progress < 0.5 else 0
+        shake_y = int(self.config.px(10) * math.cos(elapsed * 15)) if progress < 0.5 else 0
         
         ko_rect = ko_text.get_rect(center=(
-            self.config.WINDOW_WIDTH // 2 + shake_x,
-            self.config.WINDOW_HEIGHT // 2 + shake_y
+            self.render_width // 2 + shake_x,
+            self.render_height // 2 + shake_y
         ))
         
         # Shadow effect
-        shadow_offset = 5
-        shadow_text = ko_font.render("K.O.", True, (50, 0, 0))
+        shadow_offset = self.config.px(5)
+        shadow_text = self.text_cache.render(ko_font, "K.O.", (50, 0, 0))
         shadow_rect = shadow_text.get_rect(center=(ko_rect.centerx + shadow_offset, ko_rect.centery + shadow_offset))
         self.screen.blit(shadow_text, shadow_rect)
         
@@ -567,9 +642,7 @@ class RenderSystem:
     
     def _render_game_over(self, game_state):
         """Render game over screen"""
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
+        self.overlay_manager.blit_overlay(self.screen, (0, 0, 0), 200)
         
         if game_state.player_health <= 0:
             result_text = "YOU LOSE!"
@@ -578,13 +651,13 @@ class RenderSystem:
             result_text = "YOU WIN!"
             color = (0, 255, 0)
         
-        title = self.font['large'].render(result_text, True, color)
-        score = self.font['medium'].render(f"Final Score: {game_state.score}", True, (255, 255, 255))
-        restart = self.font['small'].render("Press Enter to restart", True, (200, 200, 200))
+        title = self.text_cache.render(self.font['large'], result_text, color)
+        score = self.text_cache.render(self.font['medium'], f"Final Score: {game_state.score}", (255, 255, 255))
+        restart = self.text_cache.render(self.font['small'], "Press Enter to restart", (200, 200, 200))
         
-        self.screen.blit(title, title.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 - 60)))
-        self.screen.blit(score, score.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 + 20)))
-        self.screen.blit(restart, restart.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT - 50)))
+        self.screen.blit(title, title.get_rect(center=(self.render_width//2, self.render_height//2 - self.config.px(60))))
+        self.screen.blit(score, score.get_rect(center=(self.render_width//2, self.render_height//2 + self.config.px(20))))
+        self.screen.blit(restart, restart.get_rect(center=(self.render_width//2, self.render_height - self.config.px(50))))
     
     def handle_events(self):
         """Handle pygame events"""
@@ -593,29 +666,11 @@ class RenderSystem:
                 return False
         return True
     
-    def _render_particles(self):
-        """Render and update VFX particles"""
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['life'] -= 0.05
-            particle['size'] *= 0.95
-            
-            if particle['life'] <= 0 or particle['size'] <= 0.5:
-                self.particles.remove(particle)
-                continue
-            
-            # Draw particle
-            alpha = int(255 * particle['life'])
-            size = int(particle['size'])
-            color = (*particle['color'], alpha)
-            
-            try:
-                particle_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                pygame.draw.circle(particle_surface, color, (size, size), size)
-                self.screen.blit(particle_surface, (int(particle['pos'][0] - size), int(particle['pos'][1] - size)))
-            except:
-                pass
+    def _render_particles(self, game_state):
+        """Spawn queued hit bursts, then update and draw VFX particles"""
+        self.particle_system.consume_events(game_state)
+        self.particle_system.update()
+        self.particle_system.draw(self.screen)
     
     def _render_hitboxes(self, game_state):
         """Render punch bags dengan circle background 130x130px"""
@@ -626,7 +681,7 @@ class RenderSystem:
         self._ensure_punch_bags_loaded()
         
         hitboxes = game_state.hitbox_system.get_all_hitboxes()
-        current_time = time.time()
+        current_time = self.clock.now()
         
         for hitbox in hitboxes:
             # Skip hitboxes that are not visible yet (waiting to spawn)
@@ -642,9 +697,9 @@ class RenderSystem:
             bag_type = hitbox['type']
             
             # Convert to screen coordinates
-            screen_center_x = int(center_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-            screen_center_y = int(center_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
-            screen_radius = int(radius * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
+            screen_center_x = int(center_x * self.render_width / self.config.CAMERA_WIDTH)
+            screen_center_y = int(center_y * self.render_height / self.config.CAMERA_HEIGHT)
+            screen_radius = int(radius * self.render_width / self.config.CAMERA_WIDTH)
             
             # Draw circle background
             if is_active:
@@ -660,6 +715,7 @@ class RenderSystem:
             pygame.draw.circle(self.screen, circle_color, 
                               (screen_center_x, screen_center_y), 
                               screen_radius, circle_width)
+            self.backend.mark_dirty()
             
             # Select punch bag
             if bag_type == 'red':
@@ -692,6 +748,7 @@ class RenderSystem:
                 pygame.draw.circle(self.screen, circle_color, 
                                   (screen_center_x, screen_center_y), 
                                   screen_radius // 2, 0)
+                self.backend.mark_dirty()
     
     def _render_enemy_attack(self, game_state):
         """Render enemy attack dengan target icon dan glove animation"""
@@ -712,16 +769,18 @@ class RenderSystem:
             target_pos = attack_system.get_target_position()
             if target_pos:
                 target_x, target_y = target_pos
-                screen_x = int(target_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                screen_y = int(target_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
+                screen_x = int(target_x * self.render_width / self.config.CAMERA_WIDTH)
+                screen_y = int(target_y * self.render_height / self.config.CAMERA_HEIGHT)
                 
                 # Draw crosshair target
-                size = 40 + int(math.sin(time.time() * 5) * 5)
+                size = self.config.px(40 + int(math.sin(self.clock.now() * 5) * 5))
+                arm = self.config.px(10)
                 pygame.draw.circle(self.screen, (255, 0, 0), (screen_x, screen_y), size, 3)
                 pygame.draw.line(self.screen, (255, 0, 0), 
-                               (screen_x - size - 10, screen_y), (screen_x + size + 10, screen_y), 3)
+                               (screen_x - size - arm, screen_y), (screen_x + size + arm, screen_y), 3)
                 pygame.draw.line(self.screen, (255, 0, 0), 
-                               (screen_x, screen_y - size - 10), (screen_x, screen_y + size + 10), 3)
+                               (screen_x, screen_y - size - arm), (screen_x, screen_y + size + arm), 3)
+                self.backend.mark_dirty()
         
         # Render glove animation during attack phase
         if attack_system.is_attacking:
@@ -733,48 +792,48 @@ class RenderSystem:
                 target_x, target_y = target_pos
                 
                 # Convert to screen coordinates
-                screen_glove_x = int(glove_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                screen_glove_y = int(glove_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
-                screen_target_x = int(target_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                screen_target_y = int(target_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
+                screen_glove_x = int(glove_x * self.render_width / self.config.CAMERA_WIDTH)
+                screen_glove_y = int(glove_y * self.render_height / self.config.CAMERA_HEIGHT)
+                screen_target_x = int(target_x * self.render_width / self.config.CAMERA_WIDTH)
+                screen_target_y = int(target_y * self.render_height / self.config.CAMERA_HEIGHT)
                 
-                if self.glove_image is not None:
+                if self.glove_surface is not None:
                     try:
-                        glove_size = 120
-                        glove_resized = cv2.resize(self.glove_image, (glove_size, glove_size))
-                        glove_rgba = cv2.cvtColor(glove_resized, cv2.COLOR_BGRA2RGBA)
-                        glove_surface = pygame.image.frombuffer(glove_rgba.tobytes(), (glove_size, glove_size), "RGBA")
+                        glove_size = self.glove_size
                         
                         # Motion trail
                         progress = attack_system.glove_progress
                         if progress < 0.8:
-                            for i in range(3):
+                            for i, trail_surface in enumerate(self.glove_trail_surfaces):
                                 trail_progress = max(0, progress - (i + 1) * 0.1)
                                 trail_x = int(glove_x + (target_x - glove_x) * trail_progress)
                                 trail_y = int(glove_y + (target_y - glove_y) * trail_progress)
-                                trail_screen_x = int(trail_x * self.config.WINDOW_WIDTH / self.config.CAMERA_WIDTH)
-                                trail_screen_y = int(trail_y * self.config.WINDOW_HEIGHT / self.config.CAMERA_HEIGHT)
+                                trail_screen_x = int(trail_x * self.render_width / self.config.CAMERA_WIDTH)
+                                trail_screen_y = int(trail_y * self.render_height / self.config.CAMERA_HEIGHT)
                                 
-                                trail_surface = glove_surface.copy()
-                                trail_surface.set_alpha(100 - i * 30)
-                                self.screen.blit(trail_surface, (trail_screen_x - glove_size // 2, trail_screen_y - glove_size // 2))
+                                self.blit_static(trail_surface, (trail_screen_x - glove_size // 2, trail_screen_y - glove_size // 2))
                         
-                        self.screen.blit(glove_surface, (screen_glove_x - glove_size // 2, screen_glove_y - glove_size // 2))
+                        self.blit_static(self.glove_surface, (screen_glove_x - glove_size // 2, screen_glove_y - glove_size // 2))
                         
                         # Also draw target crosshair during attack
-                        size = 30
+                        size = self.config.px(30)
+                        arm = self.config.px(5)
                         pygame.draw.circle(self.screen, (255, 100, 100), (screen_target_x, screen_target_y), size, 2)
                         pygame.draw.line(self.screen, (255, 100, 100), 
-                                       (screen_target_x - size - 5, screen_target_y), (screen_target_x + size + 5, screen_target_y), 2)
+                                       (screen_target_x - size - arm, screen_target_y), (screen_target_x + size + arm, screen_target_y), 2)
                         pygame.draw.line(self.screen, (255, 100, 100), 
-                                       (screen_target_x, screen_target_y - size - 5), (screen_target_x, screen_target_y + size + 5), 2)
+                                       (screen_target_x, screen_target_y - size - arm), (screen_target_x, screen_target_y + size + arm), 2)
+                        self.backend.mark_dirty()
                     except Exception as e:
                         # Fallback: draw red circle
-                        pygame.draw.circle(self.screen, (200, 0, 0), (screen_glove_x, screen_glove_y), 30, 0)
+                        pygame.draw.circle(self.screen, (200, 0, 0), (screen_glove_x, screen_glove_y), self.config.px(30), 0)
+                        self.backend.mark_dirty()
                 else:
                     # Fallback: draw red circle
-                    pygame.draw.circle(self.screen, (200, 0, 0), (screen_glove_x, screen_glove_y), 30, 0)
+                    pygame.draw.circle(self.screen, (200, 0, 0), (screen_glove_x, screen_glove_y), self.config.px(30), 0)
+                    self.backend.mark_dirty()
     
     def close(self):
         """Clean up resources"""
+        self.backend.close()
         pygame.quit()
\ No newline at end of file
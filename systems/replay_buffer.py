@@ -0,0 +1,251 @@
+"""Replay buffer - pre-roll ring of compressed frames and slow-motion KO replay player."""
+
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+import pygame
+from core.utils import TextCache, PixelBuffer
+
+class ReplayBuffer:
+    """Fixed-memory ring of the last REPLAY_SECONDS of downscaled JPEG frames
+    
+    JPEG bytes live in one preallocated arena with a slot per frame, so memory stays constant
+    however long a session runs. The game loop only copies the composited frame into a staging
+    buffer; downscaling and encoding happen on a background thread.
+    """
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.enabled = self.config.REPLAY_ENABLED
+        self.capturing = False
+        self.frame_interval = 1.0 / self.config.REPLAY_FPS
+        self.last_capture_time = 0
+        
+        # Ring of encoded frames
+        self.slot_count = max(1, int(self.config.REPLAY_SECONDS * self.config.REPLAY_FPS))
+        self.arena = np.zeros((self.slot_count, self.config.REPLAY_MAX_FRAME_BYTES), dtype=np.uint8)
+        self.lengths = np.zeros(self.slot_count, dtype=np.int32)
+        self.timestamps = np.zeros(self.slot_count, dtype=np.float64)
+        self.write_index = 0
+        self.count = 0
+        self.lock = threading.Lock()
+        
+        # Replay frame size keeps the render aspect ratio
+        render_width, render_height = self.config.get_render_size()
+        self.frame_size = (self.config.REPLAY_WIDTH, int(round(self.config.REPLAY_WIDTH * render_height / render_width)))
+        
+        # Full-size staging buffers handed to the encoder thread (allocated from the first frame)
+        self.staging = []
+        self.free_staging = queue.Queue()
+        self.encode_queue = queue.Queue()
+        self.encoder_thread = None
+        self.frames_dropped = 0
+    
+    def reset(self):
+        """Clear the ring and start capturing (new match)"""
+        self.wait_for_encoder()
+        with self.lock:
+            self.write_index = 0
+            self.count = 0
+        self.last_capture_time = 0
+        self.capturing = self.enabled
+        if self.capturing and self.encoder_thread is None:
+            self.encoder_thread = threading.Thread(target=self._encoder_loop, name="replay-encoder", daemon=True)
+            self.encoder_thread.start()
+    
+    def freeze(self):
+        """Stop capturing and wait for queued frames, keeping the current pre-roll"""
+        self.capturing = False
+        self.wait_for_encoder()
+    
+    def wait_for_encoder(self):
+        """Block until the encoder has stored every queued frame"""
+        if self.encoder_thread is not None:
+            self.encode_queue.join()
+    
+    def wants_frame(self):
+        """Check whether the next frame should be captured (capturing and due at REPLAY_FPS)"""
+        return self.capturing and time.time() - self.last_capture_time >= self.frame_interval
+    
+    def capture_frame(self, surface):
+        """Frame listener - copy the composited frame into a staging buffer for encoding"""
+        if not self.wants_frame():
+            return
+        now = time.time()
+        self.last_capture_time = now
+        
+        if not self.staging:
+            # Two buffers: one being encoded, one being filled
+            self.staging = [PixelBuffer(surface) for _ in range(2)]
+            for index in range(len(self.staging)):
+                self.free_staging.put(index)
+        if not self.staging[0].matches(surface):
+            return
+        
+        try:
+            index = self.free_staging.get_nowait()
+        except queue.Empty:
+            self.frames_dropped += 1  # Encoder behind, skip this frame
+            return
+        
+        self.staging[index].copy_from(surface)
+        self.encode_queue.put((index, now))
+    
+    def _encoder_loop(self):
+        """Encoder thread - downscale, JPEG-encode and store staged frames in the ring"""
+        encode_params = [cv2.IMWRITE_JPEG_QUALITY, self.config.REPLAY_JPEG_QUALITY]
+        while True:
+            index, timestamp = self.encode_queue.get()
+            try:
+                frame = cv2.resize(self.staging[index].to_bgr(), self.frame_size, interpolation=cv2.INTER_AREA)
+                self.free_staging.put(index)
+                ok, encoded = cv2.imencode('.jpg', frame, encode_params)
+                if ok and len(encoded) <= self.config.REPLAY_MAX_FRAME_BYTES:
+                    self._store(encoded.reshape(-1), timestamp)
+                else:
+                    self.frames_dropped += 1
+            except Exception as e:
+                print(f"Error encoding replay frame: {e}")
+            finally:
+                self.encode_queue.task_done()
+    
+    def _store(self, encoded, timestamp):
+        """Write encoded bytes into the next ring slot, overwriting the oldest frame"""
+        with self.lock:
+            slot = self.write_index
+            self.arena[slot, :len(encoded)] = encoded
+            self.lengths[slot] = len(encoded)
+            self.timestamps[slot] = timestamp
+            self.write_index = (slot + 1) % self.slot_count
+            self.count = min(self.count + 1, self.slot_count)
+    
+    def get_slots(self):
+        """Get ring slot indices from oldest to newest"""
+        with self.lock:
+            start = (self.write_index - self.count) % self.slot_count
+            return [(start + i) % self.slot_count for i in range(self.count)]
+    
+    def get_encoded(self, slot):
+        """Get the JPEG bytes stored in a slot (view into the arena)"""
+        return self.arena[slot, :self.lengths[slot]]
+    
+    def decode(self, slot):
+        """Decode a slot into an RGB frame"""
+        frame = cv2.imdecode(self.get_encoded(slot), cv2.IMREAD_COLOR)
+        if frame is None:
+            return None
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
+    def save_clip(self):
+        """Write the frozen pre-roll to a video file on a background thread"""
+        slots = self.get_slots()
+        if not slots:
+            return None
+        # Copy the JPEG bytes so the ring can be reused while the clip is written
+        encoded_frames = [self.get_encoded(slot).copy() for slot in slots]
+        os.makedirs(self.config.RECORDING_DIR, exist_ok=True)
+        path = os.path.join(self.config.RECORDING_DIR, time.strftime("ko_%Y%m%d_%H%M%S.mp4"))
+        threading.Thread(target=self._write_clip, args=(path, encoded_frames), name="replay-clip", daemon=True).start()
+        return path
+    
+    def _write_clip(self, path, encoded_frames):
+        """Decode frames and write them with cv2.VideoWriter"""
+        fourcc = cv2.VideoWriter_fourcc(*self.config.RECORDING_CODEC)
+        writer = cv2.VideoWriter(path, fourcc, self.config.REPLAY_FPS, self.frame_size)
+        if not writer.isOpened():
+            print(f"Error: Could not open video writer for {path}")
+            return
+        try:
+            for encoded in encoded_frames:
+                frame = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+                if frame is not None:
+                    writer.write(frame)
+            print(f"Replay clip saved: {path} ({len(encoded_frames)} frames)")
+        except Exception as e:
+            print(f"Error writing replay clip {path}: {e}")
+        finally:
+            writer.release()
+
+class ReplayPlayer:
+    """Plays the frozen pre-roll back in slow motion as an inset"""
+    
+    def __init__(self, game_config, replay_buffer):
+        self.config = game_config
+        self.replay_buffer = replay_buffer
+        self.active = False
+        self.start_time = 0
+        self.slots = []
+        self.times = None
+        self.current_slot = None
+        self.surface = None
+        px = self.config.px
+        self.inset_size = (px(self.config.REPLAY_INSET_WIDTH),
+                           px(int(round(self.config.REPLAY_INSET_WIDTH * replay_buffer.frame_size[1] / replay_buffer.frame_size[0]))))
+        self.width, self.height = self.config.get_render_size()
+        self.text_cache = TextCache()
+    
+    def play_pre_roll(self, current_time):
+        """Freeze the buffer and replay it (once per match, optionally saving a clip)"""
+        if not self.replay_buffer.capturing:
+            return
+        self.replay_buffer.freeze()
+        if self.start(current_time) and self.config.REPLAY_SAVE_CLIPS:
+            self.replay_buffer.save_clip()
+    
+    def start(self, current_time):
+        """Start looping playback of the buffered frames"""
+        self.slots = self.replay_buffer.get_slots()
+        if not self.slots:
+            self.active = False
+            return False
+        self.times = self.replay_buffer.timestamps[self.slots] - self.replay_buffer.timestamps[self.slots[0]]
+        self.start_time = current_time
+        self.current_slot = None
+        self.active = True
+        return True
+    
+    def stop(self):
+        """Stop playback"""
+        self.active = False
+        self.slots = []
+        self.current_slot = None
+    
+    def get_surface(self, current_time):
+        """Get the replay frame for current_time (decoded only when the frame changes)"""
+        if not self.active:
+            return None
+        
+        # Slowed-down position within the clip, with a short hold on the last frame before looping
+        span = self.times[-1] + self.replay_buffer.frame_interval
+        position = ((current_time - self.start_time) * self.config.REPLAY_SPEED) % span
+        slot = self.slots[max(0, int(np.searchsorted(self.times, position, side='right')) - 1)]
+        
+        if slot != self.current_slot:
+            frame = self.replay_buffer.decode(slot)
+            if frame is not None:
+                frame_surface = pygame.image.frombuffer(frame.tobytes(), (frame.shape[1], frame.shape[0]), 'RGB')
+                self.surface = pygame.transform.smoothscale(frame_surface, self.inset_size)
+            self.current_slot = slot
+        return self.surface
+    
+    def render(self, screen, current_time, anchor="corner"):
+        """Draw the replay inset with a frame and label ("corner" = bottom-right, "top" = top-center)"""
+        surface = self.get_surface(current_time)
+        if surface is None:
+            return
+        
+        px = self.config.px
+        if anchor == "top":
+            rect = surface.get_rect(midtop=(self.width // 2, px(20)))
+        else:
+            rect = surface.get_rect(bottomright=(self.width - px(20), self.height - px(20)))
+        pygame.draw.rect(screen, (255, 255, 255), rect.inflate(px(6), px(6)), px(3))
+        screen.blit(surface, rect)
+        
+        label = self.text_cache.render_text(self.config.FONT_PATH, px(14), "REPLAY", (255, 215, 0))
+        label_rect = label.get_rect(topleft=(rect.x, rect.y))
+        pygame.draw.rect(screen, (0, 0, 0), label_rect.inflate(px(12), px(8)).move(px(6), px(4)))
+        screen.blit(label, label_rect.move(px(6), px(4)))
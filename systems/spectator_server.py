@@ -0,0 +1,307 @@
+"""Spectator server - serves the composited frame as an MJPEG stream over HTTP."""
+
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from core.utils import PixelBuffer
+
+def _encoder_process(shm_name, slots_shape, bgr_offsets, output_size, jpeg_quality, task_queue, result_queue):
+    """Worker process - JPEG-encode 32-bit pixel rows from shared memory slots"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slot_count, height, pitch = slots_shape
+    width = pitch // 4
+    encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+    try:
+        slots = np.ndarray(slots_shape, dtype=np.uint8, buffer=shm.buf)
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            slot, sequence = task
+            frame = slots[slot].reshape(height, width, 4)[..., bgr_offsets]
+            if output_size != (width, height):
+                frame = cv2.resize(frame, output_size, interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode('.jpg', frame, encode_params)
+            result_queue.put((slot, sequence, encoded.tobytes() if ok else None))
+        del slots
+    finally:
+        shm.close()
+
+class SpectatorRequestHandler(BaseHTTPRequestHandler):
+    """Serves the viewer page, single snapshots and the MJPEG stream"""
+    timeout = 10  # Drop clients whose socket stalls
+    send_buffer_size = 64 * 1024  # Small send buffer so a slow viewer skips frames instead of lagging behind
+    
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+    
+    def do_GET(self):
+        spectator = self.server.spectator
+        if self.path == '/':
+            body = b'<html><body style="margin:0;background:#000"><img src="/stream" style="width:100%"></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == '/frame.jpg':
+            # Fresh frame even when nobody streams; the last (warm) frame if none arrives in time
+            jpeg, _ = spectator.wait_for_frame(spectator.request_snapshot(), timeout=2.0)
+            if jpeg is None:
+                jpeg = spectator.latest_jpeg
+            if jpeg is None:
+                self.send_error(503, "No frame yet")
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(jpeg)))
+            self.end_headers()
+            self.wfile.write(jpeg)
+        elif self.path == '/stream':
+            self._stream(spectator)
+        else:
+            self.send_error(404)
+    
+    def _stream(self, spectator):
+        """Push the newest frame to this client whenever one is ready; frames it was too slow for are skipped"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        spectator.client_connected()
+        last_sequence = -1
+        frames_sent = 0
+        frames_skipped = 0
+        try:
+            while spectator.running:
+                jpeg, sequence = spectator.wait_for_frame(last_sequence, timeout=1.0)
+                if jpeg is None:
+                    continue
+                if last_sequence >= 0:
+                    frames_skipped += sequence - last_sequence - 1
+                last_sequence = sequence
+                
+                self.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(jpeg))
+                self.wfile.write(jpeg)
+                self.wfile.write(b'\r\n')
+                frames_sent += 1
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            spectator.client_disconnected(frames_sent, frames_skipped)
+    
+    def log_message(self, format, *args):
+        pass  # Keep the game console quiet
+
+class SpectatorServer:
+    """Optional MJPEG spectator output for a venue screen
+    
+    The game loop memcpys the composited frame into a shared memory slot; a worker process
+    encodes it and every HTTP client is sent the newest JPEG, so a slow viewer only skips
+    frames and never backs up the game loop.
+    """
+    SLOT_COUNT = 2  # One being encoded, one being filled
+    
+    def __init__(self, game_config):
+        self.config = game_config
+        self.enabled = self.config.SPECTATOR_ENABLED
+        self.running = False
+        self.frame_interval = 1.0 / self.config.SPECTATOR_FPS
+        self.last_capture_time = 0
+        self.sequence = 0
+        
+        render_width, render_height = self.config.get_render_size()
+        self.source_size = (render_width, render_height)
+        output_width = min(self.config.SPECTATOR_WIDTH, render_width)
+        self.output_size = (output_width, int(round(output_width * render_height / render_width)))
+        
+        self.shm = None
+        self.slots_shape = (self.SLOT_COUNT, render_height, render_width * 4)
+        self.slots = None
+        self.pixel_buffers = None
+        self.free_slots = queue.Queue()
+        self.task_queue = None
+        self.result_queue = None
+        self.encoder = None
+        self.collector_thread = None
+        self.httpd = None
+        self.http_thread = None
+        
+        # Newest encoded frame shared with the client threads
+        self.frame_condition = threading.Condition()
+        self.latest_jpeg = None
+        self.latest_sequence = -1
+        self.client_count = 0
+        self.snapshot_wanted = False  # A /frame.jpg request is waiting for the next frame
+        self.frames_dropped = 0
+    
+    def start(self):
+        """Start the encoder process and the HTTP server"""
+        if not self.enabled or self.running:
+            return
+        try:
+            self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.slots_shape)))
+            self.slots = np.ndarray(self.slots_shape, dtype=np.uint8, buffer=self.shm.buf)
+            
+            self.task_queue = multiprocessing.Queue()
+            self.result_queue = multiprocessing.Queue()
+            self.httpd = ThreadingHTTPServer((self.config.SPECTATOR_HOST, self.config.SPECTATOR_PORT), SpectatorRequestHandler)
+            self.httpd.daemon_threads = True
+            self.httpd.spectator = self
+        except Exception as e:
+            print(f"Warning: Could not start spectator server: {e}")
+            self._release_shared_memory()
+            self.enabled = False
+            return
+        
+        for slot in range(self.SLOT_COUNT):
+            self.free_slots.put(slot)
+        self.running = True
+        
+        self.collector_thread = threading.Thread(target=self._collect_results, name="spectator-collector", daemon=True)
+        self.collector_thread.start()
+        self.http_thread = threading.Thread(target=self.httpd.serve_forever, name="spectator-http", daemon=True)
+        self.http_thread.start()
+        host, port = self.httpd.server_address[:2]
+        print(f"Spectator stream: http://{host}:{port}/")
+    
+    def _start_encoder(self, bgr_offsets):
+        """Start the encoder process once the frame layout is known"""
+        self.encoder = multiprocessing.Process(
+            target=_encoder_process,
+            args=(self.shm.name, self.slots_shape, bgr_offsets, self.output_size,
+                  self.config.SPECTATOR_JPEG_QUALITY, self.task_queue, self.result_queue),
+            name="spectator-encoder",
+            daemon=True
+        )
+        self.encoder.start()
+    
+    def wants_frame(self):
+        """Check whether the next frame should be sent (due at SPECTATOR_FPS and a slot is free)
+        
+        Without stream clients only snapshot requests and the first (warm) frame are encoded.
+        """
+        if not self.client_count and not self.snapshot_wanted and self.sequence > 0:
+            return False
+        return (self.running and time.time() - self.last_capture_time >= self.frame_interval and
+                not self.free_slots.empty())
+    
+    def capture_frame(self, surface):
+        """Frame listener - copy the composited frame into a shared memory slot for the encoder"""
+        if not self.running or time.time() - self.last_capture_time < self.frame_interval:
+            return
+        
+        if self.pixel_buffers is None:
+            if surface.get_size() != self.source_size or surface.get_pitch() != self.source_size[0] * 4:
+                return
+            self.pixel_buffers = [PixelBuffer(surface, rows=self.slots[slot]) for slot in range(self.SLOT_COUNT)]
+            self._start_encoder(self.pixel_buffers[0].bgr_offsets)
+        if not self.pixel_buffers[0].matches(surface):
+            return
+        
+        try:
+            slot = self.free_slots.get_nowait()
+        except queue.Empty:
+            self.frames_dropped += 1  # Encoder still busy with both slots
+            return
+        
+        self.last_capture_time = time.time()
+        self.snapshot_wanted = False
+        self.pixel_buffers[slot].copy_from(surface)
+        self.sequence += 1
+        self.task_queue.put((slot, self.sequence))
+    
+    def _collect_results(self):
+        """Collector thread - publish encoded frames and hand slots back"""
+        while self.running:
+            try:
+                slot, sequence, jpeg = self.result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            self.free_slots.put(slot)
+            if jpeg is None:
+                continue
+            with self.frame_condition:
+                self.latest_jpeg = jpeg
+                self.latest_sequence = sequence
+                self.frame_condition.notify_all()
+    
+    def wait_for_frame(self, last_sequence, timeout=1.0):
+        """Wait for a frame newer than last_sequence; returns (jpeg, sequence) or (None, last_sequence)"""
+        with self.frame_condition:
+            if self.latest_sequence <= last_sequence:
+                self.frame_condition.wait(timeout)
+            if self.latest_jpeg is None or self.latest_sequence <= last_sequence:
+                return None, last_sequence
+            return self.latest_jpeg, self.latest_sequence
+    
+    def request_snapshot(self):
+        """Ask for the next composited frame to be encoded; returns the sequence it will follow"""
+        sequence = self.sequence
+        self.snapshot_wanted = True
+        return sequence
+    
+    def client_connected(self):
+        """Track a new stream client"""
+        with self.frame_condition:
+            self.client_count += 1
+            count = self.client_count
+        print(f"Spectator connected ({count} watching)")
+    
+    def client_disconnected(self, frames_sent, frames_skipped):
+        """Track a closed stream client"""
+        with self.frame_condition:
+            self.client_count -= 1
+            count = self.client_count
+        print(f"Spectator disconnected after {frames_sent} frames, {frames_skipped} skipped ({count} watching)")
+    
+    def get_stats(self):
+        """Get stream counters"""
+        return {
+            'running': self.running,
+            'clients': self.client_count,
+            'frames_sent_to_encoder': self.sequence,
+            'frames_dropped': self.frames_dropped,
+            'latest_sequence': self.latest_sequence
+        }
+    
+    def close(self):
+        """Stop the server and encoder and release shared memory"""
+        if not self.running:
+            return
+        self.running = False
+        with self.frame_condition:
+            self.frame_condition.notify_all()
+        
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.encoder is not None:
+            self.task_queue.put(None)
+            self.encoder.join(timeout=2.0)
+            if self.encoder.is_alive():
+                self.encoder.terminate()
+        self.collector_thread.join(timeout=2.0)
+        self.pixel_buffers = None
+        self._release_shared_memory()
+    
+    def _release_shared_memory(self):
+        """Close and unlink the frame slots"""
+        if self.shm is None:
+            return
+        self.slots = None
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except Exception as e:
+            print(f"Warning: Could not release spectator shared memory: {e}")
+        self.shm = None
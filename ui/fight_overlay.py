@@ -1,18 +1,23 @@
 """Fight overlay - displays round splash screens and FIGHT text."""
 
 import pygame
-import time
 import math
 import os
+from core.utils import TextCache, OverlayManager, AnimationBaker
+from core.clock import GameClock
 
 class FightOverlay:
     def __init__(self, game_config):
         self.config = game_config
+        self.clock = GameClock()
         self.active = False
         self.start_time = 0
-        self.duration = 2.5  # Total duration: 1.5s round image + 1.0s fight image
+        self.duration = game_config.SPLASH_DURATION  # Total duration: 1.5s round image + 1.0s fight image
         self.phase_duration = 1.5  # Duration for round image
         self.current_round = 1
+        self.overlay_manager = OverlayManager()
+        self.width, self.height = game_config.get_render_size()
+        self.splash_size = (game_config.px(500), game_config.px(400))
         
         # Load round images
         self.round_surfaces = {
@@ -23,6 +28,13 @@ class FightOverlay:
         
         # Load FIGHT image
         self.fight_surface = self._load_round_surface("fight.png")
+        self.fight_fade_duration = 0.3
+        
+        # Bake splash pulses in the background so the first splash doesn't rescale per frame
+        self.animation_baker = AnimationBaker()
+        for round_num in self.round_surfaces:
+            self._get_round_pulse(round_num)
+        self._get_fight_fade()
     
     def _load_round_surface(self, filename):
         """Load round image and convert to Pygame surface"""
@@ -33,7 +45,7 @@ class FightOverlay:
                 return self._create_placeholder_surface(filename)
             
             image = pygame.image.load(path)
-            image = pygame.transform.scale(image, (500, 400))
+            image = pygame.transform.scale(image, self.splash_size)
             return image
         except Exception as e:
             print(f"Error loading {filename}: {str(e)}")
@@ -41,7 +53,7 @@ class FightOverlay:
     
     def _create_placeholder_surface(self, filename):
         """Create placeholder surface if image not found"""
-        surface = pygame.Surface((500, 400), pygame.SRCALPHA)
+        surface = pygame.Surface(self.splash_size, pygame.SRCALPHA)
         
         # Different colors for different rounds
         if "round-1" in filename:
@@ -61,22 +73,47 @@ class FightOverlay:
             text = "READY"
         
         # Draw background
-        pygame.draw.rect(surface, color, (0, 0, 500, 400), border_radius=20)
+        pygame.draw.rect(surface, color, surface.get_rect(), border_radius=self.config.px(20))
         
         # Draw border
-        pygame.draw.rect(surface, (255, 255, 255, 255), (0, 0, 500, 400), 3, border_radius=20)
+        pygame.draw.rect(surface, (255, 255, 255, 255), surface.get_rect(), 3, border_radius=self.config.px(20))
         
         # Draw text
-        font = pygame.font.Font(None, 80)
-        text_surface = font.render(text, True, (255, 255, 255))
-        surface.blit(text_surface, text_surface.get_rect(center=(250, 200)))
+        text_surface = TextCache().render_text(None, self.config.px(80), text, (255, 255, 255))
+        surface.blit(text_surface, text_surface.get_rect(center=surface.get_rect().center))
         
         return surface
     
+    def _get_round_pulse(self, round_num):
+        """Get baked pulse of a round image (one period), None while it bakes"""
+        round_surface = self.round_surfaces.get(round_num)
+        if round_surface is None:
+            return None
+        
+        def render_pulse_frame(t):
+            scale = 1.0 + 0.1 * abs(math.sin(t * 2 * math.pi))
+            return pygame.transform.scale(
+                round_surface,
+                (int(round_surface.get_width() * scale), int(round_surface.get_height() * scale))
+            )
+        
+        # abs(sin(2*pi*t)) repeats every 0.5 seconds
+        return self.animation_baker.get(('round_pulse', round_num, round_surface.get_size()), render_pulse_frame, 0.5,
+                                        self.config.ANIMATION_BAKE_FPS, background=True)
+    
+    def _get_fight_fade(self):
+        """Get baked FIGHT fade-in (alpha only, all frames share the FIGHT surface)"""
+        if self.fight_surface is None:
+            return None
+        
+        return self.animation_baker.get(('fight_fade', self.fight_surface.get_size()), lambda t: self.fight_surface,
+                                        self.fight_fade_duration, self.config.ANIMATION_BAKE_FPS, loop=False,
+                                        alpha_fn=lambda t: 255 * t / self.fight_fade_duration)
+    
     def show_round_start(self, round_num):
         """Show round splash screen"""
         self.active = True
-        self.start_time = time.time()
+        self.start_time = self.clock.now()
         self.current_round = round_num
     
     def is_active(self):
@@ -84,7 +121,7 @@ class FightOverlay:
         if not self.active:
             return False
         
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock.now() - self.start_time
         return elapsed < self.duration
     
     def render(self, screen):
@@ -92,36 +129,24 @@ class FightOverlay:
         if not self.active:
             return
         
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock.now() - self.start_time
         if elapsed > self.duration:
             self.active = False
             return
         
         # Create semi-transparent background
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        self.overlay_manager.blit_overlay(screen, (0, 0, 0), 200)
         
         # Phase 1: Show round image (first 1.5 seconds)
         if elapsed < self.phase_duration:
-            round_surface = self.round_surfaces.get(self.current_round, self.round_surfaces[1])
+            round_num = self.current_round if self.current_round in self.round_surfaces else 1
+            round_surface = self.round_surfaces[round_num]
             if round_surface:
-                # Calculate position to center
-                x = (self.config.WINDOW_WIDTH - round_surface.get_width()) // 2
-                y = (self.config.WINDOW_HEIGHT - round_surface.get_height()) // 2
-                
-                # Pulse effect
-                pulse_time = elapsed * 2
-                scale = 1.0 + 0.1 * abs(math.sin(pulse_time * math.pi))
-                if scale != 1.0:
-                    scaled_surface = pygame.transform.scale(
-                        round_surface,
-                        (int(round_surface.get_width() * scale), int(round_surface.get_height() * scale))
-                    )
-                    scaled_rect = scaled_surface.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2))
-                    screen.blit(scaled_surface, scaled_rect)
-                else:
-                    screen.blit(round_surface, (x, y))
+                # Pulse effect from baked frames (unscaled image until the bake is ready)
+                pulse = self._get_round_pulse(round_num)
+                if pulse is not None:
+                    round_surface = pulse.get_frame(elapsed)
+                screen.blit(round_surface, round_surface.get_rect(center=(self.width//2, self.height//2)))
         
         # Phase 2: Show FIGHT image (next 1.0 seconds)
         elif self.fight_surface and elapsed < self.duration:
@@ -129,21 +154,17 @@ class FightOverlay:
             phase_time = elapsed - self.phase_duration
             total_phase_time = self.duration - self.phase_duration
             
-            # Fade in FIGHT image
-            fade_progress = min(1.0, phase_time / 0.3)  # Fade in over 0.3 seconds
-            alpha = int(255 * fade_progress)
-            
             # Shake effect intensity
             shake_progress = min(1.0, phase_time / 0.5)
-            shake_intensity = int(5 * shake_progress)
+            shake_intensity = int(self.config.px(5) * shake_progress)
             
-            # Create copy with alpha
-            fight_surface = self.fight_surface.copy()
-            fight_surface.set_alpha(alpha)
+            # Fade in FIGHT image over 0.3 seconds (baked alpha steps, no per-frame copy)
+            fight_fade = self._get_fight_fade()
+            fight_surface = fight_fade.get_frame(phase_time) if fight_fade is not None else self.fight_surface
             
             # Calculate position with shake
-            base_x = (self.config.WINDOW_WIDTH - fight_surface.get_width()) // 2
-            base_y = (self.config.WINDOW_HEIGHT - fight_surface.get_height()) // 2
+            base_x = (self.width - fight_surface.get_width()) // 2
+            base_y = (self.height - fight_surface.get_height()) // 2
             shake_offset_x = int(shake_intensity * math.sin(phase_time * 20))
             shake_offset_y = int(shake_intensity * math.cos(phase_time * 20))
             
@@ -1,86 +1,118 @@
 """HUD renderer - displays health bars, timer, combo counter, and phase info."""
 
 import pygame
-import time
 import math
 from core import constants
-from core.utils import FontManager
+from core.utils import FontManager, TextCache, OverlayManager, AnimationBaker
+from core.clock import GameClock
 
 class HUDRenderer:
     def __init__(self, game_config, render_system):
         self.config = game_config
+        self.clock = GameClock()
         self.render_system = render_system
         self.font_path = self.config.FONT_PATH
         
+        # Layout is designed for the window size and resolved through the render scale
+        self.width, self.height = self.config.get_render_size()
+        
         # Use FontManager singleton
         self.font_manager = FontManager()
+        self.text_cache = TextCache()
+        self.overlay_manager = OverlayManager()
+        self.animation_baker = AnimationBaker()
         
         # VFX states
         self.ko_effect_active = False
         self.ko_start_time = 0
         self.fight_effect_active = False
         self.fight_start_time = 0
-        
+    
     def _get_font(self, size):
         """Get font using FontManager"""
-        return self.font_manager.get_font(self.font_path, size)
+        return self.font_manager.get_font(self.font_path, self.config.px(size))
+    
+    def _render_text(self, size, text, color):
+        """Render text through the shared text cache"""
+        return self.text_cache.render_text(self.font_path, self.config.px(size), text, color)
     
     def render_hud(self, game_state, screen):
-        """Render HUD elements"""
+        """Render HUD elements from cached panels, redrawing only what changed"""
+        compositor = self.render_system.compositor
+        compositor.begin_layer('hud')
+        px = self.config.px
+        
         # Health bars
-        self._draw_health_bar(screen, 50, 50, game_state.player_health, constants.PLAYER_MAX_HEALTH, "PLAYER", (0, 100, 255))
-        self._draw_health_bar(screen, self.config.WINDOW_WIDTH - 350, 50, game_state.enemy_health, constants.ENEMY_MAX_HEALTH, "ENEMY", (255, 0, 0))
+        self._update_health_bar(compositor, 'player_health', px(50), px(50), game_state.player_health, constants.PLAYER_MAX_HEALTH, "PLAYER", (0, 100, 255))
+        self._update_health_bar(compositor, 'enemy_health', self.width - px(350), px(50), game_state.enemy_health, constants.ENEMY_MAX_HEALTH, "ENEMY", (255, 0, 0))
         
-        # Timer
-        timer_font = self._get_font(48)
-        timer_text = timer_font.render(f"{int(game_state.round_timer)}", True, (255, 255, 255))
-        timer_bg = pygame.Surface((150, 100), pygame.SRCALPHA)
-        pygame.draw.rect(timer_bg, (50, 50, 50, 180), (0, 0, 150, 100), border_radius=20)
-        screen.blit(timer_bg, (self.config.WINDOW_WIDTH//2 - 75, 10))
-        screen.blit(timer_text, timer_text.get_rect(center=(self.config.WINDOW_WIDTH//2, 60)))
+        # Timer (redrawn once per second)
+        timer_value = int(game_state.round_timer)
+        timer_panel = compositor.get_panel('hud', 'timer', (px(150), px(100)), (self.width//2 - px(75), px(10)))
+        timer_panel.update(timer_value, lambda surface: self._draw_timer(surface, timer_value))
         
         # Combo system display
         if hasattr(game_state, 'combo_active') and game_state.combo_active:
-            # Combo name at top
-            combo_font = self._get_font(18)
-            combo_name = getattr(game_state, 'current_combo_name', '')
-            if combo_name:
-                combo_text = combo_font.render(combo_name, True, (255, 215, 0))
-                screen.blit(combo_text, (self.config.WINDOW_WIDTH//2 - combo_text.get_width()//2, 130))
-            
-            # Combo progress display
-            if hasattr(game_state, 'combo_system'):
-                combo_display = game_state.combo_system.get_combo_display()
-                progress_font = self._get_font(14)
-                progress_text = progress_font.render(combo_display, True, (255, 255, 255))
-                screen.blit(progress_text, (self.config.WINDOW_WIDTH//2 - progress_text.get_width()//2, 155))
+            combo_name = getattr(game_state, 'current_combo_name', '') or ''
+            combo_display = game_state.combo_system.get_combo_display() if hasattr(game_state, 'combo_system') else ''
+            combo_panel = compositor.get_panel('hud', 'combo', (self.width, px(50)), (0, px(130)))
+            combo_panel.update((combo_name, combo_display), lambda surface: self._draw_combo(surface, combo_name, combo_display))
         
         # Phase indicator
         phase_text = self._get_phase_text(game_state.phase)
         if phase_text:
-            self._draw_phase_indicator(screen, phase_text)
+            self._update_phase_indicator(compositor, phase_text)
         
         # Score
-        score_font = self._get_font(12)
-        score_text = score_font.render(f"SCORE {game_state.score}", True, (255, 255, 255))
-        screen.blit(score_text, (self.config.WINDOW_WIDTH - score_text.get_width() - 20, self.config.WINDOW_HEIGHT - 40))
+        score_panel = compositor.get_panel('hud', 'score', (px(400), px(20)), (self.width - px(420), self.height - px(40)))
+        score_panel.update(game_state.score, lambda surface: self._draw_score(surface, game_state.score))
+        
+        compositor.composite(screen, 'hud')
+    
+    def _update_health_bar(self, compositor, panel_name, x, y, current_health, max_health, label, color):
+        """Update cached health bar panel when health changes"""
+        panel = compositor.get_panel('hud', panel_name, (self.config.px(300), self.config.px(40)), (x, y))
+        panel.update(current_health, lambda surface: self._draw_health_bar(surface, 0, 0, current_health, max_health, label, color))
     
     def _draw_health_bar(self, screen, x, y, current_health, max_health, label, color):
         """Draw health bar with label"""
+        px = self.config.px
+        bar_width, bar_height, radius = px(300), px(40), px(20)
+        
         # Background
-        pygame.draw.rect(screen, (50, 50, 50), (x, y, 300, 40), border_radius=20)
+        pygame.draw.rect(screen, (50, 50, 50), (x, y, bar_width, bar_height), border_radius=radius)
         
         # Health fill
-        health_width = int(300 * (current_health / max_health))
-        pygame.draw.rect(screen, color, (x, y, health_width, 40), border_radius=20)
+        health_width = int(bar_width * (current_health / max_health))
+        pygame.draw.rect(screen, color, (x, y, health_width, bar_height), border_radius=radius)
         
         # Border
-        pygame.draw.rect(screen, (200, 200, 200), (x, y, 300, 40), 2, border_radius=20)
+        pygame.draw.rect(screen, (200, 200, 200), (x, y, bar_width, bar_height), 2, border_radius=radius)
         
         # Label
-        label_font = self._get_font(14)
-        label_text = label_font.render(f"{label} {current_health} / {max_health}", True, (255, 255, 255))
-        screen.blit(label_text, (x + 15, y + 14))
+        label_text = self._render_text(14, f"{label} {current_health} / {max_health}", (255, 255, 255))
+        screen.blit(label_text, (x + px(15), y + px(14)))
+    
+    def _draw_timer(self, surface, timer_value):
+        """Draw timer background and seconds"""
+        pygame.draw.rect(surface, (50, 50, 50, 180), surface.get_rect(), border_radius=self.config.px(20))
+        timer_text = self._render_text(48, f"{timer_value}", (255, 255, 255))
+        surface.blit(timer_text, timer_text.get_rect(center=surface.get_rect().center))
+    
+    def _draw_combo(self, surface, combo_name, combo_display):
+        """Draw combo name and progress centered in the combo strip"""
+        center_x = surface.get_width() // 2
+        if combo_name:
+            combo_text = self._render_text(18, combo_name, (255, 215, 0))
+            surface.blit(combo_text, (center_x - combo_text.get_width()//2, 0))
+        if combo_display:
+            progress_text = self._render_text(14, combo_display, (255, 255, 255))
+            surface.blit(progress_text, (center_x - progress_text.get_width()//2, self.config.px(25)))
+    
+    def _draw_score(self, surface, score):
+        """Draw right-aligned score"""
+        score_text = self._render_text(12, f"SCORE {score}", (255, 255, 255))
+        surface.blit(score_text, (surface.get_width() - score_text.get_width(), 0))
     
     def _get_phase_text(self, phase):
         """Get text for current phase"""
@@ -91,61 +123,70 @@ class HUDRenderer:
         }
         return phase_texts.get(phase, "")
     
-    def _draw_phase_indicator(self, screen, text):
-        """Draw phase indicator with animation"""
-        phase_font = self._get_font(14)
-        text_surface = phase_font.render(text, True, (255, 255, 255))
+    def _update_phase_indicator(self, compositor, text):
+        """Update phase indicator panels; the pulse only changes the background alpha"""
+        px = self.config.px
+        text_surface = self._render_text(14, text, (255, 255, 255))
         text_width = text_surface.get_width()
         text_height = text_surface.get_height()
+        bg_size = (text_width + px(40), text_height + px(20))
         
         # Pulsing background
-        pulse_time = (time.time() * 3) % 1
+        pulse_time = (self.clock.now() * 3) % 1
         alpha = int(128 + 64 * abs(2 * pulse_time - 1))
         
-        bg_surface = pygame.Surface((text_width + 40, text_height + 20), pygame.SRCALPHA)
-        pygame.draw.rect(bg_surface, (0, 0, 0, alpha), (0, 0, text_width + 40, text_height + 20), border_radius=15)
-        screen.blit(bg_surface, (self.config.WINDOW_WIDTH//2 - bg_surface.get_width()//2, self.config.WINDOW_HEIGHT - 80))
+        bg_panel = compositor.get_panel('hud', 'phase_bg', bg_size, (self.width//2 - bg_size[0]//2, self.height - px(80)))
+        bg_panel.update(bg_size, lambda surface: pygame.draw.rect(surface, (0, 0, 0, 255), (0, 0, *bg_size), border_radius=px(15)))
+        bg_panel.set_alpha(alpha)
         
-        screen.blit(text_surface, (self.config.WINDOW_WIDTH//2 - text_width//2, self.config.WINDOW_HEIGHT - 70))
+        text_panel = compositor.get_panel('hud', 'phase_text', text_surface.get_size(), (self.width//2 - text_width//2, self.height - px(70)))
+        text_panel.update(text, lambda surface: surface.blit(text_surface, (0, 0)))
     
     def show_fight_text(self, screen):
         """Show animated 'FIGHT!' text"""
         self.fight_effect_active = True
-        self.fight_start_time = time.time()
+        self.fight_start_time = self.clock.now()
+        self._get_fight_text_animation()  # Bake before the first frame is drawn
     
     def show_ko_text(self, screen, player_won):
         """Show animated 'KO!' text"""
         self.ko_effect_active = True
-        self.ko_start_time = time.time()
+        self.ko_start_time = self.clock.now()
         self.player_won = player_won
     
+    def _get_fight_text_animation(self):
+        """Get baked 1.5 second FIGHT! sequence (scale pulse plus fade in/out)"""
+        fight_text = self._render_text(48, "FIGHT!", (255, 215, 0))
+        
+        def render_scaled_text(t):
+            # Scale effect on a copy, cached text stays untouched
+            scale = 1.0 + 0.2 * abs(math.sin(t * 10))
+            return pygame.transform.scale(
+                fight_text, 
+                (int(fight_text.get_width() * scale), int(fight_text.get_height() * scale))
+            )
+        
+        def fade_alpha(t):
+            # Fade in and out
+            if t < 0.3:
+                return 255 * (t / 0.3)
+            elif t > 1.2:
+                return 255 * (1 - (t - 1.2) / 0.3)
+            return 255
+        
+        return self.animation_baker.get(('fight_text', fight_text.get_size()), render_scaled_text, 1.5,
+                                        self.config.ANIMATION_BAKE_FPS, loop=False, alpha_fn=fade_alpha)
+    
     def render_special_effects(self, screen):
         """Render special text effects (FIGHT!, KO!)"""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Render FIGHT! effect
         if self.fight_effect_active:
             elapsed = current_time - self.fight_start_time
             if elapsed < 1.5:  # Show for 1.5 seconds
-                # Fade in and out
-                alpha = 255
-                if elapsed < 0.3:
-                    alpha = int(255 * (elapsed / 0.3))
-                elif elapsed > 1.2:
-                    alpha = int(255 * (1 - (elapsed - 1.2) / 0.3))
-                
-                fight_font = self._get_font(48)
-                fight_text = fight_font.render("FIGHT!", True, (255, 215, 0))
-                fight_text.set_alpha(alpha)
-                
-                # Scale effect
-                scale = 1.0 + 0.2 * abs(math.sin(elapsed * 10))
-                scaled_text = pygame.transform.scale(
-                    fight_text, 
-                    (int(fight_text.get_width() * scale), int(fight_text.get_height() * scale))
-                )
-                
-                screen.blit(scaled_text, scaled_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2)))
+                scaled_text = self._get_fight_text_animation().get_frame(elapsed)
+                screen.blit(scaled_text, scaled_text.get_rect(center=(self.width//2, self.height//2)))
             else:
                 self.fight_effect_active = False
         
@@ -154,26 +195,23 @@ class HUDRenderer:
             elapsed = current_time - self.ko_start_time
             if elapsed < 3.0:  # Show for 3 seconds
                 # Background shake
-                shake_offset = int(5 * math.sin(elapsed * 20))
+                shake_offset = int(self.config.px(5) * math.sin(elapsed * 20))
                 
                 # Red/black flashing background
                 bg_color = (255, 0, 0) if int(elapsed * 5) % 2 == 0 else (0, 0, 0)
-                bg_surface = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-                bg_surface.fill(bg_color)
-                bg_surface.set_alpha(100)
-                screen.blit(bg_surface, (shake_offset, shake_offset))
+                self.overlay_manager.blit_overlay(screen, bg_color, 100, (shake_offset, shake_offset))
                 
                 # KO text
                 ko_text = "YOU WIN!" if self.player_won else "YOU LOSE!"
                 color = (0, 255, 0) if self.player_won else (255, 0, 0)
-                ko_font = self._get_font(48)
-                text_surface = ko_font.render(ko_text, True, color)
+                text_surface = self._render_text(48, ko_text, color)
                 
                 # Outline effect
-                outline_surface = ko_font.render(ko_text, True, (255, 255, 255))
-                for dx, dy in [(2,0), (-2,0), (0,2), (0,-2)]:
-                    screen.blit(outline_surface, outline_surface.get_rect(center=(self.config.WINDOW_WIDTH//2 + dx, self.config.WINDOW_HEIGHT//2 + dy + shake_offset)))
+                outline_surface = self._render_text(48, ko_text, (255, 255, 255))
+                outline = max(1, self.config.px(2))
+                for dx, dy in [(outline,0), (-outline,0), (0,outline), (0,-outline)]:
+                    screen.blit(outline_surface, outline_surface.get_rect(center=(self.width//2 + dx, self.height//2 + dy + shake_offset)))
                 
-                screen.blit(text_surface, text_surface.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 + shake_offset)))
+                screen.blit(text_surface, text_surface.get_rect(center=(self.width//2, self.height//2 + shake_offset)))
             else:
                 self.ko_effect_active = False
\ No newline at end of file
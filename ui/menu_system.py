@@ -1,13 +1,15 @@
 """Menu system - handles main menu navigation and input."""
 
 import pygame
-import time
-import os
 import cv2
+from core.utils import TextCache
+from core.clock import GameClock
+from systems.compositor import Compositor
 
 class MenuSystem:
     def __init__(self, game_config, render_system=None, vision_system=None):
         self.config = game_config
+        self.clock = GameClock()
         self.render_system = render_system  
         self.vision_system = vision_system  # Store vision system reference
         self.current_menu = "MAIN"
@@ -22,10 +24,13 @@ class MenuSystem:
         
         # No static background - will use camera feed
         self.background = None
+        self.compositor = render_system.compositor if render_system else Compositor(game_config)
+        self.width, self.height = game_config.get_render_size()
+        self.text_cache = TextCache()
     
     def handle_input(self, keys):
         """Handle menu input with direct key checking"""
-        current_time = time.time()
+        current_time = self.clock.now()
         if current_time - self.last_key_time < self.key_cooldown:
             return None
         
@@ -86,41 +91,40 @@ class MenuSystem:
     def render(self, screen, camera_frame=None):
         """Render menu with camera feed as background"""
         # Use camera feed as background
-        if camera_frame is not None:
+        if camera_frame is not None and self.render_system is not None:
+            # Camera layer goes through the render backend
+            self.render_system.draw_camera_frame(camera_frame)
+        elif camera_frame is not None:
             # Convert OpenCV BGR to pygame RGB and display
             frame_rgb = cv2.cvtColor(camera_frame, cv2.COLOR_BGR2RGB)
             frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            frame_surface = pygame.transform.scale(frame_surface, (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
+            frame_surface = pygame.transform.scale(frame_surface, (self.width, self.height))
             screen.blit(frame_surface, (0, 0))
-            
-            # Add dark overlay for better text readability
-            overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))  # Semi-transparent black
-            screen.blit(overlay, (0, 0))
         else:
             # Fallback to solid color if camera feed unavailable
             screen.fill((20, 20, 40))
         
-        # Draw title
-        try:
-            if hasattr(self.config, 'FONT_PATH') and os.path.exists(self.config.FONT_PATH):
-                title_font = pygame.font.Font(self.config.FONT_PATH, 48)
-            else:
-                title_font = pygame.font.SysFont("Arial", 80)
-        except Exception as e:
-            print(f"Error loading title font: {str(e)}")
-            title_font = pygame.font.SysFont("Arial", 80)
+        # Menu chrome is cached and only redrawn when selection or difficulty changes
+        has_camera = camera_frame is not None
+        chrome_key = (self.current_menu, self.selected_item, self.config.DEFAULT_DIFFICULTY, has_camera)
+        chrome_panel = self.compositor.get_panel('overlay', 'menu_chrome', (self.width, self.height))
+        chrome_panel.update(chrome_key, lambda surface: self._draw_chrome(surface, has_camera))
+        self.compositor.blit_panel(screen, chrome_panel)
+    
+    def _draw_chrome(self, screen, dim_background):
+        """Draw title, menu items and instructions onto the chrome surface"""
+        px = self.config.px
         
-        title = title_font.render("SHADOW BOXING", True, (255, 215, 0))
-        screen.blit(title, title.get_rect(center=(self.config.WINDOW_WIDTH//2, 120)))
+        if dim_background:
+            # Add dark overlay for better text readability
+            screen.fill((0, 0, 0, 150))  # Semi-transparent black
         
-        # Draw menu items
-        try:
-            menu_font = pygame.font.Font(self.config.FONT_PATH, 28) if hasattr(self.config, 'FONT_PATH') else pygame.font.SysFont("Arial", 48)
-        except:
-            menu_font = pygame.font.SysFont("Arial", 48)
+        # Draw title
+        title = self.text_cache.render_text(self.config.FONT_PATH, px(48), "SHADOW BOXING", (255, 215, 0))
+        screen.blit(title, title.get_rect(center=(self.width//2, px(120))))
         
-        item_height = 70
+        # Draw menu items
+        item_height = px(70)
         
         for i, item in enumerate(self.menu_items[self.current_menu]):
             color = (255, 255, 255)
@@ -132,17 +136,17 @@ class MenuSystem:
             if self.current_menu == "DIFFICULTY" and item == self.config.DEFAULT_DIFFICULTY:
                 display_text += " (SELECTED)"
             
-            text = menu_font.render(display_text, True, color)
-            y_pos = self.config.WINDOW_HEIGHT//2 - (len(self.menu_items[self.current_menu]) * item_height)//2 + i * item_height
+            text = self.text_cache.render_text(self.config.FONT_PATH, px(28), display_text, color)
+            y_pos = self.height//2 - (len(self.menu_items[self.current_menu]) * item_height)//2 + i * item_height
             
             # Highlight background for selected item
             if i == self.selected_item:
-                highlight = pygame.Surface((text.get_width() + 40, text.get_height() + 10), pygame.SRCALPHA)
-                pygame.draw.rect(highlight, (100, 100, 255, 100), highlight.get_rect(), border_radius=10)
-                highlight_rect = highlight.get_rect(center=(self.config.WINDOW_WIDTH//2, y_pos))
+                highlight = pygame.Surface((text.get_width() + px(40), text.get_height() + px(10)), pygame.SRCALPHA)
+                pygame.draw.rect(highlight, (100, 100, 255, 100), highlight.get_rect(), border_radius=px(10))
+                highlight_rect = highlight.get_rect(center=(self.width//2, y_pos))
                 screen.blit(highlight, highlight_rect)
             
-            screen.blit(text, text.get_rect(center=(self.config.WINDOW_WIDTH//2, y_pos)))
+            screen.blit(text, text.get_rect(center=(self.width//2, y_pos)))
         
         # Draw instructions
         if self.current_menu == "MAIN":
@@ -165,11 +169,6 @@ class MenuSystem:
                 "- DODGE BY MOVING HEAD QUICKLY SIDE TO SIDE"
             ]
         
-        try:
-            instr_font = pygame.font.Font(self.config.FONT_PATH, 14) if hasattr(self.config, 'FONT_PATH') else pygame.font.SysFont("Arial", 24)
-        except:
-            instr_font = pygame.font.SysFont("Arial", 24)
-        
         for i, line in enumerate(instructions):
-            text = instr_font.render(line, True, (200, 200, 200))
-            screen.blit(text, text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT - 120 + i * 30)))
\ No newline at end of file
+            text = self.text_cache.render_text(self.config.FONT_PATH, px(14), line, (200, 200, 200))
+            screen.blit(text, text.get_rect(center=(self.width//2, self.height - px(120) + i * px(30))))
\ No newline at end of file
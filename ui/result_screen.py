@@ -1,22 +1,27 @@
 """Result screen - displays game over screen with victory/defeat message."""
 
 import pygame
-import time
+from core.utils import TextCache, OverlayManager
+from core.clock import GameClock
 
 class ResultScreen:
     def __init__(self, game_config):
         self.config = game_config
+        self.clock = GameClock()
         self.active = False
         self.player_won = False
         self.score = 0
         self.start_time = 0
+        self.overlay_manager = OverlayManager()
+        self.text_cache = TextCache()
+        self.width, self.height = game_config.get_render_size()
     
     def show(self, player_won, score):
         """Show result screen"""
         self.active = True
         self.player_won = player_won
         self.score = score
-        self.start_time = time.time()
+        self.start_time = self.clock.now()
     
     def handle_input(self, key):
         """Handle input on result screen"""
@@ -32,39 +37,24 @@ class ResultScreen:
             return
         
         # Semi-transparent background
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        self.overlay_manager.blit_overlay(screen, (0, 0, 0), 200)
+        
+        px = self.config.px
         
         # Result text
         result_text = "VICTORY!" if self.player_won else "DEFEAT!"
         result_color = (0, 255, 0) if self.player_won else (255, 0, 0)
         
-        try:
-            title_font = pygame.font.Font(self.config.FONT_PATH, 60)
-        except:
-            title_font = pygame.font.SysFont("Arial", 100)
-        
-        title = title_font.render(result_text, True, result_color)
-        screen.blit(title, title.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 - 100)))
+        title = self.text_cache.render_text(self.config.FONT_PATH, px(60), result_text, result_color)
+        screen.blit(title, title.get_rect(center=(self.width//2, self.height//2 - px(100))))
         
         # Score
-        try:
-            score_font = pygame.font.Font(self.config.FONT_PATH, 36)
-        except:
-            score_font = pygame.font.SysFont("Arial", 60)
-        
-        score_text = score_font.render(f"FINAL SCORE {self.score}", True, (255, 255, 255))
-        screen.blit(score_text, score_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 + 20)))
+        score_text = self.text_cache.render_text(self.config.FONT_PATH, px(36), f"FINAL SCORE {self.score}", (255, 255, 255))
+        screen.blit(score_text, score_text.get_rect(center=(self.width//2, self.height//2 + px(20))))
         
         # Instructions
-        try:
-            instr_font = pygame.font.Font(self.config.FONT_PATH, 22)
-        except:
-            instr_font = pygame.font.SysFont("Arial", 36)
-        
-        restart_text = instr_font.render("PRESS ENTER TO RESTART", True, (255, 255, 255))
-        quit_text = instr_font.render("PRESS Q TO QUIT", True, (200, 200, 200))
+        restart_text = self.text_cache.render_text(self.config.FONT_PATH, px(22), "PRESS ENTER TO RESTART", (255, 255, 255))
+        quit_text = self.text_cache.render_text(self.config.FONT_PATH, px(22), "PRESS Q TO QUIT", (200, 200, 200))
         
-        screen.blit(restart_text, restart_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT - 100)))
-        screen.blit(quit_text, quit_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT - 60)))
\ No newline at end of file
+        screen.blit(restart_text, restart_text.get_rect(center=(self.width//2, self.height - px(100))))
+        screen.blit(quit_text, quit_text.get_rect(center=(self.width//2, self.height - px(60))))
\ No newline at end of file